@@ -23,7 +23,8 @@ class AutoMigrate {
         'mac_device_import.sql',
         'fix_status_enum_uppercase.sql',
         'fix_alarms_status_enum_uppercase.sql',
-        'enable_description_change_notifications.sql'
+        'enable_description_change_notifications.sql',
+        'create_port_status_current.sql'
     ];
     
     private $pythonMigrations = [
@@ -34,7 +35,9 @@ class AutoMigrate {
         'add_polling_data_columns.py',
         'add_port_config_columns.py',
         'add_alarm_notification_columns.py',
-        'fix_status_enum_uppercase.py'
+        'fix_status_enum_uppercase.py',
+        'add_device_discovery_columns.py',
+        'add_usm_key_columns.py'
     ];
     
     public function __construct($conn) {
@@ -281,15 +281,8 @@ try {
                ON pp.rack_id = pp_rack.id
         LEFT JOIN switches s ON p.switch_id = s.id
         LEFT JOIN snmp_devices sd ON s.name = sd.name
-        LEFT JOIN (
-            SELECT device_id, port_number, vlan_id, vlan_name
-            FROM port_status_data
-            WHERE id IN (
-                SELECT MAX(id) 
-                FROM port_status_data 
-                GROUP BY device_id, port_number
-            )
-        ) psd ON sd.id = psd.device_id AND p.port_no = psd.port_number
+        LEFT JOIN port_status_current psd
+               ON sd.id = psd.device_id AND p.port_no = psd.port_number
         ORDER BY p.switch_id, p.port_no
     ";
     
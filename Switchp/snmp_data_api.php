@@ -118,16 +118,11 @@ function getPortStatus($conn, $deviceId) {
             admin_status, oper_status, port_speed, port_mtu,
             vlan_id, vlan_name, mac_address, mac_addresses,
             last_seen, poll_timestamp
-        FROM port_status_data 
+        FROM port_status_current 
         WHERE device_id = ?
-        AND poll_timestamp = (
-            SELECT MAX(poll_timestamp) 
-            FROM port_status_data 
-            WHERE device_id = ?
-        )
         ORDER BY port_number
     ");
-    $stmt->bind_param("ii", $deviceId, $deviceId);
+    $stmt->bind_param("i", $deviceId);
     $stmt->execute();
     
     $ports = [];
@@ -227,15 +222,10 @@ function syncToSwitches($conn, $auth) {
             
             // Sync port data
             $portStmt = $conn->prepare("
-                SELECT * FROM port_status_data 
+                SELECT * FROM port_status_current 
                 WHERE device_id = ?
-                AND poll_timestamp = (
-                    SELECT MAX(poll_timestamp) 
-                    FROM port_status_data 
-                    WHERE device_id = ?
-                )
             ");
-            $portStmt->bind_param("ii", $snmpDevice['id'], $snmpDevice['id']);
+            $portStmt->bind_param("i", $snmpDevice['id']);
             $portStmt->execute();
             $ports = $portStmt->get_result();
             
@@ -28,6 +28,8 @@ class DatabaseConfig:
     password: str = ""
     pool_size: int = 10
     max_overflow: int = 20
+    batch_writes: bool = True  # one INSERT / legacy UPDATE per device instead of per port
+    port_history_mode: str = "always"  # port_status_data row per poll ("always") or per change ("on_change")
 
 
 @dataclass
@@ -36,6 +38,15 @@ class SNMPConfig:
     timeout: int = 5
     retries: int = 3
     max_bulk_size: int = 50
+    transport: str = "sync"  # "sync" (blocking hlapi) or "asyncio" (shared event loop)
+    async_max_devices: int = 200  # asyncio: devices polled at once on the event loop
+    column_walk: str = "serial"  # "serial" (one walk per column) or "multi" (columns per GETBULK)
+    adaptive_bulk: bool = False  # learn max_bulk_size per device (max_bulk_size is the start value)
+    adaptive_bulk_min: int = 5
+    adaptive_bulk_max: int = 200
+    adaptive_bulk_max_bytes: int = 1400  # keep responses within one unfragmented datagram
+    probe_timeout: float = 1  # seconds; reachability probe of a device whose circuit is half-open
+    persist_usm_keys: bool = False  # store localized SNMPv3 keys (password-equivalent, unencrypted); off = engine ID only
 
 
 @dataclass
@@ -44,6 +55,19 @@ class PollingConfig:
     interval: int = 30
     parallel_devices: int = 5
     max_workers: int = 10
+    persist_workers: int = 2  # threads writing poll results to the database
+    persist_queue_size: int = 20  # poll results waiting for persistence before polling threads block
+    snapshot_mode: str = "always"  # "always" (port_snapshot row every poll) or "on_change"
+    snapshot_heartbeat: int = 0  # on_change: seconds before an unchanged port is snapshotted again (0 = never)
+    jitter: float = 0.1  # random delay added to each scheduled poll, as a fraction of the device interval
+    status_interval: int = 0  # tiered polling: seconds between status-only polls (0 = full poll every time)
+    incremental: bool = False  # re-read only interfaces whose ifLastChange moved
+    full_refresh_polls: int = 10  # incremental: full poll after this many incremental ones (0 = only when needed)
+    breaker_threshold: int = 1  # consecutive unreachable polls before a device's polls are skipped
+    breaker_backoff: int = 30  # seconds polls are skipped the first time, doubled after each failed probe
+    breaker_max_backoff: int = 600
+    device_concurrency: int = 1  # device info, port and MAC table collection run at once (1 = one after another)
+    shards: int = 1  # worker processes the devices are partitioned across (1 = poll in this process)
 
 
 @dataclass
@@ -99,6 +123,8 @@ class DeviceConfig:
     enabled: bool = True
     snmp_v3: Optional[Dict[str, str]] = None
     engine_id: Optional[str] = None  # SNMPv3 Engine ID
+    poll_interval: Optional[int] = None  # seconds between polls of this device (default: polling.interval)
+    max_concurrency: Optional[int] = None  # concurrent requests to this device (default: polling.device_concurrency)
 
 
 class Config:
@@ -203,7 +229,9 @@ class Config:
             user=self._get_env_or_config("DB_USER", ["database", "user"], "root"),
             password=self._get_env_or_config("DB_PASSWORD", ["database", "password"], ""),
             pool_size=int(self._get_env_or_config("DB_POOL_SIZE", ["database", "pool_size"], 10)),
-            max_overflow=int(self._get_env_or_config("DB_MAX_OVERFLOW", ["database", "max_overflow"], 20))
+            max_overflow=int(self._get_env_or_config("DB_MAX_OVERFLOW", ["database", "max_overflow"], 20)),
+            batch_writes=str(self._get_env_or_config("DB_BATCH_WRITES", ["database", "batch_writes"], True)).lower() in ("1", "true", "yes"),
+            port_history_mode=str(self._get_env_or_config("DB_PORT_HISTORY_MODE", ["database", "port_history_mode"], "always")).lower()
         )
     
     def _init_snmp_config(self) -> SNMPConfig:
@@ -212,7 +240,16 @@ class Config:
         return SNMPConfig(
             timeout=snmp_data.get("timeout", 5),
             retries=snmp_data.get("retries", 3),
-            max_bulk_size=snmp_data.get("max_bulk_size", 50)
+            max_bulk_size=snmp_data.get("max_bulk_size", 50),
+            transport=str(snmp_data.get("transport", "sync")).lower(),
+            column_walk=str(snmp_data.get("column_walk", "serial")).lower(),
+            adaptive_bulk=snmp_data.get("adaptive_bulk", False),
+            adaptive_bulk_min=snmp_data.get("adaptive_bulk_min", 5),
+            adaptive_bulk_max=snmp_data.get("adaptive_bulk_max", 200),
+            adaptive_bulk_max_bytes=snmp_data.get("adaptive_bulk_max_bytes", 1400),
+            probe_timeout=float(snmp_data.get("probe_timeout", 1)),
+            async_max_devices=max(1, int(snmp_data.get("async_max_devices", 200))),
+            persist_usm_keys=bool(snmp_data.get("persist_usm_keys", False))
         )
     
     def _init_polling_config(self) -> PollingConfig:
@@ -221,7 +258,20 @@ class Config:
         return PollingConfig(
             interval=int(self._get_env_or_config("POLL_INTERVAL", ["polling", "interval"], 30)),
             parallel_devices=polling_data.get("parallel_devices", 5),
-            max_workers=polling_data.get("max_workers", 10)
+            max_workers=polling_data.get("max_workers", 10),
+            persist_workers=int(polling_data.get("persist_workers", 2)),
+            persist_queue_size=int(polling_data.get("persist_queue_size", 20)),
+            snapshot_mode=str(polling_data.get("snapshot_mode", "always")).lower(),
+            snapshot_heartbeat=int(polling_data.get("snapshot_heartbeat", 0)),
+            jitter=float(polling_data.get("jitter", 0.1)),
+            status_interval=int(polling_data.get("status_interval", 0)),
+            incremental=bool(polling_data.get("incremental", False)),
+            full_refresh_polls=int(polling_data.get("full_refresh_polls", 10)),
+            breaker_threshold=int(polling_data.get("breaker_threshold", 1)),
+            breaker_backoff=int(polling_data.get("breaker_backoff", 30)),
+            breaker_max_backoff=int(polling_data.get("breaker_max_backoff", 600)),
+            device_concurrency=int(polling_data.get("device_concurrency", 1)),
+            shards=max(1, int(polling_data.get("shards", 1)))
         )
     
     def _init_alarm_config(self) -> AlarmConfig:
@@ -293,7 +343,9 @@ class Config:
                 community=device_data.get("community", "public"),
                 enabled=device_data.get("enabled", True),
                 snmp_v3=device_data.get("snmp_v3"),
-                engine_id=device_data.get("snmp_engine_id") or device_data.get("engine_id")  # Support both formats
+                engine_id=device_data.get("snmp_engine_id") or device_data.get("engine_id"),  # Support both formats
+                poll_interval=int(device_data["poll_interval"]) if device_data.get("poll_interval") else None,
+                max_concurrency=int(device_data["max_concurrency"]) if device_data.get("max_concurrency") else None
             )
             devices.append(device)
         
@@ -320,11 +320,11 @@ class AlarmManager:
         """
         cutoff = datetime.utcnow() - timedelta(hours=hours)
         keys_to_remove = [
-            key for key, timestamp in self._recent_notifications.items()
+            key for key, timestamp in list(self._recent_notifications.items())
             if timestamp < cutoff
         ]
         for key in keys_to_remove:
-            del self._recent_notifications[key]
+            self._recent_notifications.pop(key, None)
         
         if keys_to_remove:
             self.logger.debug(f"Cleaned up {len(keys_to_remove)} old notification timestamps")
\ No newline at end of file
@@ -0,0 +1,319 @@
+"""
+Asyncio SNMP client.
+Same interface and return types as SNMPClient, but requests are sent through
+the pysnmp asyncio hlapi on one shared event loop, so hundreds of UDP requests
+can be in flight at once instead of one blocking request per thread.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, List, Set, Tuple, Any
+
+from core.snmp_client import SNMPClient, ColumnWalk, SNMP_AVAILABLE
+from core.snmp_engine_pool import SnmpEnginePool
+
+try:
+    from pysnmp.hlapi.asyncio import (
+        UdpTransportTarget, ContextData,
+        ObjectType, ObjectIdentity, getCmd, bulkCmd
+    )
+    ASYNC_SNMP_AVAILABLE = SNMP_AVAILABLE
+except ImportError as e:
+    ASYNC_SNMP_AVAILABLE = False
+    logging.warning(f"pysnmp asyncio hlapi not available - asyncio SNMP transport disabled. Error: {e}")
+except Exception as e:
+    ASYNC_SNMP_AVAILABLE = False
+    logging.error(f"Unexpected error importing pysnmp asyncio hlapi: {e}")
+
+
+class SNMPEventLoop:
+    """
+    Process-wide asyncio event loop running in a background thread.
+    Blocking callers submit coroutines with run() and wait for the result.
+    """
+    
+    _instance: Optional['SNMPEventLoop'] = None
+    _lock = threading.Lock()
+    
+    def __init__(self):
+        """Start the event loop thread."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name='snmp-event-loop',
+            daemon=True
+        )
+        self._thread.start()
+    
+    def _run_loop(self) -> None:
+        """Thread target: run the loop forever."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    @classmethod
+    def get(cls) -> 'SNMPEventLoop':
+        """
+        Get the shared event loop, starting it on first use.
+        
+        Returns:
+            SNMPEventLoop instance
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+    
+    def run(self, coro) -> Any:
+        """
+        Run a coroutine on the shared loop and block until it completes.
+        
+        Args:
+            coro: Coroutine to run
+        
+        Returns:
+            Coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+class AsyncSNMPClient(SNMPClient):
+    """
+    SNMP client backed by the pysnmp asyncio hlapi.
+    
+    PollingEngine runs DevicePoller.async_poll() on the shared loop, which
+    awaits the async_* coroutines, so a device waiting for responses does
+    not hold a thread. get(), get_multiple() and get_bulk() keep the blocking
+    SNMPClient interface for callers outside the loop and dispatch to it.
+    """
+    
+    def _setup_transport(self) -> None:
+        """
+        Setup transport target for the asyncio hlapi.
+        
+        The engine is leased from the asyncio pool inside each coroutine: its
+        transport dispatcher binds to the loop that is current when it is first
+        used, so it must only ever be touched from the event loop thread.
+        """
+        self._event_loop = SNMPEventLoop.get()
+        if not ASYNC_SNMP_AVAILABLE:
+            self.logger.error("pysnmp asyncio hlapi not available - asyncio SNMP client cannot send requests")
+            return
+        self._engine_pool = SnmpEnginePool.for_transport('asyncio')
+        self._transport = self._engine_pool.get_transport(
+            UdpTransportTarget,
+            self.host,
+            self.port,
+            self.timeout,
+            self.retries
+        )
+        self._probe_transport = self._engine_pool.get_transport(
+            UdpTransportTarget,
+            self.host,
+            self.port,
+            self.probe_timeout,
+            0
+        )
+        self._context = ContextData()
+    
+    async def async_get(self, oid: str, transport: Any = None) -> Optional[Tuple[str, Any]]:
+        """
+        Perform SNMP GET operation.
+        
+        Args:
+            oid: OID to query
+            transport: Transport target to use instead of the client's own
+        
+        Returns:
+            Tuple of (oid, value) or None on error
+        """
+        if not ASYNC_SNMP_AVAILABLE:
+            self.logger.error("SNMP library not available - cannot perform SNMP GET operation")
+            self.logger.error("Install pysnmp with: pip install pysnmp-lextudio")
+            return None
+        
+        try:
+            with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                errorIndication, errorStatus, errorIndex, varBinds = await getCmd(
+                    engine,
+                    self._auth_data,
+                    transport or self._transport,
+                    self._context,
+                    ObjectType(ObjectIdentity(oid))
+                )
+            
+            if errorIndication:
+                self.logger.error(f"SNMP GET error: {errorIndication}")
+                return None
+            elif errorStatus:
+                self.logger.error(f"SNMP GET error: {errorStatus.prettyPrint()}")
+                return None
+            else:
+                for varBind in varBinds:
+                    return str(varBind[0]), varBind[1]
+        
+        except Exception as e:
+            self.logger.error(f"Exception during SNMP GET: {e}")
+            return None
+    
+    async def async_get_bulk(
+        self,
+        oid: str,
+        max_repetitions: int = 50,
+        as_tuples: bool = False
+    ) -> List[Tuple[Any, Any]]:
+        """
+        Perform SNMP GETBULK operation (walk).
+        
+        Args:
+            oid: Starting OID
+            max_repetitions: Maximum number of repetitions
+            as_tuples: Return OIDs as integer tuples instead of dotted strings
+        
+        Returns:
+            List of (oid, value) tuples
+        """
+        columns = await self.async_get_bulk_columns([oid], max_repetitions, as_tuples)
+        return columns[oid]
+    
+    async def async_get_bulk_columns(
+        self,
+        oids: List[str],
+        max_repetitions: int = 50,
+        as_tuples: bool = False,
+        complete: Optional[Set[str]] = None
+    ) -> Dict[str, List[Tuple[Any, Any]]]:
+        """
+        Walk several table columns together with multi-varbind GETBULK requests.
+        
+        The asyncio hlapi sends a single GETBULK per call, so the walk is
+        driven here from ColumnWalk until every column has left its subtree.
+        
+        Args:
+            oids: Column OID prefixes
+            max_repetitions: Varbind budget per request, shared between columns
+                (starting value when an adaptive bulk controller is set)
+            as_tuples: Return OIDs as integer tuples instead of dotted strings
+            complete: Set that receives the columns walked to the end of
+                their subtree; a column missing from it was cut short by an
+                error and may have more rows
+        
+        Returns:
+            Dictionary mapping each column OID to its list of (oid, value) tuples
+        """
+        if not ASYNC_SNMP_AVAILABLE:
+            self.logger.error("SNMP library not available - cannot perform SNMP GETBULK operation")
+            return {oid: [] for oid in oids}
+        
+        walk = ColumnWalk(oids, max_repetitions, as_tuples)
+        answered = None  # budget of the last answered request
+        if self.bulk_controller is not None:
+            self.bulk_controller.start_walk()
+        
+        try:
+            while not walk.done:
+                walk.max_varbinds = self._bulk_budget(max_repetitions)
+                request_oids, repetitions = walk.next_request()
+                with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                    errorIndication, errorStatus, errorIndex, varBindTable = await bulkCmd(
+                        engine,
+                        self._auth_data,
+                        self._transport,
+                        self._context,
+                        0,  # nonRepeaters
+                        repetitions,
+                        *[ObjectType(ObjectIdentity(oid)) for oid in request_oids]
+                    )
+                
+                if self._retry_smaller_bulk(errorIndication, errorStatus, answered):
+                    continue
+                
+                if errorIndication:
+                    self.logger.error(f"SNMP GETBULK error: {errorIndication}")
+                    break
+                elif errorStatus:
+                    self.logger.error(f"SNMP GETBULK error: {errorStatus.prettyPrint()}")
+                    break
+                
+                answered = walk.max_varbinds
+                self._record_bulk_response(repetitions * len(request_oids), varBindTable)
+                walk.feed(varBindTable)
+        
+        except Exception as e:
+            self.logger.error(f"Exception during SNMP GETBULK: {e}")
+        
+        if complete is not None:
+            complete.update(walk.complete)
+        return walk.results
+    
+    async def async_get_multiple(self, oids: List[str]) -> Dict[str, Any]:
+        """
+        Get multiple OIDs in a single request.
+        
+        Args:
+            oids: List of OIDs to query
+        
+        Returns:
+            Dictionary mapping OID to value
+        """
+        results = {}
+        if not ASYNC_SNMP_AVAILABLE:
+            self.logger.error("SNMP library not available - cannot perform SNMP GET operation")
+            return results
+        
+        try:
+            object_types = [ObjectType(ObjectIdentity(oid)) for oid in oids]
+            
+            with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                errorIndication, errorStatus, errorIndex, varBinds = await getCmd(
+                    engine,
+                    self._auth_data,
+                    self._transport,
+                    self._context,
+                    *object_types
+                )
+            
+            if errorIndication:
+                self.logger.error(f"SNMP GET error: {errorIndication}")
+                return results
+            elif errorStatus:
+                self.logger.error(f"SNMP GET error: {errorStatus.prettyPrint()}")
+                return results
+            
+            for varBind in varBinds:
+                oid_str = str(varBind[0])
+                value = varBind[1]
+                results[oid_str] = value
+        
+        except Exception as e:
+            self.logger.error(f"Exception during SNMP GET multiple: {e}")
+        
+        return results
+    
+    def get(self, oid: str, transport: Any = None) -> Optional[Tuple[str, Any]]:
+        """Blocking SNMP GET, executed on the shared event loop."""
+        return self._event_loop.run(self.async_get(oid, transport))
+    
+    def get_bulk(
+        self,
+        oid: str,
+        max_repetitions: int = 50,
+        as_tuples: bool = False
+    ) -> List[Tuple[Any, Any]]:
+        """Blocking SNMP GETBULK walk, executed on the shared event loop."""
+        return self._event_loop.run(self.async_get_bulk(oid, max_repetitions, as_tuples))
+    
+    def get_bulk_columns(
+        self,
+        oids: List[str],
+        max_repetitions: int = 50,
+        as_tuples: bool = False,
+        complete: Optional[Set[str]] = None
+    ) -> Dict[str, List[Tuple[Any, Any]]]:
+        """Blocking multi-column GETBULK walk, executed on the shared event loop."""
+        return self._event_loop.run(self.async_get_bulk_columns(oids, max_repetitions, as_tuples, complete))
+    
+    def get_multiple(self, oids: List[str]) -> Dict[str, Any]:
+        """Blocking SNMP GET of multiple OIDs, executed on the shared event loop."""
+        return self._event_loop.run(self.async_get_multiple(oids))
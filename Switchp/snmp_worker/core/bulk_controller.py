@@ -0,0 +1,165 @@
+"""
+Adaptive GETBULK size control.
+
+A single max_bulk_size is a poor fit for a mixed fleet: small access switches
+drop or fail to answer large responses, while chassis switches could return
+far more rows per round trip. BulkSizeController learns a per-device varbind
+budget with additive increase / multiplicative decrease.
+"""
+
+import logging
+from typing import Optional
+
+
+class BulkSizeController:
+    """
+    Per-device GETBULK varbind budget.
+    
+    The budget grows by a fixed step after every full response that stays
+    under the response size target, and is cut on tooBig errors, oversized
+    responses and responses the agent truncated on its own. A timeout only
+    counts when the device answered a smaller request earlier in the same
+    walk, or a smaller request in an earlier walk; otherwise the device is
+    down or slow, not choking on the size. Sizes that failed or were
+    truncated become a ceiling, so the budget settles below the device's
+    limit instead of hitting it again every cycle, and the ceiling is
+    raised again by one step after every recover_after clean responses.
+    Growth is only carried into the next walk once a response confirmed
+    it, so a raised ceiling is probed in the middle of a walk where a
+    timeout can fall back to the size answered just before.
+    """
+    
+    def __init__(
+        self,
+        minimum: int = 5,
+        maximum: int = 200,
+        increase: int = 10,
+        target_bytes: int = 1400,
+        recover_after: int = 20
+    ):
+        """
+        Initialize controller.
+        
+        Args:
+            minimum: Smallest budget the controller will shrink to
+            maximum: Largest budget the controller will grow to
+            increase: Additive step after a successful full response
+            target_bytes: Estimated response size to stay below (one
+                unfragmented UDP datagram by default)
+            recover_after: Clean full responses before a lowered ceiling is
+                raised by one step
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.increase = increase
+        self.target_bytes = target_bytes
+        self.recover_after = max(1, recover_after)
+        self.value: Optional[int] = None
+        self.ceiling = self.maximum
+        self._last_good: Optional[int] = None
+        self._clean = 0  # full responses under the target since the last cut
+        self.logger = logging.getLogger('snmp_worker.bulk_controller')
+    
+    def current(self, default: int) -> int:
+        """
+        Get the budget for the next request.
+        
+        Args:
+            default: Starting budget used until the controller has learned one
+        
+        Returns:
+            Number of varbinds to request
+        """
+        if self.value is None:
+            self.value = self._clamp(default)
+        return self.value
+    
+    def start_walk(self) -> None:
+        """Drop growth no response has confirmed yet before a new walk."""
+        if self.value is not None and self._last_good is not None and self.value > self._last_good:
+            self.value = self._clamp(self._last_good)
+    
+    def record_response(self, requested: int, received: int, size: int) -> None:
+        """
+        Adjust the budget after a successful response.
+        
+        Args:
+            requested: Varbinds asked for (max-repetitions x columns)
+            received: Varbinds returned by the agent
+            size: Estimated encoded size of the returned varbinds in bytes
+        """
+        if self.value is None:
+            return
+        
+        self._last_good = self.value
+        if size > self.target_bytes and received:
+            # Scale down so the next response lands near the target size
+            self._clean = 0
+            self._set(int(self.value * self.target_bytes / size), 'oversized response')
+        elif received < requested:
+            # The agent stopped early at its own message size limit
+            self._clean = 0
+            self.ceiling = max(self.minimum, received)
+            self._set(received, 'truncated response')
+        else:
+            self._clean += 1
+            if self._clean >= self.recover_after and self.ceiling < self.maximum:
+                # Probe above the ceiling again; a device may have recovered
+                self._clean = 0
+                self.ceiling = min(self.maximum, self.ceiling + self.increase)
+                self.logger.debug(f"GETBULK ceiling raised to {self.ceiling}")
+            self._set(self.value + self.increase, None)
+    
+    def record_failure(self, reason: str) -> bool:
+        """
+        Halve the budget after a tooBig error.
+        
+        Args:
+            reason: Failure description for the log
+        
+        Returns:
+            True if the budget shrank and the request is worth retrying
+        """
+        if self.value is None or self.value <= self.minimum:
+            return False
+        # Cap growth at the last size that worked, or just below this one
+        if self._last_good is not None and self._last_good < self.value:
+            self.ceiling = self._last_good
+        else:
+            self.ceiling = max(self.minimum, self.value - 1)
+        self._clean = 0
+        self._set(self.value // 2, reason)
+        return True
+    
+    def record_timeout(self, answered: Optional[int]) -> bool:
+        """
+        Fall back to a size the device answered after a timeout.
+        
+        Args:
+            answered: Budget of the last request the device answered in
+                the current walk, None if it answered none yet
+        
+        Returns:
+            True if the budget shrank and the request is worth retrying
+        """
+        if answered is None:
+            # Fall back to the last size an earlier walk got answered
+            answered = self._last_good
+        if self.value is None or answered is None or answered >= self.value:
+            # Nothing smaller worked: the device is down or slow
+            return False
+        self.ceiling = max(self.minimum, answered)
+        self._clean = 0
+        self._set(answered, 'timeout')
+        return True
+    
+    def _set(self, value: int, reason: Optional[str]) -> None:
+        """Store a new clamped budget and log decreases."""
+        value = self._clamp(value)
+        if reason and value < self.value:
+            self.logger.debug(f"GETBULK budget {self.value} -> {value} ({reason})")
+        self.value = value
+    
+    def _clamp(self, value: int) -> int:
+        """Clamp a budget to the configured bounds."""
+        return max(self.minimum, min(self.ceiling, value))
@@ -0,0 +1,102 @@
+"""
+Per-device circuit breaker.
+
+An unreachable device costs timeout x (retries + 1) on every SNMP request,
+which ties up a polling thread for 20 s or more with the default settings.
+CircuitBreaker stops polling a device after it failed to answer, and lets
+a single short probe through once an exponentially growing backoff expires.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open state of one device.
+    
+    Closed: polls run normally. After failure_threshold consecutive
+    unreachable polls the circuit opens for the backoff time, during which
+    polls are skipped without any SNMP traffic. When the backoff expires the
+    circuit is half-open: the next poll probes the device first. A successful
+    poll closes the circuit; a failed probe opens it again with twice the
+    backoff, up to max_backoff.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(
+        self,
+        failure_threshold: int = 1,
+        backoff: float = 30.0,
+        max_backoff: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive unreachable polls that open the circuit
+            backoff: Seconds the circuit stays open the first time
+            max_backoff: Upper limit of the doubling backoff in seconds
+            clock: Monotonic clock
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.backoff = max(0.0, backoff)
+        self.max_backoff = max(self.backoff, max_backoff)
+        self.failures = 0
+        self.opens = 0
+        self.current_backoff = 0.0
+        self._open_until: Optional[float] = None
+        self._clock = clock
+    
+    @property
+    def state(self) -> str:
+        """Current state (CLOSED, OPEN or HALF_OPEN)."""
+        if self._open_until is None:
+            return self.CLOSED
+        if self._clock() < self._open_until:
+            return self.OPEN
+        return self.HALF_OPEN
+    
+    def record_success(self) -> None:
+        """Record a poll the device answered; closes the circuit."""
+        self.failures = 0
+        self.opens = 0
+        self.current_backoff = 0.0
+        self._open_until = None
+    
+    def record_failure(self) -> bool:
+        """
+        Record a poll or probe the device did not answer.
+        
+        Returns:
+            True if the circuit was opened
+        """
+        self.failures += 1
+        if self._open_until is None and self.failures < self.failure_threshold:
+            return False
+        
+        self.current_backoff = min(self.max_backoff, self.backoff * (2 ** min(self.opens, 32)))
+        self.opens += 1
+        self._open_until = self._clock() + self.current_backoff
+        return True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the breaker state for poll results.
+        
+        Returns:
+            Dictionary with state, failures, backoff and retry_in seconds
+        """
+        retry_in = 0.0
+        if self._open_until is not None:
+            retry_in = max(0.0, self._open_until - self._clock())
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'backoff': self.current_backoff,
+            'retry_in': retry_in
+        }
@@ -3,19 +3,33 @@ Database manager for SNMP Worker.
 Handles database connections and operations.
 """
 
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Any
 from datetime import datetime
-from sqlalchemy import create_engine, and_, text
+from sqlalchemy import create_engine, and_, text, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 import logging
 
 from models.database import (
-    Base, SNMPDevice, DevicePollingData, PortStatusData,
-    Alarm, AlarmHistory, DeviceStatus, PortStatus, AlarmStatus, AlarmSeverity
+    Base, SNMPDevice, DevicePollingData, PortStatusData, PortStatusCurrent,
+    Alarm, AlarmHistory, DeviceStatus, PortStatus, AlarmStatus, AlarmSeverity,
+    get_current_time
 )
 from config.config_loader import Config
+from core.port_state_cache import PortStateCache, tracked_values
+from core.legacy_port_index import LegacyPortIndex
+
+
+# Upsert-capable INSERT constructs by SQLAlchemy dialect name
+_UPSERT_INSERTS = {
+    'mysql': mysql_insert,
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
 
 
 class DatabaseManager:
@@ -45,6 +59,12 @@ class DatabaseManager:
         # Create session factory
         self.Session = sessionmaker(bind=self.engine)
         
+        # Latest per-port state, shared by all pollers
+        self.port_state_cache = PortStateCache()
+        
+        # Legacy ports/switches tables, reloaded once per poll cycle
+        self.legacy_ports = LegacyPortIndex()
+        
         self.logger.info("Database manager initialized")
     
     @contextmanager
@@ -61,6 +81,8 @@ class DatabaseManager:
             session.commit()
         except Exception as e:
             session.rollback()
+            self.port_state_cache.invalidate_session(session)
+            self.legacy_ports.invalidate_session(session)
             self.logger.error(f"Database error: {e}")
             raise
         finally:
@@ -126,6 +148,68 @@ class DatabaseManager:
         
         return device
     
+    def get_detected_mappers(
+        self,
+        session: Session,
+        ip_addresses: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Get the persisted vendor auto-detection results of devices.
+        
+        Args:
+            session: Database session
+            ip_addresses: Device IPs
+        
+        Returns:
+            Dictionary mapping IP to {'sys_object_id', 'detected_mapper'} for
+            devices with a detected mapper
+        """
+        if not ip_addresses:
+            return {}
+        
+        rows = session.query(
+            SNMPDevice.ip_address, SNMPDevice.sys_object_id, SNMPDevice.detected_mapper
+        ).filter(
+            SNMPDevice.ip_address.in_(ip_addresses),
+            SNMPDevice.detected_mapper.isnot(None)
+        ).all()
+        return {
+            ip_address: {'sys_object_id': sys_object_id, 'detected_mapper': detected_mapper}
+            for ip_address, sys_object_id, detected_mapper in rows
+        }
+    
+    def get_usm_keys(
+        self,
+        session: Session,
+        ip_addresses: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Get the persisted SNMPv3 engine IDs and localized keys of devices.
+        
+        Args:
+            session: Database session
+            ip_addresses: Device IPs
+        
+        Returns:
+            Dictionary mapping IP to {'engine_id', 'auth_key', 'priv_key',
+            'digest'} for devices with a stored engine ID; the keys and digest
+            are None unless snmp.persist_usm_keys stored them
+        """
+        if not ip_addresses:
+            return {}
+        
+        rows = session.query(
+            SNMPDevice.ip_address, SNMPDevice.snmp_engine_id, SNMPDevice.snmp_v3_auth_key,
+            SNMPDevice.snmp_v3_priv_key, SNMPDevice.snmp_v3_key_digest
+        ).filter(
+            SNMPDevice.ip_address.in_(ip_addresses),
+            SNMPDevice.snmp_engine_id.isnot(None)
+        ).all()
+        return {
+            ip_address: {'engine_id': engine_id, 'auth_key': auth_key, 'priv_key': priv_key, 'digest': digest}
+            for ip_address, engine_id, auth_key, priv_key, digest in rows
+        }
+    
     def update_device_status(
         self,
         session: Session,
@@ -220,25 +304,122 @@ class DatabaseManager:
         Returns:
             PortStatusData instance
         """
-        existing_port = session.query(PortStatusData).filter_by(
-            device_id=device.id,
-            port_number=port_number
-        ).order_by(PortStatusData.poll_timestamp.desc()).first()
-        
-        port_status = PortStatusData(
-            device_id=device.id,
+        return self.save_port_statuses(session, device, [dict(
             port_number=port_number,
             admin_status=admin_status,
             oper_status=oper_status,
-            poll_timestamp=datetime.utcnow(),
             **port_data
-        )
+        )])[0]
+    
+    def save_port_statuses(
+        self,
+        session: Session,
+        device: SNMPDevice,
+        ports: List[Dict[str, Any]]
+    ) -> List[PortStatusData]:
+        """
+        Save the status of all ports of a device.
+        
+        Every port is upserted into port_status_current with one statement.
+        History rows go to port_status_data with one executemany INSERT: all
+        ports in "always" history mode, only ports whose status differs from
+        the current state in "on_change" mode. first_seen and the current
+        state come from the port state cache instead of one query per port.
+        Rows are not added to the session, so later queries in the same
+        transaction do not autoflush them one by one.
+        
+        Args:
+            session: Database session
+            device: Device
+            ports: PortStatusData column values per port (port_number,
+                admin_status, oper_status and optional port data)
+        
+        Returns:
+            Transient PortStatusData instances for all ports
+        """
+        if not ports:
+            return []
+        
+        cache = self.port_state_cache
+        cache.warm_device(session, device.id)
+        
+        poll_timestamp = datetime.utcnow()
+        now = get_current_time()
+        rows = []
+        history_rows = []
+        for port in ports:
+            row = dict(port)
+            row['device_id'] = device.id
+            row['poll_timestamp'] = poll_timestamp
+            row['first_seen'] = cache.get_first_seen(device.id, port['port_number']) or now
+            row['last_seen'] = now
+            rows.append(row)
+            
+            if (self.config.database.port_history_mode != 'on_change'
+                    or cache.get_values(device.id, row['port_number']) != tracked_values(row)):
+                history_rows.append(row)
+        
+        self._upsert_port_status_current(session, rows)
+        if history_rows:
+            session.execute(insert(PortStatusData), history_rows)
+        
+        for row in rows:
+            cache.set_port(session, device.id, row['port_number'], row['first_seen'], tracked_values(row))
+        
+        return [PortStatusData(**row) for row in rows]
+    
+    def _upsert_port_status_current(self, session: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert or update port_status_current rows with one statement.
         
-        if existing_port:
-            port_status.first_seen = existing_port.first_seen
+        Args:
+            session: Database session
+            rows: PortStatusCurrent column values, all with the same keys
+        """
+        dialect = session.get_bind().dialect.name
+        stmt = _UPSERT_INSERTS[dialect](PortStatusCurrent)
+        # first_seen is only written when the port is inserted
+        columns = [key for key in rows[0] if key not in ('device_id', 'port_number', 'first_seen')]
+        
+        if dialect == 'mysql':
+            stmt = stmt.on_duplicate_key_update({
+                column: stmt.inserted[column] for column in columns
+            })
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['device_id', 'port_number'],
+                set_={column: stmt.excluded[column] for column in columns}
+            )
         
-        session.add(port_status)
-        return port_status
+        session.execute(stmt, rows)
+    
+    def delete_stale_ports(self, session: Session, device: SNMPDevice, port_numbers: List[int]) -> int:
+        """
+        Delete port_status_current rows of ports a full poll no longer returned.
+        
+        port_status_current is only upserted, so without this an interface
+        that disappeared (removed module, deleted VLAN interface, renumbered
+        ifIndex) would keep its last status forever. History in
+        port_status_data is kept.
+        
+        Args:
+            session: Database session
+            device: Device
+            port_numbers: Port numbers of every port of the full poll
+        
+        Returns:
+            Number of deleted rows
+        """
+        deleted = session.query(PortStatusCurrent).filter(
+            PortStatusCurrent.device_id == device.id,
+            PortStatusCurrent.port_number.notin_(port_numbers)
+        ).delete(synchronize_session=False)
+        
+        if deleted:
+            # Warmed again from the remaining rows on next use
+            self.port_state_cache.invalidate_device(device.id)
+            self.logger.info(f"Deleted {deleted} stale port(s) of device {device.name}")
+        return deleted
     
     def get_or_create_alarm(
         self,
@@ -506,6 +687,8 @@ class DatabaseManager:
         session.query(DevicePollingData).filter(
             DevicePollingData.poll_timestamp < cutoff_date
         ).delete()
+        
+        self.logger.info(f"Cleanup: Deleted data older than {cutoff_date}")
     
     def update_port_operational_status(
         self,
@@ -529,8 +712,13 @@ class DatabaseManager:
             port_number: Port number
             oper_status: Operational status ('up' or 'down')
             
-        Note: Uses raw SQL to update legacy ports table.
+        Note: Uses raw SQL to update legacy ports table. Ports that are not in
+        the table or already have this status are skipped without a query.
         """
+        legacy_port = self.legacy_ports.get_port(session, device.name, port_number)
+        if legacy_port is None or legacy_port.oper_status == oper_status:
+            return
+        
         try:
             # Update only the operational status, preserve all connection data
             session.execute(
@@ -549,6 +737,7 @@ class DatabaseManager:
                 }
             )
             session.flush()
+            self.legacy_ports.set_oper_status(session, device.name, port_number, oper_status)
             
             self.logger.debug(
                 f"Updated port {port_number} on {device.name} to oper_status={oper_status}"
@@ -557,5 +746,65 @@ class DatabaseManager:
             self.logger.warning(
                 f"Could not update port operational status: {e}"
             )
+    
+    def update_ports_operational_status(
+        self,
+        session: Session,
+        device: SNMPDevice,
+        oper_statuses: Dict[int, str]
+    ) -> None:
+        """
+        Update operational status of many legacy ports with one statement.
+        
+        Same semantics as update_port_operational_status(), but all changed
+        ports of the device are set with a single UPDATE ... CASE instead of
+        one UPDATE per port.
+        
+        Args:
+            session: Database session
+            device: SNMP Device
+            oper_statuses: Port number -> operational status ('up' or 'down')
+        
+        Note: Uses raw SQL to update legacy ports table.
+        """
+        # Skip ports missing from the table or already at this status
+        changed = {}
+        for port_number, oper_status in oper_statuses.items():
+            legacy_port = self.legacy_ports.get_port(session, device.name, port_number)
+            if legacy_port is not None and legacy_port.oper_status != oper_status:
+                changed[port_number] = oper_status
+        
+        if not changed:
+            return
+        
+        params: Dict[str, Any] = {"device_name": device.name}
+        cases = []
+        port_params = []
+        for i, (port_number, oper_status) in enumerate(changed.items()):
+            params[f"port_{i}"] = port_number
+            params[f"status_{i}"] = oper_status
+            cases.append(f"WHEN :port_{i} THEN :status_{i}")
+            port_params.append(f":port_{i}")
         
-        self.logger.info(f"Cleanup: Deleted data older than {cutoff_date}")
\ No newline at end of file
+        try:
+            session.execute(
+                text(f"""
+                UPDATE ports p
+                JOIN switches s ON p.switch_id = s.id
+                SET p.oper_status = CASE p.port_no {' '.join(cases)} END,
+                    p.last_status_update = NOW()
+                WHERE s.name = :device_name
+                AND p.port_no IN ({', '.join(port_params)})
+                """),
+                params
+            )
+            for port_number, oper_status in changed.items():
+                self.legacy_ports.set_oper_status(session, device.name, port_number, oper_status)
+            
+            self.logger.debug(
+                f"Updated {len(changed)} ports on {device.name} in one statement"
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Could not update port operational status: {e}"
+            )
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+In-memory index of the legacy ports/switches tables.
+
+The change detector and the oper_status writer used to JOIN ports and
+switches for every port on every poll, and MAC lookups filtered on
+UPPER(p.mac), which cannot use an index. LegacyPortIndex loads both tables
+with one query per poll cycle and serves those lookups from dictionaries.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def normalize_mac(mac_address: Optional[str]) -> str:
+    """
+    Normalize a MAC address to upper-case XX:XX:XX:XX:XX:XX.
+    
+    Args:
+        mac_address: MAC address in any common notation
+    
+    Returns:
+        Normalized MAC, the upper-cased input if it is not 12 hex digits,
+        or '' for an empty value
+    """
+    if not mac_address:
+        return ""
+    digits = re.sub(r'[^0-9A-Fa-f]', '', mac_address).upper()
+    if len(digits) != 12:
+        return mac_address.strip().upper()
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+@dataclass
+class LegacyPort:
+    """One row of the legacy ports table."""
+    switch_name: str
+    port_no: int
+    mac: Optional[str] = None
+    device: Optional[str] = None
+    connected_to: Optional[str] = None
+    oper_status: Optional[str] = None
+
+
+class LegacyPortIndex:
+    """
+    Legacy ports by (switch name, port_no) and by normalized MAC.
+    
+    The index is loaded lazily on first use after invalidate(). The
+    worker's own writes keep it current: oper_status writes update it in
+    place and are remembered in session.info, so a rollback drops the index
+    instead of leaving it ahead of the table, and autosync invalidates it
+    after committing. Edits made elsewhere (the web interface, or autosync
+    run by the shard coordinator) are only picked up when the polling
+    engine invalidates the index once per cycle or polling interval; until
+    then lookups see the old rows and an oper_status the index already
+    holds is not written again.
+    """
+    
+    SESSION_KEY = 'legacy_port_index_touched'
+    
+    def __init__(self):
+        """Initialize empty index."""
+        self._lock = threading.Lock()
+        self._ports: Optional[Dict[Tuple[str, int], LegacyPort]] = None
+        self._by_mac: Dict[str, LegacyPort] = {}
+        self._load_failing = False  # last load failed, warned already
+        self.logger = logging.getLogger('snmp_worker.legacy_ports')
+    
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup reloads it."""
+        with self._lock:
+            self._ports = None
+            self._by_mac = {}
+    
+    def invalidate_session(self, session: Session) -> None:
+        """
+        Drop the index if a session being rolled back changed it.
+        
+        Args:
+            session: Session being rolled back
+        """
+        if session.info.pop(self.SESSION_KEY, False):
+            self.invalidate()
+    
+    def get_port(self, session: Session, switch_name: str, port_no: int) -> Optional[LegacyPort]:
+        """
+        Get a legacy port row.
+        
+        Args:
+            session: Database session (used to load the index if needed)
+            switch_name: Switch name (switches.name)
+            port_no: Port number
+        
+        Returns:
+            LegacyPort or None if the port is not in the ports table
+        """
+        return self._load(session).get((switch_name, port_no))
+    
+    def find_mac(self, session: Session, mac_address: str) -> Optional[LegacyPort]:
+        """
+        Find the legacy port a MAC address is registered on.
+        
+        Args:
+            session: Database session (used to load the index if needed)
+            mac_address: MAC address in any common notation
+        
+        Returns:
+            LegacyPort or None if the MAC is not registered
+        """
+        self._load(session)
+        return self._by_mac.get(normalize_mac(mac_address))
+    
+    def set_oper_status(self, session: Session, switch_name: str, port_no: int, oper_status: str) -> None:
+        """
+        Record an oper_status written to the ports table in session.
+        
+        Args:
+            session: Session the UPDATE was executed in
+            switch_name: Switch name
+            port_no: Port number
+            oper_status: New operational status
+        """
+        port = self._load(session).get((switch_name, port_no))
+        if port:
+            session.info[self.SESSION_KEY] = True
+            port.oper_status = oper_status
+    
+    def _load(self, session: Session) -> Dict[Tuple[str, int], LegacyPort]:
+        """
+        Return the port index, loading it with one query if needed.
+        
+        A failed load is not cached: lookups get an empty index and the next
+        one tries again, so a transient database error does not hide every
+        legacy port until the next poll cycle.
+        """
+        ports = self._ports
+        if ports is not None:
+            return ports
+        
+        with self._lock:
+            if self._ports is not None:
+                return self._ports
+            
+            ports = {}
+            by_mac = {}
+            try:
+                # p.* because oper_status only exists once its migration ran
+                result = session.execute(text("""
+                    SELECT s.name AS switch_name, p.*
+                    FROM ports p
+                    JOIN switches s ON p.switch_id = s.id
+                    ORDER BY p.id
+                """))
+                for row in result.mappings():
+                    port = LegacyPort(
+                        switch_name=row['switch_name'],
+                        port_no=row['port_no'],
+                        mac=row.get('mac'),
+                        device=row.get('device'),
+                        connected_to=row.get('connected_to'),
+                        oper_status=row.get('oper_status')
+                    )
+                    ports.setdefault((port.switch_name, port.port_no), port)
+                    mac = normalize_mac(port.mac)
+                    if mac:
+                        by_mac.setdefault(mac, port)
+            except Exception as e:
+                if self._load_failing:
+                    self.logger.debug(f"Could not load ports table: {e}")
+                else:
+                    self.logger.warning(f"Could not load ports table: {e}")
+                    self._load_failing = True
+                return {}
+            
+            self._load_failing = False
+            self._ports = ports
+            self._by_mac = by_mac
+            self.logger.debug(f"Loaded {len(ports)} legacy ports ({len(by_mac)} with MAC)")
+            return ports
@@ -0,0 +1,235 @@
+"""
+Fixed-rate poll scheduler.
+
+The worker used to poll every device, then sleep polling.interval, so the
+real period was the interval plus the cycle time and every switch was hit in
+the same burst. PollScheduler keeps a heap of per-device due times instead:
+each device is polled on its own fixed-rate grid (DevicePoller.poll_interval),
+first polls are spread over one interval, a random jitter keeps devices with
+the same interval from lining up, and a device whose previous poll is still
+running skips its slot instead of queueing a second poll behind it.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class DeviceSchedule:
+    """Schedule and drift statistics of one device."""
+    poller: Any
+    interval: float
+    slot: float  # fixed-rate slot of the next poll
+    due: float  # slot plus jitter
+    in_flight: bool = False
+    polls: int = 0
+    skipped: int = 0
+    last_drift: float = 0.0  # seconds the last poll started after it was due
+    max_drift: float = 0.0
+    total_drift: float = 0.0
+    last_success: Optional[bool] = None
+    
+    @property
+    def name(self) -> str:
+        """Device name."""
+        return self.poller.device_config.name
+    
+    @property
+    def avg_drift(self) -> float:
+        """Average start drift in seconds."""
+        return self.total_drift / self.polls if self.polls else 0.0
+
+
+class PollScheduler:
+    """
+    Heap of device polls ordered by due time.
+    
+    run_pending() is called from the worker loop; it hands due devices to
+    submit (PollingEngine.submit), whose future completes once the result is
+    persisted. Completion callbacks run on pipeline threads, so all state is
+    guarded by a lock.
+    """
+    
+    def __init__(
+        self,
+        pollers: List[Any],
+        submit: Callable[[Any], Future],
+        default_interval: float,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize scheduler.
+        
+        Args:
+            pollers: Device pollers to schedule
+            submit: Starts a poll and returns a future of its result
+            default_interval: Interval of devices without poll_interval
+            jitter: Max random delay per poll, as a fraction of the interval
+            clock: Monotonic clock
+        """
+        self._submit = submit
+        self._jitter = max(0.0, jitter)
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._window = self._empty_window()
+        self.logger = logging.getLogger('snmp_worker.scheduler')
+        
+        now = clock()
+        self.schedules: List[DeviceSchedule] = []
+        for poller in pollers:
+            interval = float(poller.poll_interval or default_interval)
+            # Spread first polls over one interval so devices do not start in a burst
+            slot = now + random.uniform(0, interval)
+            schedule = DeviceSchedule(poller=poller, interval=interval, slot=slot, due=slot)
+            self.schedules.append(schedule)
+            self._push(schedule)
+    
+    def next_due(self) -> Optional[float]:
+        """
+        Get the time the next poll is due.
+        
+        Returns:
+            Clock time of the earliest due poll, or None without devices
+        """
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+    
+    def run_pending(self) -> int:
+        """
+        Start every poll that is due.
+        
+        Returns:
+            Number of polls started
+        """
+        started = 0
+        with self._lock:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, schedule = heapq.heappop(self._heap)
+                
+                if schedule.in_flight:
+                    schedule.skipped += 1
+                    self._window['skipped'] += 1
+                    self.logger.warning(
+                        f"Skipping poll of {schedule.name}: previous poll still running"
+                    )
+                else:
+                    self._start(schedule, now)
+                    started += 1
+                
+                self._advance(schedule, now)
+                self._push(schedule)
+        return started
+    
+    def take_window(self) -> Dict[str, Any]:
+        """
+        Get poll counts and drift since the previous call and reset them.
+        
+        Returns:
+            Dictionary with started, successful, failed and skipped polls
+            and avg_drift/max_drift in seconds
+        """
+        with self._lock:
+            window = self._window
+            self._window = self._empty_window()
+        started = window.pop('started')
+        total_drift = window.pop('total_drift')
+        window['started'] = started
+        window['avg_drift'] = total_drift / started if started else 0.0
+        return window
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-device schedule statistics.
+        
+        Returns:
+            List of dictionaries, one per device
+        """
+        with self._lock:
+            return [
+                {
+                    'device_name': schedule.name,
+                    'interval': schedule.interval,
+                    'polls': schedule.polls,
+                    'skipped': schedule.skipped,
+                    'in_flight': schedule.in_flight,
+                    'last_success': schedule.last_success,
+                    'last_drift': schedule.last_drift,
+                    'avg_drift': schedule.avg_drift,
+                    'max_drift': schedule.max_drift
+                }
+                for schedule in self.schedules
+            ]
+    
+    def _start(self, schedule: DeviceSchedule, now: float) -> None:
+        """Submit a due poll and record its start drift."""
+        drift = now - schedule.due
+        schedule.in_flight = True
+        schedule.polls += 1
+        schedule.last_drift = drift
+        schedule.max_drift = max(schedule.max_drift, drift)
+        schedule.total_drift += drift
+        self._window['started'] += 1
+        self._window['total_drift'] += drift
+        self._window['max_drift'] = max(self._window['max_drift'], drift)
+        
+        try:
+            future = self._submit(schedule.poller)
+        except Exception as e:
+            self.logger.error(f"Failed to start poll of {schedule.name}: {e}")
+            self._finish(schedule, False)
+            return
+        future.add_done_callback(lambda f: self._finish(schedule, self._succeeded(f)))
+    
+    def _finish(self, schedule: DeviceSchedule, success: bool) -> None:
+        """Mark a poll of schedule as finished."""
+        with self._lock:
+            schedule.in_flight = False
+            schedule.last_success = success
+            self._window['successful' if success else 'failed'] += 1
+    
+    def _advance(self, schedule: DeviceSchedule, now: float) -> None:
+        """Move schedule to its next fixed-rate slot after now."""
+        slot = schedule.slot + schedule.interval
+        if slot <= now:
+            # Fell behind by whole intervals; drop the missed slots
+            missed = int((now - slot) // schedule.interval) + 1
+            slot += missed * schedule.interval
+            schedule.skipped += missed
+            self._window['skipped'] += missed
+        schedule.slot = slot
+        schedule.due = slot + random.uniform(0, self._jitter * schedule.interval)
+    
+    def _push(self, schedule: DeviceSchedule) -> None:
+        """Add schedule to the heap at its due time."""
+        heapq.heappush(self._heap, (schedule.due, next(self._sequence), schedule))
+    
+    @staticmethod
+    def _succeeded(future: Future) -> bool:
+        """Whether a finished poll future holds a successful, persisted result."""
+        if future.exception() is not None:
+            return False
+        result = future.result()
+        return bool(result.get('success')) and 'persist_error' not in result
+    
+    @staticmethod
+    def _empty_window() -> Dict[str, Any]:
+        """Counters of one reporting window."""
+        return {
+            'started': 0,
+            'successful': 0,
+            'failed': 0,
+            'skipped': 0,
+            'total_drift': 0.0,
+            'max_drift': 0.0
+        }
@@ -3,33 +3,93 @@ SNMP Polling Engine - Core polling logic for network devices.
 Handles parallel polling of multiple devices.
 """
 
+import asyncio
 import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Set, Tuple
+from dataclasses import replace
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from queue import Full, Queue
 
 from config.config_loader import Config, DeviceConfig
 from core.snmp_client import SNMPClient
+from core.async_snmp_client import ASYNC_SNMP_AVAILABLE, AsyncSNMPClient, SNMPEventLoop
+from core.bulk_controller import BulkSizeController
+from core.circuit_breaker import CircuitBreaker
 from core.database_manager import DatabaseManager
 from core.alarm_manager import AlarmManager
 from core.port_change_detector import PortChangeDetector
 from vendors.factory import VendorFactory
-from vendors.base import PortInfo, DeviceInfo
+from vendors.base import PortInfo, DeviceInfo, FdbEntry, VendorOIDMapper, bucket_by_index, oid_to_tuple
 from models.database import DeviceStatus, PortStatus, SNMPDevice
 from utils.logger import DeviceLoggerAdapter
 
 
+def device_max_concurrency(device_config: DeviceConfig, polling_config: Any) -> int:
+    """
+    Get the number of concurrent requests a full poll may send to a device.
+    
+    Args:
+        device_config: Device configuration (max_concurrency overrides)
+        polling_config: Polling configuration (device_concurrency)
+    
+    Returns:
+        Concurrency cap, at least 1
+    """
+    default = polling_config.device_concurrency if polling_config else 1
+    return max(1, device_config.max_concurrency or default)
+
+
+def run_blocking(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine that never suspends to completion without an event loop.
+    
+    DevicePoller's collection code is written as coroutines so the asyncio
+    transport can run it on the shared event loop; with the blocking
+    SNMPClient every await completes immediately, and polling threads run
+    the same code through this function.
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        Coroutine result
+    
+    Raises:
+        RuntimeError: If the coroutine suspended (it needs an event loop)
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Coroutine suspended outside an event loop")
+
+
 class DevicePoller:
     """Polls a single device and collects SNMP data."""
     
+    # Columns walked by status-only polls (tiered mode)
+    STATUS_OIDS = [
+        VendorOIDMapper.OID_IF_ADMIN_STATUS,
+        VendorOIDMapper.OID_IF_OPER_STATUS,
+        VendorOIDMapper.OID_IF_LAST_CHANGE
+    ]
+    
+    # Tables indexed by ifIndex, which incremental polls GET per interface
+    INTERFACE_TABLES = (VendorOIDMapper.OID_IF_TABLE + '.', VendorOIDMapper.OID_IF_X_TABLE + '.')
+    
     def __init__(
         self,
         device_config: DeviceConfig,
         snmp_config: Any,
         db_manager: DatabaseManager,
         alarm_manager: AlarmManager,
-        change_detector: PortChangeDetector
+        change_detector: PortChangeDetector,
+        polling_config: Any = None,
+        phase_executor: Optional[ThreadPoolExecutor] = None
     ):
         """
         Initialize device poller.
@@ -40,6 +100,9 @@ class DevicePoller:
             db_manager: Database manager
             alarm_manager: Alarm manager
             change_detector: Port change detector
+            polling_config: Polling configuration (interval, status_interval)
+            phase_executor: Executor for running the collection phases of a
+                full poll concurrently (None = one after another)
         """
         self.device_config = device_config
         self.snmp_config = snmp_config
@@ -55,19 +118,127 @@ class DevicePoller:
             device_config.ip
         )
         
+        # Full inventory every poll_interval; with a shorter status_interval the
+        # device is polled at that rate and polls in between are status-only
+        default_interval = polling_config.interval if polling_config else 0
+        status_interval = polling_config.status_interval if polling_config else 0
+        self.inventory_interval = device_config.poll_interval or default_interval
+        self.tiered = 0 < status_interval < self.inventory_interval
+        self.poll_interval = status_interval if self.tiered else self.inventory_interval
+        
+        # Incremental mode: inventory polls re-read only interfaces whose
+        # ifLastChange moved, with a full poll every full_refresh_polls
+        self.incremental = bool(polling_config and polling_config.incremental)
+        self.full_refresh_polls = polling_config.full_refresh_polls if polling_config else 0
+        
+        # Last inventory, kept for status and incremental polls
+        self._keep_inventory = self.tiered or self.incremental
+        self._inventory: Dict[int, PortInfo] = {}
+        self._device_info: Optional[DeviceInfo] = None
+        self._last_change: Dict[int, int] = {}
+        self._sys_uptime: Optional[int] = None
+        self._inventory_time = 0.0
+        self._refresh_due = True  # next inventory must be a full poll
+        self._inventory_due = False  # ifLastChange moved since the last inventory
+        self._incremental_polls = 0
+        
+        # Set once the device turned out to fill dot1dTpFdbTable instead of dot1qTpFdbTable
+        self._legacy_fdb = False
+        
+        # Concurrent collection phases, at most max_concurrency at a time
+        self.max_concurrency = device_max_concurrency(device_config, polling_config)
+        self.phase_executor = phase_executor if self.max_concurrency > 1 else None
+        self._phase_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_phase_slots: Optional[asyncio.Semaphore] = None  # created on the event loop
+        
+        # Skips polls of an unreachable device with exponential backoff
+        self.breaker = CircuitBreaker(
+            failure_threshold=polling_config.breaker_threshold if polling_config else 1,
+            backoff=polling_config.breaker_backoff if polling_config else 30,
+            max_backoff=polling_config.breaker_max_backoff if polling_config else 600
+        )
+        
         # Create SNMP client
         self.snmp_client = self._create_snmp_client()
+        # SNMPv3 engine ID and localized keys last written to the database
+        self._persisted_usm_keys: Optional[Dict[str, str]] = None
         
-        # Get vendor mapper
+        # Get vendor mapper; without one it is detected from sysObjectID
+        self.sys_object_id: Optional[str] = None
+        self.detected_mapper: Optional[str] = None
+        self._verify_sys_object_id = False  # restored detection, checked on the next full poll
         try:
             self.vendor_mapper = VendorFactory.get_mapper(
                 device_config.vendor,
                 device_config.model
             )
         except ValueError as e:
-            self.logger.error(f"Failed to get vendor mapper: {e}")
+            self.logger.warning(f"No vendor mapper configured ({e}), detecting it from sysObjectID")
             self.vendor_mapper = None
     
+    def use_detected_mapper(
+        self,
+        detected_mapper: str,
+        sys_object_id: Optional[str] = None,
+        restored: bool = False
+    ) -> bool:
+        """
+        Use a vendor mapper detected from the device's sysObjectID.
+        
+        A vendor set in config (anything but "auto") is honoured: a mapper of
+        another vendor is refused, only the model is taken from the detection.
+        
+        Args:
+            detected_mapper: Mapper key (e.g. "cisco_cbs350")
+            sys_object_id: sysObjectID the mapper was detected from
+            restored: Detection stored by an earlier run; sysObjectID is
+                compared with the live value on the next full poll
+        
+        Returns:
+            True if the mapper exists and matches the configured vendor
+        """
+        try:
+            mapper = VendorFactory.get_mapper_by_key(detected_mapper)
+        except ValueError as e:
+            self.logger.warning(f"Detected vendor mapper is not available: {e}")
+            return False
+        
+        vendor = (self.device_config.vendor or 'auto').lower()
+        if vendor != 'auto' and mapper.vendor_name.lower() != vendor:
+            self.logger.warning(
+                f"Detected vendor mapper {detected_mapper} does not match configured vendor "
+                f"{self.device_config.vendor}"
+            )
+            return False
+        
+        self.vendor_mapper = mapper
+        self.detected_mapper = detected_mapper
+        self.sys_object_id = sys_object_id
+        self._verify_sys_object_id = restored
+        return True
+    
+    def use_usm_keys(self, keys: Dict[str, str]) -> bool:
+        """
+        Use the SNMPv3 engine ID and localized keys persisted by an earlier run.
+        
+        Stored keys are ignored unless snmp.persist_usm_keys is on; they are
+        then cleared by the next save.
+        
+        Args:
+            keys: Dictionary with engine_id, auth_key, priv_key and digest
+        
+        Returns:
+            True if the keys match the configured credentials
+        """
+        usable = keys
+        if not self.snmp_config.persist_usm_keys:
+            usable = dict(keys, auth_key=None, priv_key=None, digest=None)
+        if not self.snmp_client.use_usm_keys(usable):
+            self.logger.info("Stored SNMPv3 keys do not match the configured credentials, discovering again")
+            return False
+        self._persisted_usm_keys = keys
+        return True
+    
     def _create_snmp_client(self) -> SNMPClient:
         """Create SNMP client for device."""
         kwargs = {
@@ -93,9 +264,40 @@ class DevicePoller:
                 'engine_id': ''
             })
         
+        kwargs['probe_timeout'] = self.snmp_config.probe_timeout
+        
+        if self.snmp_config.adaptive_bulk:
+            # Lives as long as the poller, so the learned size carries over cycles
+            kwargs['bulk_controller'] = BulkSizeController(
+                minimum=self.snmp_config.adaptive_bulk_min,
+                maximum=self.snmp_config.adaptive_bulk_max,
+                target_bytes=self.snmp_config.adaptive_bulk_max_bytes
+            )
+        
+        if self.snmp_config.transport == 'asyncio' and ASYNC_SNMP_AVAILABLE:
+            return AsyncSNMPClient(**kwargs)
         return SNMPClient(**kwargs)
     
+    @property
+    def uses_event_loop(self) -> bool:
+        """Whether the device is polled on the shared event loop (asyncio transport)."""
+        return isinstance(self.snmp_client, AsyncSNMPClient)
+    
     def poll(self) -> Dict[str, Any]:
+        """
+        Poll device and block until the results are collected.
+        
+        PollingEngine awaits async_poll() directly with the asyncio
+        transport; this is the entry point for polling threads.
+        
+        Returns:
+            Dictionary containing poll results and status
+        """
+        if self.uses_event_loop:
+            return SNMPEventLoop.get().run(self.async_poll())
+        return run_blocking(self.async_poll())
+    
+    async def async_poll(self) -> Dict[str, Any]:
         """
         Poll device and return results.
         
@@ -110,69 +312,431 @@ class DevicePoller:
             'error': None,
             'duration_ms': 0,
             'device_info': None,
-            'ports': []
+            'ports': [],
+            'tier': 'inventory',
+            'phase_ms': {},
+            'bulk_size': self.snmp_config.max_bulk_size
         }
         
-        if not self.vendor_mapper:
-            result['error'] = "No vendor mapper available"
-            return result
-        
         try:
-            # Test connection
+            state = self.breaker.state
+            if state == CircuitBreaker.OPEN:
+                result['error'] = "Device unreachable"
+                result['short_circuit'] = True
+                self.logger.debug("Circuit open, poll skipped")
+                return result
+            
+            # Half-open: one short GET without retries before polling again
+            if state == CircuitBreaker.HALF_OPEN and not await self.snmp_client.async_probe():
+                result['error'] = "Device unreachable"
+                self.logger.warning("Device still unreachable")
+                return result
+            
+            if not self.vendor_mapper and not await self._discover_mapper(result):
+                return result
+            
+            if self._status_poll_due():
+                await self._poll_status(result)
+                return result
+            
+            if self._incremental_poll_due() and await self._poll_incremental(result):
+                return result
+            
+            # Poll device information; the GET doubles as the reachability check
             self.logger.info("Starting poll")
-            if not self.snmp_client.test_connection():
+            device_info_oids = self.vendor_mapper.get_device_info_oids()
+            if self._verify_sys_object_id:
+                device_info_oids = device_info_oids + [VendorOIDMapper.OID_SYS_OBJECT_ID]
+            device_info_phase = (
+                'device_info',
+                lambda: self.snmp_client.async_get_multiple(device_info_oids)
+            )
+            # MAC table first: on large switches the FDB walk is the longest phase
+            collect_phases = [('mac_table', self._poll_mac_table), ('ports', self._poll_ports)]
+            
+            # The walks only start once the device answered, so an unreachable
+            # device costs one timeout chain and holds no phase slots
+            snmp_data, = await self._run_phases([device_info_phase], result['phase_ms'])
+            if snmp_data:
+                mac_table, ports = await self._run_phases(collect_phases, result['phase_ms'])
+            
+            if not snmp_data:
                 result['error'] = "Device unreachable"
                 self.logger.error("Device unreachable")
                 return result
             
-            # Poll device information
-            device_info = self._poll_device_info()
-            result['device_info'] = device_info
+            if self._verify_sys_object_id and not await self._verify_detection(snmp_data, result):
+                return result
             
-            # Poll port information
-            ports = self._poll_ports()
+            device_info = self._parse_device_info(snmp_data)
+            result['device_info'] = device_info
             result['ports'] = ports
             
-            # Poll MAC addresses
-            mac_table = self._poll_mac_table()
-            
             # Associate MACs with ports
             self._associate_macs_with_ports(result['ports'], mac_table)
             
             result['success'] = True
             self.logger.info(f"Poll successful: {len(result['ports'])} ports collected")
+            
+            if self._keep_inventory and ports:
+                self._inventory = {port.port_number: port for port in ports}
+                self._device_info = device_info
+                self._sys_uptime = device_info.system_uptime if device_info else None
+                self._inventory_time = time.monotonic()
+                self._refresh_due = False
+                self._inventory_due = False
+                self._incremental_polls = 0
         
         except Exception as e:
             result['error'] = str(e)
             self.logger.error(f"Poll failed: {e}")
         
         finally:
+            if not result['success']:
+                self._refresh_due = True
+            if result['success']:
+                self.breaker.record_success()
+            elif result['error'] == "Device unreachable" and not result.get('short_circuit'):
+                if self.snmp_client.forget_usm_keys():
+                    # The device may have a new engine ID; discover it on the next poll
+                    self.logger.warning("Dropped stored SNMPv3 engine ID after unreachable poll")
+                if self.breaker.record_failure():
+                    self.logger.warning(
+                        f"Circuit open, next probe in {self.breaker.current_backoff:.0f}s"
+                    )
+            result['circuit'] = self.breaker.snapshot()
             result['duration_ms'] = (time.time() - start_time) * 1000
+            controller = self.snmp_client.bulk_controller
+            if controller and controller.value:
+                result['bulk_size'] = controller.value
         
         return result
     
-    def _poll_device_info(self) -> Optional[DeviceInfo]:
-        """Poll device information."""
+    async def _discover_mapper(self, result: Dict[str, Any]) -> bool:
+        """
+        Detect the vendor mapper from the device's sysObjectID.
+        
+        sysObjectID is read once; a device no profile matches keeps failing
+        with the same error without further SNMP traffic.
+        
+        Args:
+            result: Poll result, gets the error if no mapper was found
+        
+        Returns:
+            True if a mapper was found
+        """
+        if self.sys_object_id is None:
+            response = await self.snmp_client.async_get(VendorOIDMapper.OID_SYS_OBJECT_ID)
+            if not response:
+                result['error'] = "Device unreachable"
+                self.logger.error("Device unreachable")
+                return False
+            self.sys_object_id = str(response[1])
+        
+        detected_mapper = VendorFactory.detect(self.sys_object_id)
+        if not detected_mapper or not self.use_detected_mapper(detected_mapper, self.sys_object_id):
+            result['error'] = f"No vendor mapper available for sysObjectID {self.sys_object_id}"
+            self.logger.error(result['error'])
+            return False
+        
+        result['detected_mapper'] = detected_mapper
+        self.logger.info(f"Detected vendor mapper {detected_mapper} from sysObjectID {self.sys_object_id}")
+        return True
+    
+    async def _verify_detection(self, snmp_data: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """
+        Compare a restored detection's sysObjectID with the live value.
+        
+        sysObjectID is read with the device info GET. When it changed (device
+        replaced, profiles fixed) the poll, made with the old mapper, is
+        dropped and the mapper is detected again from the live value.
+        
+        Args:
+            snmp_data: Device info GET result including sysObjectID
+            result: Poll result, gets the error if the detection changed
+        
+        Returns:
+            True if the restored mapper can be used
+        """
+        live = snmp_data.get(VendorOIDMapper.OID_SYS_OBJECT_ID)
+        try:
+            live = '.'.join(map(str, oid_to_tuple(str(live)))) if live is not None else None
+        except ValueError:
+            # noSuchObject: nothing to compare against
+            live = None
+        
+        self._verify_sys_object_id = False
+        if live is None or live == str(self.sys_object_id).strip('.'):
+            return True
+        
+        self.logger.warning(
+            f"sysObjectID changed from {self.sys_object_id} to {live}, "
+            f"detecting the vendor mapper again"
+        )
+        self.vendor_mapper = None
+        self.detected_mapper = None
+        self.sys_object_id = live
+        if await self._discover_mapper(result):
+            result['error'] = f"Vendor mapper changed to {self.detected_mapper}"
+        return False
+    
+    def _status_poll_due(self) -> bool:
+        """Whether the next poll can be status-only (tiered mode)."""
+        return (
+            self.tiered
+            and not self._refresh_due
+            and not self._inventory_due
+            and time.monotonic() - self._inventory_time < self.inventory_interval
+        )
+    
+    def _incremental_poll_due(self) -> bool:
+        """Whether the next inventory can be incremental."""
+        return (
+            self.incremental
+            and not self._refresh_due
+            and (not self.full_refresh_polls or self._incremental_polls < self.full_refresh_polls)
+        )
+    
+    async def _poll_status(self, result: Dict[str, Any]) -> None:
+        """
+        Status-only poll: sysUpTime plus ifAdminStatus/ifOperStatus/ifLastChange.
+        
+        Ports of the last inventory whose admin or oper status changed are put
+        in result['ports'] (an empty list means nothing changed). A moved
+        ifLastChange makes the next poll an inventory; a missing interface or
+        a lower sysUpTime (reboot) makes it a full one.
+        
+        Args:
+            result: Poll result to fill in
+        """
+        mapper = self.vendor_mapper
+        result['tier'] = 'status'
+        
+        uptime_data = await self.snmp_client.async_get_multiple([mapper.OID_SYS_UPTIME])
+        if not uptime_data:
+            result['error'] = "Device unreachable"
+            self.logger.error("Device unreachable")
+            return
+        sys_uptime = int(next(iter(uptime_data.values())))
+        
+        columns = bucket_by_index(
+            await self._walk_oids(self.STATUS_OIDS),
+            self.STATUS_OIDS
+        )
+        admin_column = columns[mapper.OID_IF_ADMIN_STATUS]
+        oper_column = columns[mapper.OID_IF_OPER_STATUS]
+        last_change_column = columns[mapper.OID_IF_LAST_CHANGE]
+        
+        changed = []
+        for if_index, port in self._inventory.items():
+            admin = admin_column.get(if_index)
+            oper = oper_column.get(if_index)
+            if admin is None or oper is None:
+                self._refresh_due = True
+                continue
+            
+            admin_status = mapper.status_to_string(int(admin))
+            oper_status = mapper.status_to_string(int(oper))
+            if (admin_status, oper_status) != (port.admin_status, port.oper_status):
+                port = replace(port, admin_status=admin_status, oper_status=oper_status)
+                self._inventory[if_index] = port
+                changed.append(port)
+            
+            # The baseline is only moved by inventories, which re-read the interface
+            last_change = last_change_column.get(if_index)
+            if last_change is not None:
+                last_change = int(last_change)
+                if self._last_change.setdefault(if_index, last_change) != last_change:
+                    self._inventory_due = True
+        
+        if self._sys_uptime is not None and sys_uptime < self._sys_uptime:
+            self.logger.info("sysUpTime went back (reboot), full poll next")
+            self._refresh_due = True
+        self._sys_uptime = sys_uptime
+        
+        if self._device_info:
+            result['device_info'] = replace(self._device_info, system_uptime=sys_uptime)
+        result['ports'] = changed
+        result['success'] = True
+        self.logger.debug(f"Status poll: {len(changed)} of {len(self._inventory)} ports changed")
+    
+    async def _poll_incremental(self, result: Dict[str, Any]) -> bool:
+        """
+        Incremental inventory: re-read only interfaces whose ifLastChange moved.
+        
+        Fetches sysUpTime and the ifLastChange column; only if interfaces of
+        the last inventory changed are their port columns fetched with GETs
+        and the MAC table walked. Ports that differ from the last inventory
+        are put in result['ports'] (an empty list means nothing changed).
+        
+        Args:
+            result: Poll result to fill in
+        
+        Returns:
+            False if a full poll is needed instead (reboot, interfaces added
+            or removed, changed interfaces that could not be read)
+        """
+        mapper = self.vendor_mapper
+        
+        uptime_data = await self.snmp_client.async_get_multiple([mapper.OID_SYS_UPTIME])
+        if not uptime_data:
+            result['error'] = "Device unreachable"
+            self.logger.error("Device unreachable")
+            return True
+        sys_uptime = int(next(iter(uptime_data.values())))
+        if self._sys_uptime is not None and sys_uptime < self._sys_uptime:
+            self.logger.info("sysUpTime went back (reboot), full poll")
+            return False
+        
+        last_change_oid = mapper.OID_IF_LAST_CHANGE
+        column = bucket_by_index(await self._walk_oids([last_change_oid]), [last_change_oid])[last_change_oid]
+        last_change = {if_index: int(value) for if_index, value in column.items()}
+        if last_change.keys() != self._last_change.keys():
+            self.logger.info("Interfaces added or removed, full poll")
+            return False
+        
+        changed_indexes = [
+            if_index for if_index in self._inventory
+            if last_change[if_index] != self._last_change[if_index]
+        ]
+        
+        ports = dict(self._inventory)
+        if changed_indexes:
+            fetched = await self._fetch_interfaces(changed_indexes)
+            if len(fetched) != len(changed_indexes):
+                self.logger.warning("Could not read all changed interfaces, full poll")
+                return False
+            ports.update(fetched)
+            
+            # Changed interfaces usually mean moved MACs; re-associate all ports
+            ports = {if_index: replace(port, mac_address=None) for if_index, port in ports.items()}
+            self._associate_macs_with_ports(list(ports.values()), await self._poll_mac_table())
+        
+        changed = [port for if_index, port in ports.items() if port != self._inventory[if_index]]
+        
+        self._inventory = ports
+        self._last_change = last_change
+        self._sys_uptime = sys_uptime
+        self._inventory_time = time.monotonic()
+        self._inventory_due = False
+        self._incremental_polls += 1
+        
+        result['tier'] = 'incremental'
+        if self._device_info:
+            result['device_info'] = replace(self._device_info, system_uptime=sys_uptime)
+        result['ports'] = changed
+        result['success'] = True
+        self.logger.info(
+            f"Incremental poll: {len(changed_indexes)} interface(s) re-read, "
+            f"{len(changed)} port(s) changed"
+        )
+        return True
+    
+    async def _fetch_interfaces(self, if_indexes: List[int]) -> Dict[int, PortInfo]:
+        """
+        GET the ifTable/ifXTable port columns of some interfaces.
+        
+        Args:
+            if_indexes: Interface indexes
+        
+        Returns:
+            Dictionary of interface index -> PortInfo for interfaces that
+            were read and are ports of the mapper
+        """
+        mapper = self.vendor_mapper
+        columns = [
+            oid for oid in mapper.get_port_info_oids()
+            if oid.startswith(self.INTERFACE_TABLES)
+        ]
+        oids = [f"{column}.{if_index}" for if_index in if_indexes for column in columns]
+        
+        snmp_data = {}
+        chunk_size = max(1, self.snmp_config.max_bulk_size)
+        for start in range(0, len(oids), chunk_size):
+            for oid, value in (await self.snmp_client.async_get_multiple(oids[start:start + chunk_size])).items():
+                # Columns the agent does not implement come back as noSuchInstance/noSuchObject
+                if type(value).__name__ not in ('NoSuchInstance', 'NoSuchObject'):
+                    snmp_data[oid] = value
+        
+        fetched = {port.port_number: port for port in mapper.parse_port_info(snmp_data)}
+        for if_index, port in fetched.items():
+            # VLAN membership is not in the interface tables; keep it until the next full poll
+            cached = self._inventory.get(if_index)
+            if cached:
+                port.vlan_id = cached.vlan_id
+        return fetched
+    
+    async def _run_phases(
+        self,
+        phases: List[Tuple[str, Callable[[], Awaitable[Any]]]],
+        timings: Dict[str, float]
+    ) -> List[Any]:
+        """
+        Run collection phases against the device and time them.
+        
+        On the event loop the phases are gathered, at most max_concurrency
+        at a time. Polling threads run them concurrently on the phase
+        executor, if there is one, and otherwise one after another.
+        
+        Args:
+            phases: (name, coroutine function) pairs
+            timings: Dictionary receiving the duration of each phase in ms
+        
+        Returns:
+            Return values of the phases, in order
+        """
+        async def timed(name: str, func: Callable[[], Awaitable[Any]]) -> Any:
+            started = time.time()
+            try:
+                return await func()
+            finally:
+                timings[name] = round((time.time() - started) * 1000, 1)
+        
+        if self.uses_event_loop:
+            if self._async_phase_slots is None:
+                self._async_phase_slots = asyncio.Semaphore(self.max_concurrency)
+            
+            async def limited(name: str, func: Callable[[], Awaitable[Any]]) -> Any:
+                async with self._async_phase_slots:
+                    return await timed(name, func)
+            
+            return list(await asyncio.gather(*(limited(name, func) for name, func in phases)))
+        
+        def in_slot(name: str, func: Callable[[], Awaitable[Any]]) -> Any:
+            with self._phase_slots:
+                return run_blocking(timed(name, func))
+        
+        if not self.phase_executor or len(phases) == 1:
+            return [in_slot(name, func) for name, func in phases]
+        
+        futures = [self.phase_executor.submit(in_slot, name, func) for name, func in phases]
+        return [future.result() for future in futures]
+    
+    def _parse_device_info(self, snmp_data: Dict[str, Any]) -> Optional[DeviceInfo]:
+        """Parse device information from the device info GET."""
         try:
-            oids = self.vendor_mapper.get_device_info_oids()
-            snmp_data = self.snmp_client.get_multiple(oids)
-            device_info = self.vendor_mapper.parse_device_info(snmp_data)
-            return device_info
+            return self.vendor_mapper.parse_device_info(snmp_data)
         except Exception as e:
-            self.logger.error(f"Failed to poll device info: {e}")
+            self.logger.error(f"Failed to parse device info: {e}")
             return None
     
-    def _poll_ports(self) -> List[PortInfo]:
+    async def _poll_ports(self) -> List[PortInfo]:
         """Poll port information."""
         try:
             oid_prefixes = self.vendor_mapper.get_port_info_oids()
+            if self._keep_inventory:
+                # Baseline for the ifLastChange checks of status and incremental polls
+                oid_prefixes = oid_prefixes + [self.vendor_mapper.OID_IF_LAST_CHANGE]
             
             # Walk all OID prefixes
-            snmp_data = {}
-            for oid_prefix in oid_prefixes:
-                results = self.snmp_client.get_bulk(oid_prefix, self.snmp_config.max_bulk_size)
-                for oid, value in results:
-                    snmp_data[oid] = value
+            snmp_data = await self._walk_oids(oid_prefixes)
+            
+            if self._keep_inventory:
+                last_change = self.vendor_mapper.OID_IF_LAST_CHANGE
+                self._last_change = {
+                    if_index: int(value)
+                    for if_index, value in bucket_by_index(snmp_data, [last_change])[last_change].items()
+                }
             
             # Parse port info
             ports = self.vendor_mapper.parse_port_info(snmp_data)
@@ -181,31 +745,111 @@ class DevicePoller:
             self.logger.error(f"Failed to poll ports: {e}")
             return []
     
-    def _poll_mac_table(self) -> Dict[int, List[str]]:
-        """Poll MAC address table."""
+    async def _poll_mac_table(self) -> List[FdbEntry]:
+        """
+        Poll the forwarding database.
+        
+        dot1qTpFdbTable is walked first. When a walk reaches the end of it
+        without rows, dot1dTpFdbTable is walked as well, and a device that
+        has rows there is switched to it for the rest of the worker's
+        lifetime. A walk cut short by an error, or a forwarding database
+        that is simply empty (e.g. right after a reboot), keeps dot1q for
+        the next poll. The fallback only walks the columns the first walk
+        did not cover, so dot1dBasePort is walked once per poll.
+        """
         try:
-            oid_prefixes = self.vendor_mapper.get_mac_table_oids()
+            mapper = self.vendor_mapper
+            if self._legacy_fdb:
+                return mapper.parse_fdb(await self._walk_oids(mapper.get_legacy_mac_table_oids()))
             
-            # Walk MAC table OIDs
-            snmp_data = {}
-            for oid_prefix in oid_prefixes:
-                results = self.snmp_client.get_bulk(oid_prefix, self.snmp_config.max_bulk_size)
-                for oid, value in results:
-                    snmp_data[oid] = value
+            walked = mapper.get_mac_table_oids()
+            complete: Set[str] = set()
+            snmp_data = await self._walk_oids(walked, complete)
+            
+            def has_rows(column: str) -> bool:
+                prefix = oid_to_tuple(column)
+                return any(oid[:len(prefix)] == prefix for oid in snmp_data)
+            
+            if has_rows(mapper.OID_DOT1Q_TP_FDB_PORT) or mapper.OID_DOT1Q_TP_FDB_PORT not in complete:
+                return mapper.parse_fdb(snmp_data)
             
-            # Parse MAC table
-            mac_table = self.vendor_mapper.parse_mac_table(snmp_data)
-            return mac_table
+            missing = [oid for oid in mapper.get_legacy_mac_table_oids() if oid not in walked]
+            snmp_data.update(await self._walk_oids(missing))
+            if has_rows(mapper.OID_DOT1D_TP_FDB_PORT):
+                self.logger.info("dot1qTpFdbTable is empty, using dot1dTpFdbTable")
+                self._legacy_fdb = True
+            return mapper.parse_fdb(snmp_data)
         except Exception as e:
             self.logger.error(f"Failed to poll MAC table: {e}")
-            return {}
+            return []
+    
+    async def _walk_oids(
+        self,
+        oid_prefixes: List[str],
+        complete: Optional[Set[str]] = None
+    ) -> Dict[Tuple[int, ...], Any]:
+        """
+        Walk OID prefixes and merge the results into one OID -> value dict.
+        
+        In "multi" column walk mode all prefixes share each GETBULK request,
+        so the walk takes about as long as the longest column instead of the
+        sum of all of them. The dict is filled in prefix order either way.
+        
+        OIDs are kept as integer tuples so the mappers can take the row
+        index straight from the key instead of re-parsing dotted strings.
+        
+        Args:
+            oid_prefixes: Table column OID prefixes
+            complete: Set that receives the prefixes walked to their end
+        
+        Returns:
+            Dictionary of OID tuple -> value
+        """
+        snmp_data = {}
+        
+        if self.snmp_config.column_walk == 'multi':
+            columns = await self.snmp_client.async_get_bulk_columns(
+                oid_prefixes,
+                self.snmp_config.max_bulk_size,
+                as_tuples=True,
+                complete=complete
+            )
+            for oid_prefix in oid_prefixes:
+                for oid, value in columns.get(oid_prefix, []):
+                    snmp_data[oid] = value
+            return snmp_data
+        
+        for oid_prefix in oid_prefixes:
+            columns = await self.snmp_client.async_get_bulk_columns(
+                [oid_prefix],
+                self.snmp_config.max_bulk_size,
+                as_tuples=True,
+                complete=complete
+            )
+            for oid, value in columns[oid_prefix]:
+                snmp_data[oid] = value
+        return snmp_data
     
     def _associate_macs_with_ports(
         self,
         ports: List[PortInfo],
-        mac_table: Dict[int, List[str]]
+        fdb: List[FdbEntry]
     ) -> None:
-        """Associate MAC addresses with ports."""
+        """
+        Associate MAC addresses (and VLANs) with ports.
+        
+        A port learning MACs in a single VLAN gets that VLAN when the vendor
+        mapper did not assign one.
+        """
+        mac_table: Dict[int, List[str]] = {}
+        vlans: Dict[int, set] = {}
+        for entry in fdb:
+            macs = mac_table.setdefault(entry.if_index, [])
+            if entry.mac not in macs:
+                macs.append(entry.mac)
+            if entry.vlan_id is not None:
+                vlans.setdefault(entry.if_index, set()).add(entry.vlan_id)
+        
         for port in ports:
             if port.port_number in mac_table:
                 macs = mac_table[port.port_number]
@@ -214,14 +858,43 @@ class DevicePoller:
                     # Store all MACs for later use if needed
                     if not hasattr(port, '_all_macs'):
                         port._all_macs = macs
+            
+            port_vlans = vlans.get(port.port_number)
+            if port.vlan_id is None and port_vlans and len(port_vlans) == 1:
+                port.vlan_id = next(iter(port_vlans))
     
     def save_to_database(self, poll_result: Dict[str, Any]) -> None:
         """
         Save poll results to database.
         
+        The device status and polling data are written for every poll, so
+        last_poll_time and last_successful_poll move forward on status and
+        incremental polls too; port rows are only written for ports in
+        poll_result['ports'], which is empty when nothing changed.
+        
         Args:
             poll_result: Poll results dictionary
         """
+        if poll_result.get('short_circuit'):
+            # Circuit open: the poll that opened it already recorded the device as unreachable
+            return
+        
+        # Persist sysObjectID detection and SNMPv3 keys so later startups skip them
+        discovered = {}
+        if self.sys_object_id:
+            # detected_mapper None drops a stored detection the live sysObjectID no longer matches
+            discovered.update(sys_object_id=self.sys_object_id, detected_mapper=self.detected_mapper)
+        usm_keys = None
+        if poll_result['success']:
+            usm_keys = self.snmp_client.usm_keys(localized=self.snmp_config.persist_usm_keys)
+        if usm_keys and usm_keys != self._persisted_usm_keys:
+            discovered.update(
+                snmp_engine_id=usm_keys['engine_id'],
+                snmp_v3_auth_key=usm_keys['auth_key'],
+                snmp_v3_priv_key=usm_keys['priv_key'],
+                snmp_v3_key_digest=usm_keys['digest']
+            )
+        
         with self.db_manager.session_scope() as session:
             # Get or create device
             device = self.db_manager.get_or_create_device(
@@ -232,7 +905,8 @@ class DevicePoller:
                 model=self.device_config.model,
                 snmp_version=self.device_config.snmp_version,
                 snmp_community=self.device_config.community if self.device_config.snmp_version == '2c' else None,
-                enabled=self.device_config.enabled
+                enabled=self.device_config.enabled,
+                **discovered
             )
             
             # Update device status
@@ -259,6 +933,9 @@ class DevicePoller:
                 # Check device reachability alarm
                 self.alarm_manager.check_device_reachability(session, device, False)
             
+            if usm_keys:
+                self._persisted_usm_keys = usm_keys
+            
             # Save polling data
             self.db_manager.save_polling_data(
                 session,
@@ -268,63 +945,142 @@ class DevicePoller:
                 error_message=poll_result.get('error')
             )
             
-            # Save port data
-            if poll_result['success']:
-                for port in poll_result['ports']:
-                    # Convert status strings to enums
-                    admin_status = PortStatus.UP if port.admin_status == 'up' else PortStatus.DOWN
-                    oper_status = PortStatus.UP if port.oper_status == 'up' else PortStatus.DOWN
-                    
-                    # Save port status
-                    port_status_data = self.db_manager.save_port_status(
-                        session,
-                        device,
-                        port_number=port.port_number,
-                        admin_status=admin_status,
-                        oper_status=oper_status,
-                        port_name=port.port_name,
-                        port_alias=port.port_alias,
-                        port_type=port.port_type,
-                        port_speed=port.port_speed,
-                        port_mtu=port.port_mtu,
-                        mac_address=port.mac_address,
-                        vlan_id=port.vlan_id
-                    )
-                    
-                    # Update operational status in legacy ports table (Issue #2 fix)
-                    # This preserves connection data when port goes down
-                    try:
-                        self.db_manager.update_port_operational_status(
-                            session,
-                            device,
-                            port.port_number,
-                            port.oper_status  # 'up' or 'down'
-                        )
-                    except Exception as e:
-                        self.logger.debug(f"Could not update legacy port status: {e}")
-                    
-                    # Detect and record changes
-                    try:
-                        changes = self.change_detector.detect_and_record_changes(
-                            session,
-                            device,
-                            port_status_data
-                        )
-                        if changes:
-                            self.logger.info(f"Detected {len(changes)} change(s) on port {port.port_number}")
-                    except Exception as e:
-                        self.logger.error(f"Error detecting changes on port {port.port_number}: {e}")
-                    
-                    # Check for port status alarms
-                    self.alarm_manager.check_port_status(
+            # Save port data; status and incremental polls only carry changed ports
+            if poll_result['success'] and poll_result['ports']:
+                if self.db_manager.config.database.batch_writes:
+                    self._save_ports_batched(session, device, poll_result['ports'])
+                else:
+                    self._save_ports_individually(session, device, poll_result['ports'])
+                
+                # A full poll returns every port; drop current rows of vanished ones
+                if poll_result.get('tier') == 'inventory':
+                    self.db_manager.delete_stale_ports(
                         session,
                         device,
-                        port.port_number,
-                        port.port_name,
-                        admin_status,
-                        oper_status
+                        [port.port_number for port in poll_result['ports']]
                     )
+    
+    def _save_ports_individually(self, session, device, ports: List[PortInfo]) -> None:
+        """
+        Save port data with one INSERT and one legacy UPDATE per port.
+        
+        Args:
+            session: Database session
+            device: Device
+            ports: Polled ports
+        """
+        for port in ports:
+            # Convert status strings to enums
+            admin_status = PortStatus.UP if port.admin_status == 'up' else PortStatus.DOWN
+            oper_status = PortStatus.UP if port.oper_status == 'up' else PortStatus.DOWN
+            
+            # Save port status
+            port_status_data = self.db_manager.save_port_status(
+                session,
+                device,
+                port_number=port.port_number,
+                admin_status=admin_status,
+                oper_status=oper_status,
+                port_name=port.port_name,
+                port_alias=port.port_alias,
+                port_type=port.port_type,
+                port_speed=port.port_speed,
+                port_mtu=port.port_mtu,
+                mac_address=port.mac_address,
+                vlan_id=port.vlan_id
+            )
+            
+            # Update operational status in legacy ports table (Issue #2 fix)
+            # This preserves connection data when port goes down
+            try:
+                self.db_manager.update_port_operational_status(
+                    session,
+                    device,
+                    port.port_number,
+                    port.oper_status  # 'up' or 'down'
+                )
+            except Exception as e:
+                self.logger.debug(f"Could not update legacy port status: {e}")
+            
+            # Detect and record changes
+            try:
+                changes = self.change_detector.detect_and_record_changes(
+                    session,
+                    device,
+                    port_status_data
+                )
+                if changes:
+                    self.logger.info(f"Detected {len(changes)} change(s) on port {port.port_number}")
+            except Exception as e:
+                self.logger.error(f"Error detecting changes on port {port.port_number}: {e}")
+            
+            # Check for port status alarms
+            self.alarm_manager.check_port_status(
+                session,
+                device,
+                port.port_number,
+                port.port_name,
+                admin_status,
+                oper_status
+            )
 
+    
+    def _save_ports_batched(self, session, device, ports: List[PortInfo]) -> None:
+        """
+        Save port data with one INSERT and one legacy UPDATE for the device.
+        
+        Args:
+            session: Database session
+            device: Device
+            ports: Polled ports
+        """
+        rows = []
+        for port in ports:
+            rows.append({
+                'port_number': port.port_number,
+                'admin_status': PortStatus.UP if port.admin_status == 'up' else PortStatus.DOWN,
+                'oper_status': PortStatus.UP if port.oper_status == 'up' else PortStatus.DOWN,
+                'port_name': port.port_name,
+                'port_alias': port.port_alias,
+                'port_type': port.port_type,
+                'port_speed': port.port_speed,
+                'port_mtu': port.port_mtu,
+                'mac_address': port.mac_address,
+                'vlan_id': port.vlan_id
+            })
+        
+        port_status_records = self.db_manager.save_port_statuses(session, device, rows)
+        
+        # Update operational status in legacy ports table (Issue #2 fix)
+        # This preserves connection data when port goes down
+        self.db_manager.update_ports_operational_status(
+            session,
+            device,
+            {port.port_number: port.oper_status for port in ports}
+        )
+        
+        for port, port_status_data in zip(ports, port_status_records):
+            # Detect and record changes
+            try:
+                changes = self.change_detector.detect_and_record_changes(
+                    session,
+                    device,
+                    port_status_data
+                )
+                if changes:
+                    self.logger.info(f"Detected {len(changes)} change(s) on port {port.port_number}")
+            except Exception as e:
+                self.logger.error(f"Error detecting changes on port {port.port_number}: {e}")
+            
+            # Check for port status alarms
+            self.alarm_manager.check_port_status(
+                session,
+                device,
+                port.port_number,
+                port.port_name,
+                port_status_data.admin_status,
+                port_status_data.oper_status
+            )
 
 class PollingEngine:
     """Main polling engine that manages polling of all devices."""
@@ -349,6 +1105,38 @@ class PollingEngine:
         self.change_detector = PortChangeDetector(db_manager, alarm_manager)
         self.logger = logging.getLogger('snmp_worker.engine')
         
+        # Stage timings of the last poll cycle (see poll_all_devices)
+        self.pipeline_stats: Dict[str, Any] = {}
+        
+        # Long-lived polling/persistence pipeline (see start)
+        self.uses_event_loop = config.snmp.transport == 'asyncio' and ASYNC_SNMP_AVAILABLE
+        if config.snmp.transport == 'asyncio' and not ASYNC_SNMP_AVAILABLE:
+            # Pollers create blocking clients too (see DevicePoller._create_snmp_client)
+            self.logger.warning("asyncio SNMP transport not available, using the sync transport")
+        self._pipeline_lock = threading.Lock()
+        self._started = False
+        self._poll_executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: set = set()  # asyncio: futures of polls running on the event loop
+        self._device_slots: Optional[asyncio.Semaphore] = None  # created on the event loop
+        self._persist_queue: Optional[Queue] = None
+        self._persist_threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._stats = self._empty_stats()
+        
+        # Threads for the collection phases of devices polled concurrently
+        # (the event loop gathers them instead)
+        enabled_devices = [device for device in config.devices if device.enabled]
+        max_concurrency = max(
+            (device_max_concurrency(device, config.polling) for device in enabled_devices),
+            default=1
+        )
+        self.phase_executor: Optional[ThreadPoolExecutor] = None
+        if max_concurrency > 1 and not self.uses_event_loop:
+            self.phase_executor = ThreadPoolExecutor(
+                max_workers=config.polling.max_workers * max_concurrency,
+                thread_name_prefix='phase'
+            )
+        
         # Create device pollers
         self.pollers: List[DevicePoller] = []
         for device_config in config.devices:
@@ -358,16 +1146,245 @@ class PollingEngine:
                     config.snmp,
                     db_manager,
                     alarm_manager,
-                    self.change_detector
+                    self.change_detector,
+                    config.polling,
+                    self.phase_executor
                 )
                 self.pollers.append(poller)
         
+        self._restore_detected_mappers()
+        self._restore_usm_keys()
+        
         self.logger.info(f"Polling engine initialized with {len(self.pollers)} devices")
     
+    def _restore_detected_mappers(self) -> None:
+        """Reuse stored sysObjectID detections of devices without a configured mapper."""
+        pending = {poller.device_config.ip: poller for poller in self.pollers if not poller.vendor_mapper}
+        if not pending:
+            return
+        
+        try:
+            with self.db_manager.session_scope() as session:
+                detected = self.db_manager.get_detected_mappers(session, list(pending))
+        except Exception as e:
+            self.logger.warning(f"Failed to load detected vendor mappers: {e}")
+            return
+        
+        for ip_address, detection in detected.items():
+            poller = pending[ip_address]
+            if poller.use_detected_mapper(detection['detected_mapper'], detection['sys_object_id'], restored=True):
+                poller.logger.info(f"Using detected vendor mapper {detection['detected_mapper']}")
+    
+    def _restore_usm_keys(self) -> None:
+        """Reuse stored SNMPv3 engine IDs (and localized keys, if persisted) of v3 devices."""
+        pending = {poller.device_config.ip: poller for poller in self.pollers if poller.device_config.snmp_version == '3'}
+        if not pending:
+            return
+        
+        try:
+            with self.db_manager.session_scope() as session:
+                stored = self.db_manager.get_usm_keys(session, list(pending))
+        except Exception as e:
+            self.logger.warning(f"Failed to load stored SNMPv3 keys: {e}")
+            return
+        
+        for ip_address, keys in stored.items():
+            poller = pending[ip_address]
+            if poller.use_usm_keys(keys):
+                poller.logger.info(f"Using stored SNMPv3 engine ID {keys['engine_id']}")
+    
+    def start(self) -> None:
+        """
+        Start the polling and persistence stages.
+        
+        SNMP collection and database persistence run as two stages: polling
+        threads put results on a bounded queue that a separate pool of
+        persistence threads drains, each with its own session. When the
+        queue is full, polling threads wait (backpressure) instead of piling
+        up results in memory. submit() starts the stages on first use.
+        
+        With the asyncio transport, polls are coroutines on the shared event
+        loop instead, at most snmp.async_max_devices at a time, so a device
+        waiting for its responses does not hold a thread.
+        """
+        with self._pipeline_lock:
+            if self._started:
+                return
+            self._started = True
+            
+            polling_config = self.config.polling
+            self._persist_queue = Queue(maxsize=max(1, polling_config.persist_queue_size))
+            self._persist_threads = [
+                threading.Thread(target=self._persist_loop, name=f'persist_{i}', daemon=True)
+                for i in range(max(1, polling_config.persist_workers))
+            ]
+            for thread in self._persist_threads:
+                thread.start()
+            if not self.uses_event_loop:
+                self._poll_executor = ThreadPoolExecutor(
+                    max_workers=polling_config.max_workers,
+                    thread_name_prefix='poll'
+                )
+    
+    def stop(self) -> None:
+        """Wait for running polls to be persisted and stop the pipeline."""
+        with self._pipeline_lock:
+            if not self._started:
+                return
+            self._started = False
+            executor = self._poll_executor
+            self._poll_executor = None
+            inflight = list(self._inflight)
+        
+        # Every running poll has queued its result once the executor (or the event loop) is done with it
+        if executor is not None:
+            executor.shutdown(wait=True)
+        wait(inflight)
+        for _ in self._persist_threads:
+            self._persist_queue.put(None)
+        for thread in self._persist_threads:
+            thread.join()
+        self._persist_threads = []
+    
+    def submit(self, poller: DevicePoller) -> Future:
+        """
+        Poll a device and persist its result in the pipeline.
+        
+        Args:
+            poller: Device poller
+        
+        Returns:
+            Future of the poll result, completed once it has been saved
+            (a failed save is reported as result['persist_error'])
+        """
+        self.start()
+        done: Future = Future()
+        if self.uses_event_loop:
+            future = asyncio.run_coroutine_threadsafe(
+                self._collect_async(poller, done), SNMPEventLoop.get().loop
+            )
+            with self._pipeline_lock:
+                self._inflight.add(future)
+            future.add_done_callback(self._poll_finished)
+        else:
+            self._poll_executor.submit(self._collect, poller, done)
+        return done
+    
+    def _poll_finished(self, future: Future) -> None:
+        """Forget a poll that ran on the event loop."""
+        with self._pipeline_lock:
+            self._inflight.discard(future)
+    
+    def take_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Get stage timings since the previous call and reset them.
+        
+        Returns:
+            Dictionary with devices, poll_seconds, persist_seconds,
+            backpressure_seconds, max_queue_depth, persist_workers and
+            queue_size
+        """
+        with self._stats_lock:
+            stats = self._stats
+            self._stats = self._empty_stats()
+        stats['persist_workers'] = max(1, self.config.polling.persist_workers)
+        stats['queue_size'] = max(1, self.config.polling.persist_queue_size)
+        return stats
+    
+    def _collect(self, poller: DevicePoller, done: Future) -> None:
+        """Polling stage: poll one device and hand the result to persistence."""
+        started = time.time()
+        try:
+            result = poller.poll()
+        except Exception as e:
+            self._poll_failed(poller, done, e)
+            return
+        polled = time.time()
+        
+        self._persist_queue.put((poller, result, done))
+        self._record_collect(started, polled)
+    
+    async def _collect_async(self, poller: DevicePoller, done: Future) -> None:
+        """Polling stage on the event loop: poll one device and hand the result to persistence."""
+        if self._device_slots is None:
+            self._device_slots = asyncio.Semaphore(self.config.snmp.async_max_devices)
+        
+        async with self._device_slots:
+            started = time.time()
+            try:
+                result = await poller.async_poll()
+            except Exception as e:
+                self._poll_failed(poller, done, e)
+                return
+            polled = time.time()
+        
+        # Backpressure without blocking the loop: wait for room on the queue
+        while True:
+            try:
+                self._persist_queue.put_nowait((poller, result, done))
+                break
+            except Full:
+                await asyncio.sleep(0.05)
+        self._record_collect(started, polled)
+    
+    def _poll_failed(self, poller: DevicePoller, done: Future, error: Exception) -> None:
+        """Complete the future of a poll that raised."""
+        self.logger.error(f"Failed to poll device {poller.device_config.name}: {error}")
+        with self._stats_lock:
+            self._stats['devices'] += 1
+        done.set_result({
+            'device_name': poller.device_config.name,
+            'device_ip': poller.device_config.ip,
+            'success': False,
+            'error': str(error)
+        })
+    
+    def _record_collect(self, started: float, polled: float) -> None:
+        """Add a collected poll to the stage timings."""
+        with self._stats_lock:
+            self._stats['devices'] += 1
+            self._stats['poll_seconds'] += polled - started
+            self._stats['backpressure_seconds'] += time.time() - polled
+            self._stats['max_queue_depth'] = max(
+                self._stats['max_queue_depth'], self._persist_queue.qsize()
+            )
+    
+    def _persist_loop(self) -> None:
+        """Persistence stage: save queued results until the end marker."""
+        while True:
+            item = self._persist_queue.get()
+            if item is None:
+                return
+            poller, result, done = item
+            started = time.time()
+            try:
+                poller.save_to_database(result)
+            except Exception as e:
+                self.logger.error(f"Failed to save results of {poller.device_config.name}: {e}")
+                result['persist_error'] = str(e)
+            with self._stats_lock:
+                self._stats['persist_seconds'] += time.time() - started
+            done.set_result(result)
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        """Stage timing counters."""
+        return {
+            'devices': 0,
+            'poll_seconds': 0.0,
+            'persist_seconds': 0.0,
+            'backpressure_seconds': 0.0,
+            'max_queue_depth': 0
+        }
+    
     def poll_all_devices(self) -> List[Dict[str, Any]]:
         """
         Poll all devices in parallel.
         
+        Every device is submitted to the pipeline (see start) and the call
+        returns once all results are saved. Stage timings of the cycle are
+        kept in self.pipeline_stats.
+        
         Returns:
             List of poll results
         """
@@ -379,34 +1396,27 @@ class PollingEngine:
         
         self.logger.info(f"Polling {len(self.pollers)} devices")
         
-        with ThreadPoolExecutor(max_workers=self.config.polling.max_workers) as executor:
-            # Submit all poll tasks
-            future_to_poller = {
-                executor.submit(poller.poll): poller
-                for poller in self.pollers
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_poller):
-                poller = future_to_poller[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Save to database
-                    poller.save_to_database(result)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to poll device {poller.device_config.name}: {e}")
-                    results.append({
-                        'device_name': poller.device_config.name,
-                        'device_ip': poller.device_config.ip,
-                        'success': False,
-                        'error': str(e)
-                    })
+        # Pick up ports/switches edits made since the last cycle
+        self.db_manager.legacy_ports.invalidate()
+        
+        self.take_pipeline_stats()
+        cycle_start = time.time()
+        
+        for future in as_completed([self.submit(poller) for poller in self.pollers]):
+            results.append(future.result())
+        
+        stats = self.take_pipeline_stats()
+        stats['cycle_seconds'] = time.time() - cycle_start
+        self.pipeline_stats = stats
         
         # Log summary
         successful = sum(1 for r in results if r['success'])
-        self.logger.info(f"Poll cycle complete: {successful}/{len(results)} successful")
+        self.logger.info(
+            f"Poll cycle complete: {successful}/{len(results)} successful "
+            f"in {stats['cycle_seconds']:.1f}s (poll {stats['poll_seconds']:.1f}s, "
+            f"persist {stats['persist_seconds']:.1f}s, "
+            f"backpressure {stats['backpressure_seconds']:.1f}s, "
+            f"max queue {stats['max_queue_depth']}/{stats['queue_size']})"
+        )
         
         return results
\ No newline at end of file
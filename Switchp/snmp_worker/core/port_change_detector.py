@@ -8,7 +8,7 @@ import json
 from typing import Optional, Dict, List, Tuple, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, text
+from sqlalchemy import and_, or_, func
 
 from models.database import (
     SNMPDevice, PortStatusData, PortSnapshot, MACAddressTracking,
@@ -40,6 +40,10 @@ class PortChangeDetector:
         self.alarm_manager = alarm_manager
         self.logger = logging.getLogger('snmp_worker.change_detector')
         
+        polling_config = db_manager.config.polling
+        self.snapshot_on_change = polling_config.snapshot_mode == 'on_change'
+        self.snapshot_heartbeat = polling_config.snapshot_heartbeat
+        
         self.logger.info("Port Change Detector initialized")
     
     def detect_and_record_changes(
@@ -137,7 +141,8 @@ class PortChangeDetector:
             changes.append(status_change)
         
         # Create new snapshot
-        self._create_snapshot(session, device, current_port_data)
+        if self._snapshot_due(previous_snapshot, current_port_data):
+            self._create_snapshot(session, device, current_port_data)
         
         return changes
     
@@ -147,13 +152,57 @@ class PortChangeDetector:
         device_id: int,
         port_number: int
     ) -> Optional[PortSnapshot]:
-        """Get the latest snapshot for a port."""
-        return session.query(PortSnapshot).filter(
-            and_(
-                PortSnapshot.device_id == device_id,
-                PortSnapshot.port_number == port_number
-            )
-        ).order_by(PortSnapshot.snapshot_timestamp.desc()).first()
+        """Get the latest snapshot for a port (from the port state cache)."""
+        cache = self.db_manager.port_state_cache
+        cache.warm_device(session, device_id)
+        return cache.get_snapshot(device_id, port_number)
+    
+    def _snapshot_values(self, port_data: PortStatusData) -> Dict[str, Any]:
+        """Get the tracked port fields stored in a snapshot."""
+        return {
+            'port_name': port_data.port_name,
+            'port_alias': port_data.port_alias,
+            'port_description': port_data.port_description,
+            'admin_status': port_data.admin_status.value if port_data.admin_status else None,
+            'oper_status': port_data.oper_status.value if port_data.oper_status else None,
+            'vlan_id': port_data.vlan_id,
+            'vlan_name': port_data.vlan_name,
+            'mac_address': port_data.mac_address,
+            'mac_addresses': port_data.mac_addresses
+        }
+    
+    def _snapshot_due(
+        self,
+        previous: PortSnapshot,
+        port_data: PortStatusData
+    ) -> bool:
+        """
+        Check whether a new snapshot should be written for a port.
+        
+        In "always" mode every poll is snapshotted. In "on_change" mode only
+        polls where a tracked field differs from the previous snapshot are,
+        plus a heartbeat snapshot once the previous one is older than
+        snapshot_heartbeat seconds.
+        
+        Args:
+            previous: Latest snapshot of the port
+            port_data: Current port status data
+        
+        Returns:
+            True if a snapshot should be created
+        """
+        if not self.snapshot_on_change:
+            return True
+        
+        for field, value in self._snapshot_values(port_data).items():
+            if getattr(previous, field) != value:
+                return True
+        
+        if self.snapshot_heartbeat and previous.snapshot_timestamp:
+            age = datetime.utcnow() - previous.snapshot_timestamp
+            return age.total_seconds() >= self.snapshot_heartbeat
+        
+        return False
     
     def _create_snapshot(
         self,
@@ -166,17 +215,10 @@ class PortChangeDetector:
             device_id=device.id,
             port_number=port_data.port_number,
             snapshot_timestamp=datetime.utcnow(),
-            port_name=port_data.port_name,
-            port_alias=port_data.port_alias,
-            port_description=port_data.port_description,
-            admin_status=port_data.admin_status.value if port_data.admin_status else None,
-            oper_status=port_data.oper_status.value if port_data.oper_status else None,
-            vlan_id=port_data.vlan_id,
-            vlan_name=port_data.vlan_name,
-            mac_address=port_data.mac_address,
-            mac_addresses=port_data.mac_addresses
+            **self._snapshot_values(port_data)
         )
         session.add(snapshot)
+        self.db_manager.port_state_cache.put_snapshot(session, snapshot)
         return snapshot
     
     def _detect_mac_changes(
@@ -464,29 +506,13 @@ class PortChangeDetector:
         Returns:
             connected_to field value or None
         
-        Note: Uses raw SQL because ports and switches tables are legacy tables
-        not yet integrated into the SQLAlchemy ORM models. This is intentional
-        to maintain compatibility with the existing web interface.
+        Note: ports and switches are legacy tables not yet integrated into the
+        SQLAlchemy ORM models. They are read through the per-cycle legacy port
+        index instead of a query per port.
         """
-        try:
-            # Query ports table using raw SQL
-            # Join with switches table to match by device name
-            # Note: These are legacy tables not in ORM, raw SQL is required
-            result = session.execute(
-                text("""
-                SELECT p.connected_to 
-                FROM ports p
-                JOIN switches s ON p.switch_id = s.id
-                WHERE s.name = :device_name AND p.port_no = :port_number
-                LIMIT 1
-                """),
-                {"device_name": device.name, "port_number": port_number}
-            )
-            row = result.fetchone()
-            if row and row[0]:
-                return row[0]
-        except Exception as e:
-            self.logger.debug(f"Could not query ports table: {e}")
+        legacy_port = self.db_manager.legacy_ports.get_port(session, device.name, port_number)
+        if legacy_port and legacy_port.connected_to:
+            return legacy_port.connected_to
         
         return None
     
@@ -506,32 +532,12 @@ class PortChangeDetector:
             Tuple of (device_name, port_number, device_info) or None if not found
             device_info contains the registered device name/description
         
-        Note: Uses raw SQL to query legacy ports table.
+        Note: Looked up in the legacy port index by normalized MAC.
         """
-        try:
-            # Normalize MAC address to uppercase for comparison
-            mac_upper = mac_address.upper() if mac_address else ""
-            
-            # Query ports table for this MAC address
-            # Check both 'mac' field and connected_to field for device info
-            result = session.execute(
-                text("""
-                SELECT s.name, p.port_no, p.device, p.connected_to
-                FROM ports p
-                JOIN switches s ON p.switch_id = s.id
-                WHERE UPPER(p.mac) = :mac_address
-                LIMIT 1
-                """),
-                {"mac_address": mac_upper}
-            )
-            row = result.fetchone()
-            if row:
-                device_name = row[0]
-                port_number = row[1]
-                device_info = row[2] or row[3] or "DEVICE"  # Use device field or connected_to, default to "DEVICE"
-                return (device_name, port_number, device_info)
-        except Exception as e:
-            self.logger.debug(f"Could not query ports table for MAC: {e}")
+        legacy_port = self.db_manager.legacy_ports.find_mac(session, mac_address)
+        if legacy_port:
+            device_info = legacy_port.device or legacy_port.connected_to or "DEVICE"  # Use device field or connected_to, default to "DEVICE"
+            return (legacy_port.switch_name, legacy_port.port_no, device_info)
         
         return None
     
@@ -552,29 +558,12 @@ class PortChangeDetector:
         Returns:
             Expected MAC address (uppercase) or None if not registered
         
-        Note: Uses raw SQL to query legacy ports table.
+        Note: Read from the legacy port index.
         This is the "official" MAC that should be on this port according to user configuration.
         """
-        try:
-            # Query ports table for the MAC registered for this specific port
-            result = session.execute(
-                text("""
-                SELECT UPPER(p.mac)
-                FROM ports p
-                JOIN switches s ON p.switch_id = s.id
-                WHERE s.name = :device_name 
-                AND p.port_no = :port_number
-                AND p.mac IS NOT NULL
-                AND p.mac != ''
-                LIMIT 1
-                """),
-                {"device_name": device.name, "port_number": port_number}
-            )
-            row = result.fetchone()
-            if row and row[0]:
-                return row[0]  # Return uppercase MAC
-        except Exception as e:
-            self.logger.debug(f"Could not query expected MAC for port: {e}")
+        legacy_port = self.db_manager.legacy_ports.get_port(session, device.name, port_number)
+        if legacy_port and legacy_port.mac:
+            return legacy_port.mac.upper()  # Return uppercase MAC
         
         return None
     
@@ -1045,6 +1034,10 @@ class PortChangeDetector:
         """
         Clean up snapshots older than specified days.
         
+        The latest snapshot of every port is kept regardless of age: in
+        on_change mode it is the baseline for the next comparison and may be
+        much older than the retention period.
+        
         Args:
             session: Database session
             days: Number of days to keep
@@ -1054,9 +1047,29 @@ class PortChangeDetector:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        deleted = session.query(PortSnapshot).filter(
+        latest = session.query(
+            PortSnapshot.device_id,
+            PortSnapshot.port_number,
+            func.max(PortSnapshot.snapshot_timestamp).label('snapshot_timestamp')
+        ).group_by(PortSnapshot.device_id, PortSnapshot.port_number).subquery()
+        
+        keep_ids = [
+            snapshot_id for (snapshot_id,) in session.query(PortSnapshot.id).join(
+                latest,
+                and_(
+                    PortSnapshot.device_id == latest.c.device_id,
+                    PortSnapshot.port_number == latest.c.port_number,
+                    PortSnapshot.snapshot_timestamp == latest.c.snapshot_timestamp
+                )
+            ).filter(PortSnapshot.snapshot_timestamp < cutoff_date).all()
+        ]
+        
+        query = session.query(PortSnapshot).filter(
             PortSnapshot.snapshot_timestamp < cutoff_date
-        ).delete()
+        )
+        if keep_ids:
+            query = query.filter(PortSnapshot.id.notin_(keep_ids))
+        deleted = query.delete(synchronize_session=False)
         
         self.logger.info(f"Cleaned up {deleted} old port snapshots")
         
@@ -0,0 +1,230 @@
+"""
+Worker-resident cache of the latest per-port state.
+
+Every poll used to look up the newest port_status_data row (to carry over
+first_seen) and the newest port_snapshot row (to compare against) for every
+port. PortStateCache loads the current port state and the latest snapshots
+once per device and is kept current as the worker writes, so steady-state
+polls do not query either table per port.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from models.database import PortStatusCurrent, PortSnapshot
+
+
+PortKey = Tuple[int, int]
+
+# Port status columns compared to decide whether a poll is a change
+TRACKED_PORT_FIELDS = (
+    'port_name', 'port_alias', 'port_description',
+    'admin_status', 'oper_status', 'last_change',
+    'port_type', 'port_speed', 'port_mtu',
+    'vlan_id', 'vlan_name', 'mac_address', 'mac_addresses'
+)
+
+
+def tracked_values(port: Dict[str, Any]) -> Tuple:
+    """
+    Get the tracked port status values of a row.
+    
+    Args:
+        port: Port status column values
+    
+    Returns:
+        Tuple of values in TRACKED_PORT_FIELDS order
+    """
+    return tuple(port.get(field) for field in TRACKED_PORT_FIELDS)
+
+
+class PortStateCache:
+    """
+    Latest port status and snapshot per (device_id, port_number).
+    
+    A device is warmed on first use with one query to port_status_current and
+    one to port_snapshot. Writes made in
+    a session update the cache immediately and are remembered in session.info;
+    if that session rolls back, the devices it touched are dropped and warmed
+    again from the database on next use.
+    """
+    
+    SESSION_KEY = 'port_state_cache_devices'
+    
+    def __init__(self):
+        """Initialize empty cache."""
+        self._lock = threading.Lock()
+        self._warm_devices: Set[int] = set()
+        self._first_seen: Dict[PortKey, datetime] = {}
+        self._values: Dict[PortKey, Tuple] = {}
+        self._snapshots: Dict[PortKey, PortSnapshot] = {}
+        self.logger = logging.getLogger('snmp_worker.port_state_cache')
+    
+    def warm_device(self, session: Session, device_id: int) -> None:
+        """
+        Load the latest state of every port of a device if not cached yet.
+        
+        Args:
+            session: Database session
+            device_id: Device ID
+        """
+        if device_id in self._warm_devices:
+            return
+        
+        ports = session.query(PortStatusCurrent).filter(
+            PortStatusCurrent.device_id == device_id
+        ).all()
+        
+        latest_snapshot = session.query(
+            PortSnapshot.port_number,
+            func.max(PortSnapshot.snapshot_timestamp).label('snapshot_timestamp')
+        ).filter(
+            PortSnapshot.device_id == device_id
+        ).group_by(PortSnapshot.port_number).subquery()
+        
+        snapshots = session.query(PortSnapshot).join(
+            latest_snapshot,
+            and_(
+                PortSnapshot.port_number == latest_snapshot.c.port_number,
+                PortSnapshot.snapshot_timestamp == latest_snapshot.c.snapshot_timestamp
+            )
+        ).filter(PortSnapshot.device_id == device_id).all()
+        
+        with self._lock:
+            if device_id in self._warm_devices:
+                return
+            for port in ports:
+                key = (device_id, port.port_number)
+                self._first_seen[key] = port.first_seen
+                self._values[key] = tuple(getattr(port, field) for field in TRACKED_PORT_FIELDS)
+            for snapshot in snapshots:
+                self._snapshots[(device_id, snapshot.port_number)] = self._detach(snapshot)
+            self._warm_devices.add(device_id)
+        
+        self.logger.debug(
+            f"Warmed device {device_id}: {len(ports)} ports, {len(snapshots)} snapshots"
+        )
+    
+    def get_first_seen(self, device_id: int, port_number: int) -> Optional[datetime]:
+        """
+        Get first_seen of a port.
+        
+        Args:
+            device_id: Device ID
+            port_number: Port number
+        
+        Returns:
+            first_seen timestamp, or None for a port without history
+        """
+        with self._lock:
+            return self._first_seen.get((device_id, port_number))
+    
+    def get_values(self, device_id: int, port_number: int) -> Optional[Tuple]:
+        """
+        Get the tracked status values of a port.
+        
+        Args:
+            device_id: Device ID
+            port_number: Port number
+        
+        Returns:
+            Values in TRACKED_PORT_FIELDS order, or None for an unknown port
+        """
+        with self._lock:
+            return self._values.get((device_id, port_number))
+    
+    def set_port(
+        self,
+        session: Session,
+        device_id: int,
+        port_number: int,
+        first_seen: datetime,
+        values: Tuple
+    ) -> None:
+        """
+        Record the status of a port written in session.
+        
+        Args:
+            session: Session the status was written in
+            device_id: Device ID
+            port_number: Port number
+            first_seen: first_seen of the port
+            values: Tracked status values (see tracked_values())
+        """
+        self._touch(session, device_id)
+        with self._lock:
+            key = (device_id, port_number)
+            self._first_seen[key] = first_seen
+            self._values[key] = values
+    
+    def get_snapshot(self, device_id: int, port_number: int) -> Optional[PortSnapshot]:
+        """
+        Get the latest snapshot of a port.
+        
+        Args:
+            device_id: Device ID
+            port_number: Port number
+        
+        Returns:
+            Detached PortSnapshot copy, or None if the port has no snapshot
+        """
+        with self._lock:
+            return self._snapshots.get((device_id, port_number))
+    
+    def put_snapshot(self, session: Session, snapshot: PortSnapshot) -> None:
+        """
+        Record a snapshot written in session as the latest for its port.
+        
+        Args:
+            session: Session the snapshot was added to
+            snapshot: New snapshot
+        """
+        self._touch(session, snapshot.device_id)
+        with self._lock:
+            self._snapshots[(snapshot.device_id, snapshot.port_number)] = self._detach(snapshot)
+    
+    def invalidate_device(self, device_id: int) -> None:
+        """
+        Drop everything cached for a device.
+        
+        Args:
+            device_id: Device ID
+        """
+        with self._lock:
+            self._warm_devices.discard(device_id)
+            for cache in (self._first_seen, self._values, self._snapshots):
+                for key in [key for key in cache if key[0] == device_id]:
+                    del cache[key]
+    
+    def invalidate_session(self, session: Session) -> None:
+        """
+        Drop devices written in a session that is being rolled back.
+        
+        Args:
+            session: Session being rolled back
+        """
+        for device_id in session.info.pop(self.SESSION_KEY, ()):
+            self.invalidate_device(device_id)
+            self.logger.debug(f"Invalidated device {device_id} after rollback")
+    
+    def _touch(self, session: Session, device_id: int) -> None:
+        """Remember that session wrote state for device_id."""
+        session.info.setdefault(self.SESSION_KEY, set()).add(device_id)
+    
+    @staticmethod
+    def _detach(snapshot: PortSnapshot) -> PortSnapshot:
+        """
+        Copy a snapshot into a transient instance.
+        
+        The cached copy must stay readable after the session that loaded or
+        added the original is committed (which expires it) and closed.
+        """
+        return PortSnapshot(**{
+            column.key: getattr(snapshot, column.key)
+            for column in PortSnapshot.__table__.columns
+        })
@@ -0,0 +1,242 @@
+"""
+Multiprocess polling shards.
+
+BER decoding, vendor mappers and ORM object construction are CPU-bound and
+hold the GIL, so a single worker process tops out at one core however many
+polling threads it runs. In sharded mode the enabled devices are partitioned
+across worker processes, each running its own PollingEngine, SNMP engines
+and database pool, and the coordinator in the parent process restarts
+shards that exit or stop reporting.
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def partition_devices(devices: Sequence[Any], shard_count: int, default_interval: float) -> List[List[Any]]:
+    """
+    Partition devices across shards by polling load.
+    
+    Devices are assigned busiest first to the shard with the fewest polls
+    per second, so a shard does not end up with all fast-polled core
+    switches. The result only depends on the device list, so a restarted
+    shard gets the same devices back.
+    
+    Args:
+        devices: Device configurations
+        shard_count: Number of shards
+        default_interval: Polling interval of devices without poll_interval
+    
+    Returns:
+        List of shard_count device lists
+    """
+    def polls_per_second(device: Any) -> float:
+        return 1.0 / max(device.poll_interval or default_interval, 1)
+    
+    shards: List[List[Any]] = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for device in sorted(devices, key=lambda d: (-polls_per_second(d), d.ip)):
+        index = min(range(shard_count), key=lambda i: (loads[i], len(shards[i]), i))
+        shards[index].append(device)
+        loads[index] += polls_per_second(device)
+    return shards
+
+
+@dataclass
+class ShardHealth:
+    """Supervision state and last health report of one shard process."""
+    index: int
+    devices: int
+    pid: Optional[int] = None
+    started_at: float = 0.0  # time.monotonic() of the last (re)start
+    restarts: int = 0
+    failures: int = 0  # exits and stalls since the last health report
+    last_report_at: Optional[float] = None  # time.monotonic() of the last report
+    report: Dict[str, Any] = field(default_factory=dict)
+    next_start_at: float = 0.0  # restart backoff after the process exited or stalled
+
+
+class ShardCoordinator:
+    """
+    Start and supervise polling shard processes.
+    
+    Each shard runs target(index, shard_count, status_queue, *args) in a
+    spawned process and puts a health report dictionary with at least a
+    "shard" key on status_queue once per polling interval. Shards that exit
+    are restarted with exponential backoff; shards that stop reporting are
+    terminated and restarted.
+    """
+    
+    def __init__(
+        self,
+        target: Callable[..., Any],
+        args: Sequence[Any],
+        device_counts: Sequence[int],
+        report_interval: float,
+        stall_intervals: int = 3,
+        restart_backoff: float = 5,
+        max_restart_backoff: float = 300
+    ):
+        """
+        Initialize shard coordinator.
+        
+        Args:
+            target: Picklable module-level function running one shard
+            args: Extra arguments passed to target
+            device_counts: Number of devices of each shard
+            report_interval: Seconds between health reports of a shard
+            stall_intervals: Missed reports before a shard is restarted
+            restart_backoff: Seconds before a shard that exited is restarted,
+                doubled for every exit or stall without a report in between
+            max_restart_backoff: Maximum restart delay in seconds
+        """
+        self.target = target
+        self.args = tuple(args)
+        self.report_interval = report_interval
+        self.stall_timeout = report_interval * stall_intervals
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.logger = logging.getLogger('snmp_worker.shards')
+        
+        # Spawned, not forked: the parent holds sockets, a database pool and threads
+        self._context = multiprocessing.get_context('spawn')
+        self._status_queue = self._context.Queue()
+        self._processes: List[Optional[Any]] = [None] * len(device_counts)
+        self.shards = [ShardHealth(index=i, devices=count) for i, count in enumerate(device_counts)]
+        self._reports: List[Dict[str, Any]] = []
+    
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return len(self.shards)
+    
+    def start(self) -> None:
+        """Start all shard processes."""
+        for shard in self.shards:
+            self._start_shard(shard)
+    
+    def _start_shard(self, shard: ShardHealth) -> None:
+        """Start (or restart) the process of a shard."""
+        process = self._context.Process(
+            target=self.target,
+            args=(shard.index, self.shard_count, self._status_queue) + self.args,
+            name=f"snmp-shard-{shard.index}",
+            daemon=False
+        )
+        process.start()
+        self._processes[shard.index] = process
+        shard.pid = process.pid
+        shard.started_at = time.monotonic()
+        shard.last_report_at = None
+        self.logger.info(f"Started shard {shard.index} (pid {process.pid}, {shard.devices} devices)")
+    
+    def check(self) -> None:
+        """Collect health reports and restart shards that exited or stalled."""
+        self._drain_reports()
+        
+        now = time.monotonic()
+        for shard in self.shards:
+            process = self._processes[shard.index]
+            if process is None:
+                if now >= shard.next_start_at:
+                    shard.restarts += 1
+                    self._start_shard(shard)
+                continue
+            
+            last_seen = shard.last_report_at or shard.started_at
+            if process.is_alive() and now - last_seen <= self.stall_timeout:
+                continue
+            
+            backoff = min(self.restart_backoff * 2 ** shard.failures, self.max_restart_backoff)
+            if process.is_alive():
+                reason = f"sent no health report for {now - last_seen:.0f}s"
+                process.terminate()
+                process.join(10)
+                if process.is_alive():
+                    process.kill()
+            else:
+                reason = f"exited with code {process.exitcode}"
+            process.join()
+            self.logger.error(f"Shard {shard.index} (pid {shard.pid}) {reason}, restarting in {backoff:.0f}s")
+            self._processes[shard.index] = None
+            shard.failures += 1
+            shard.next_start_at = now + backoff
+    
+    def _drain_reports(self) -> None:
+        """Move health reports from the status queue to the shards."""
+        while True:
+            try:
+                report = self._status_queue.get_nowait()
+            except queue.Empty:
+                return
+            shard = self.shards[report['shard']]
+            if report.get('pid') not in (None, shard.pid):
+                # Late report of a process that was already replaced
+                continue
+            shard.last_report_at = time.monotonic()
+            shard.failures = 0
+            shard.report = report
+            self._reports.append(report)
+    
+    def take_reports(self) -> List[Dict[str, Any]]:
+        """
+        Get the health reports received since the last call.
+        
+        Returns:
+            List of report dictionaries, oldest first
+        """
+        self._drain_reports()
+        reports, self._reports = self._reports, []
+        return reports
+    
+    def health(self) -> List[Dict[str, Any]]:
+        """
+        Get the supervision state of every shard.
+        
+        Returns:
+            List of dictionaries with index, pid, alive, devices, restarts,
+            seconds since the last report and the last report
+        """
+        self._drain_reports()
+        now = time.monotonic()
+        return [
+            {
+                'index': shard.index,
+                'pid': shard.pid,
+                'alive': bool(self._processes[shard.index] and self._processes[shard.index].is_alive()),
+                'devices': shard.devices,
+                'restarts': shard.restarts,
+                'report_age': now - shard.last_report_at if shard.last_report_at else None,
+                'report': dict(shard.report)
+            }
+            for shard in self.shards
+        ]
+    
+    def stop(self, timeout: float = 30) -> None:
+        """
+        Stop all shards, letting running polls finish and be saved.
+        
+        Shards get SIGTERM and run their normal shutdown; those still running
+        after timeout seconds are killed.
+        
+        Args:
+            timeout: Seconds to wait for the shards to exit
+        """
+        processes = [process for process in self._processes if process is not None]
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.logger.warning(f"Shard process {process.pid} did not stop in time, killing it")
+                process.kill()
+                process.join()
+        self._processes = [None] * self.shard_count
+        self.logger.info(f"Stopped {len(processes)} shard(s)")
@@ -6,9 +6,13 @@ NOTE: This module uses pysnmp-lextudio, which is a maintained fork of pysnmp
 that supports Python 3.12+. The API is compatible with the original pysnmp.
 """
 
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Set, Tuple, Any
+import hashlib
 import logging
 
+from core.bulk_controller import BulkSizeController
+from core.snmp_engine_pool import SnmpEnginePool
+
 # SNMP imports - wrapped in try/except for graceful degradation
 # Using explicit imports for pysnmp-lextudio 5.x compatibility
 try:
@@ -18,11 +22,16 @@ try:
         usmHMAC128SHA224AuthProtocol, usmHMAC192SHA256AuthProtocol,
         usmHMAC256SHA384AuthProtocol, usmHMAC384SHA512AuthProtocol,
         usmAesCfb128Protocol, usmAesCfb192Protocol, usmAesCfb256Protocol,
-        usmDESPrivProtocol,
+        usmDESPrivProtocol, usmKeyTypeLocalized,
         SnmpEngine, UdpTransportTarget, ContextData,
         ObjectType, ObjectIdentity, getCmd, bulkCmd,
         nextCmd
     )
+    from pysnmp.hlapi.asyncore import cmdgen as asyncore_cmdgen
+    from pysnmp.entity import config as entity_config
+    from pysnmp.proto import errind
+    from pysnmp.proto.rfc1902 import ObjectName, OctetString
+    from pysnmp.proto.rfc1905 import EndOfMibView
     SNMP_AVAILABLE = True
 except ImportError as e:
     SNMP_AVAILABLE = False
@@ -36,6 +45,92 @@ except Exception as e:
     logging.error("To fix: pip install --force-reinstall pysnmp-lextudio")
 
 
+def _estimate_varbind_size(varBind: Any) -> int:
+    """Rough BER-encoded size of a response varbind in bytes."""
+    name = varBind[0].getOid() if hasattr(varBind[0], 'getOid') else varBind[0]
+    value = varBind[1]
+    payload = len(value.asOctets()) if hasattr(value, 'asOctets') else 5
+    # Arcs are mostly single bytes; add tag/length headers for the sequence
+    return len(name) + payload + 8
+
+
+class ColumnWalk:
+    """
+    Transport-independent state of a GETBULK walk over several table columns.
+    
+    Each request carries one varbind per column that has not yet left its
+    subtree, and the varbind budget is split between them so responses stay
+    the size of a single-column walk. Columns drop out as they finish.
+    """
+    
+    def __init__(self, oids: List[str], max_varbinds: int = 50, as_tuples: bool = False):
+        """
+        Initialize column walk.
+        
+        Args:
+            oids: Column OID prefixes to walk
+            max_varbinds: Maximum number of varbinds per response
+            as_tuples: Record OIDs as integer tuples instead of dotted strings
+        """
+        self.max_varbinds = max_varbinds
+        self.as_tuples = as_tuples
+        self.results: Dict[str, List[Tuple[Any, Any]]] = {oid: [] for oid in oids}
+        self._roots = {oid: ObjectName(oid) for oid in self.results}
+        self._next = dict(self._roots)
+        self._active = list(self.results)
+        self.complete: Set[str] = set()  # columns walked to the end of their subtree
+    
+    @property
+    def done(self) -> bool:
+        """True once every column has reached the end of its subtree."""
+        return not self._active
+    
+    def next_request(self) -> Tuple[List[Any], int]:
+        """
+        Get the parameters of the next GETBULK request.
+        
+        Returns:
+            Tuple of (OIDs to continue from, max-repetitions)
+        """
+        oids = [self._next[column] for column in self._active]
+        return oids, max(1, self.max_varbinds // len(oids))
+    
+    def feed(self, varBindTable: List[List[Any]]) -> None:
+        """
+        Consume one GETBULK response.
+        
+        A column finishes on endOfMibView, on the first OID outside its
+        subtree, or when the agent fails to move it forward.
+        
+        Args:
+            varBindTable: Response rows, one varbind per requested column
+        """
+        finished = set()
+        advanced = set()
+        
+        for varBinds in varBindTable:
+            for column, varBind in zip(self._active, varBinds):
+                if column in finished:
+                    continue
+                name = varBind[0].getOid() if hasattr(varBind[0], 'getOid') else varBind[0]
+                value = varBind[1]
+                if (isinstance(value, EndOfMibView)
+                        or not self._roots[column].isPrefixOf(name)
+                        or name <= self._next[column]):
+                    finished.add(column)
+                    continue
+                key = name.asTuple() if self.as_tuples else str(varBind[0])
+                self.results[column].append((key, value))
+                self._next[column] = name
+                advanced.add(column)
+        
+        self.complete.update(finished)
+        self._active = [
+            column for column in self._active
+            if column in advanced and column not in finished
+        ]
+
+
 class SNMPClient:
     """
     SNMP client wrapper for pysnmp.
@@ -55,7 +150,9 @@ class SNMPClient:
         auth_password: Optional[str] = None,
         priv_protocol: Optional[str] = None,
         priv_password: Optional[str] = None,
-        engine_id: Optional[str] = None
+        engine_id: Optional[str] = None,
+        bulk_controller: Optional[BulkSizeController] = None,
+        probe_timeout: Optional[float] = None
     ):
         """
         Initialize SNMP client.
@@ -73,6 +170,9 @@ class SNMPClient:
             priv_protocol: SNMPv3 privacy protocol (AES or DES)
             priv_password: SNMPv3 privacy password
             engine_id: SNMPv3 engine ID (hex string, optional)
+            bulk_controller: Adaptive GETBULK size controller (optional);
+                without one every request uses the caller's max_repetitions
+            probe_timeout: Timeout of probe() in seconds (default: timeout)
         """
         self.host = host
         self.port = port
@@ -80,6 +180,7 @@ class SNMPClient:
         self.community = community
         self.timeout = timeout
         self.retries = retries
+        self.probe_timeout = probe_timeout or timeout
         
         # SNMPv3 parameters
         self.username = username
@@ -89,18 +190,43 @@ class SNMPClient:
         self.priv_password = priv_password
         self.engine_id = engine_id
         
+        self.bulk_controller = bulk_controller
+        
         self.logger = logging.getLogger('snmp_worker.snmp_client')
         
+        # SNMPv3: (transport, engine ID) preloaded into leased engines and the
+        # engine ID / localized keys in use (see use_usm_keys)
+        self._peer: Optional[Tuple[Any, bytes]] = None
+        self._usm_keys: Optional[Dict[str, str]] = None
+        
         # Setup authentication data
         self._auth_data = self._setup_auth()
         
         # Setup transport target
-        self._transport = UdpTransportTarget(
-            (host, port),
-            timeout=timeout,
-            retries=retries
+        self._setup_transport()
+    
+    def _setup_transport(self) -> None:
+        """
+        Setup transport target for the blocking hlapi.
+        
+        Engines come from the process-wide pool and are leased per request,
+        so no SnmpEngine is created per device.
+        """
+        self._engine_pool = SnmpEnginePool.for_transport('sync')
+        self._transport = self._engine_pool.get_transport(
+            UdpTransportTarget,
+            self.host,
+            self.port,
+            self.timeout,
+            self.retries
+        )
+        self._probe_transport = self._engine_pool.get_transport(
+            UdpTransportTarget,
+            self.host,
+            self.port,
+            self.probe_timeout,
+            0
         )
-        self._engine = SnmpEngine()
         self._context = ContextData()
     
     def _setup_auth(self):
@@ -152,12 +278,13 @@ class SNMPClient:
             # SNMPv2c
             return CommunityData(self.community, mpModel=1)
     
-    def get(self, oid: str) -> Optional[Tuple[str, Any]]:
+    def get(self, oid: str, transport: Any = None) -> Optional[Tuple[str, Any]]:
         """
         Perform SNMP GET operation.
         
         Args:
             oid: OID to query
+            transport: Transport target to use instead of the client's own
             
         Returns:
             Tuple of (oid, value) or None on error
@@ -168,15 +295,16 @@ class SNMPClient:
             return None
             
         try:
-            iterator = getCmd(
-                self._engine,
-                self._auth_data,
-                self._transport,
-                self._context,
-                ObjectType(ObjectIdentity(oid))
-            )
-            
-            errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
+            with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                iterator = getCmd(
+                    engine,
+                    self._auth_data,
+                    transport or self._transport,
+                    self._context,
+                    ObjectType(ObjectIdentity(oid))
+                )
+                
+                errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
             
             if errorIndication:
                 self.logger.error(f"SNMP GET error: {errorIndication}")
@@ -192,48 +320,166 @@ class SNMPClient:
             self.logger.error(f"Exception during SNMP GET: {e}")
             return None
     
-    def get_bulk(self, oid: str, max_repetitions: int = 50) -> List[Tuple[str, Any]]:
+    def get_bulk(
+        self,
+        oid: str,
+        max_repetitions: int = 50,
+        as_tuples: bool = False
+    ) -> List[Tuple[Any, Any]]:
         """
         Perform SNMP GETBULK operation (walk).
         
         Args:
             oid: Starting OID
             max_repetitions: Maximum number of repetitions
+            as_tuples: Return OIDs as integer tuples instead of dotted strings
             
         Returns:
             List of (oid, value) tuples
         """
-        results = []
+        columns = self.get_bulk_columns([oid], max_repetitions, as_tuples)
+        return columns[oid]
+    
+    def get_bulk_columns(
+        self,
+        oids: List[str],
+        max_repetitions: int = 50,
+        as_tuples: bool = False,
+        complete: Optional[Set[str]] = None
+    ) -> Dict[str, List[Tuple[Any, Any]]]:
+        """
+        Walk several table columns together with multi-varbind GETBULK requests.
+        
+        Args:
+            oids: Column OID prefixes
+            max_repetitions: Varbind budget per request, shared between columns
+                (starting value when an adaptive bulk controller is set)
+            as_tuples: Return OIDs as integer tuples instead of dotted strings
+            complete: Set that receives the columns walked to the end of
+                their subtree; a column missing from it was cut short by an
+                error and may have more rows
+        
+        Returns:
+            Dictionary mapping each column OID to its list of (oid, value) tuples
+        """
+        if not SNMP_AVAILABLE:
+            self.logger.error("SNMP library not available - cannot perform SNMP GETBULK operation")
+            return {oid: [] for oid in oids}
+        
+        walk = ColumnWalk(oids, max_repetitions, as_tuples)
+        answered = None  # budget of the last answered request
+        if self.bulk_controller is not None:
+            self.bulk_controller.start_walk()
         
         try:
-            iterator = bulkCmd(
-                self._engine,
-                self._auth_data,
-                self._transport,
-                self._context,
-                0,  # nonRepeaters
-                max_repetitions,
-                ObjectType(ObjectIdentity(oid)),
-                lexicographicMode=False
-            )
-            
-            for errorIndication, errorStatus, errorIndex, varBinds in iterator:
-                if errorIndication:
-                    self.logger.error(f"SNMP GETBULK error: {errorIndication}")
-                    break
-                elif errorStatus:
-                    self.logger.error(f"SNMP GETBULK error: {errorStatus.prettyPrint()}")
-                    break
-                else:
-                    for varBind in varBinds:
-                        oid_str = str(varBind[0])
-                        value = varBind[1]
-                        results.append((oid_str, value))
+            with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                while not walk.done:
+                    walk.max_varbinds = self._bulk_budget(max_repetitions)
+                    request_oids, repetitions = walk.next_request()
+                    errorIndication, errorStatus, varBindTable = self._send_bulk(
+                        engine, request_oids, repetitions
+                    )
+                    
+                    if self._retry_smaller_bulk(errorIndication, errorStatus, answered):
+                        continue
+                    
+                    if errorIndication:
+                        self.logger.error(f"SNMP GETBULK error: {errorIndication}")
+                        break
+                    elif errorStatus:
+                        self.logger.error(f"SNMP GETBULK error: {errorStatus.prettyPrint()}")
+                        break
+                    
+                    answered = walk.max_varbinds
+                    self._record_bulk_response(repetitions * len(request_oids), varBindTable)
+                    walk.feed(varBindTable)
         
         except Exception as e:
             self.logger.error(f"Exception during SNMP GETBULK: {e}")
         
-        return results
+        if complete is not None:
+            complete.update(walk.complete)
+        return walk.results
+    
+    def _bulk_budget(self, default: int) -> int:
+        """Get the varbind budget for the next GETBULK request."""
+        if self.bulk_controller is None:
+            return default
+        return self.bulk_controller.current(default)
+    
+    def _record_bulk_response(self, requested: int, varBindTable: List[List[Any]]) -> None:
+        """Feed the size of a GETBULK response to the adaptive controller."""
+        if self.bulk_controller is None:
+            return
+        received = 0
+        size = 0
+        for varBinds in varBindTable:
+            for varBind in varBinds:
+                received += 1
+                size += _estimate_varbind_size(varBind)
+        self.bulk_controller.record_response(requested, received, size)
+    
+    def _retry_smaller_bulk(self, errorIndication: Any, errorStatus: Any, answered: Optional[int]) -> bool:
+        """
+        Shrink the adaptive budget after a tooBig error or timeout.
+        
+        Args:
+            errorIndication: Error indication of the GETBULK
+            errorStatus: Error status of the GETBULK
+            answered: Budget of the last answered request of this walk
+        
+        Returns:
+            True if the budget shrank and the request should be resent
+        """
+        if self.bulk_controller is None:
+            return False
+        if isinstance(errorIndication, errind.RequestTimedOut):
+            reason = 'timeout'
+            shrunk = self.bulk_controller.record_timeout(answered)
+        elif not errorIndication and errorStatus and int(errorStatus) == 1:
+            reason = 'tooBig'
+            shrunk = self.bulk_controller.record_failure(reason)
+        else:
+            return False
+        if shrunk:
+            self.logger.warning(f"SNMP GETBULK {reason}, retrying with {self.bulk_controller.value} varbinds")
+            return True
+        return False
+    
+    def _send_bulk(self, engine: Any, oids: List[Any], max_repetitions: int) -> Tuple[Any, Any, List[List[Any]]]:
+        """
+        Send a single GETBULK request and wait for the response.
+        
+        The blocking hlapi bulkCmd keeps requesting every column until all of
+        them are exhausted, so the one-shot asyncore command is used instead.
+        
+        Returns:
+            Tuple of (errorIndication, errorStatus, varBindTable)
+        """
+        response = {}
+        
+        def callback(snmpEngine, sendRequestHandle, errorIndication,
+                     errorStatus, errorIndex, varBindTable, cbCtx):
+            cbCtx.update(
+                errorIndication=errorIndication,
+                errorStatus=errorStatus,
+                varBindTable=varBindTable
+            )
+        
+        asyncore_cmdgen.bulkCmd(
+            engine,
+            self._auth_data,
+            self._transport,
+            self._context,
+            0,  # nonRepeaters
+            max_repetitions,
+            *[ObjectType(ObjectIdentity(oid)) for oid in oids],
+            cbFun=callback,
+            cbCtx=response
+        )
+        engine.transportDispatcher.runDispatcher()
+        
+        return response['errorIndication'], response['errorStatus'], response['varBindTable']
     
     def get_multiple(self, oids: List[str]) -> Dict[str, Any]:
         """
@@ -250,15 +496,16 @@ class SNMPClient:
         try:
             object_types = [ObjectType(ObjectIdentity(oid)) for oid in oids]
             
-            iterator = getCmd(
-                self._engine,
-                self._auth_data,
-                self._transport,
-                self._context,
-                *object_types
-            )
-            
-            errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
+            with self._engine_pool.lease(self._auth_data, self._peer) as engine:
+                iterator = getCmd(
+                    engine,
+                    self._auth_data,
+                    self._transport,
+                    self._context,
+                    *object_types
+                )
+                
+                errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
             
             if errorIndication:
                 self.logger.error(f"SNMP GET error: {errorIndication}")
@@ -288,4 +535,182 @@ class SNMPClient:
         if result:
             self.logger.info(f"SNMP connection test successful")
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def probe(self) -> bool:
+        """
+        Cheap reachability check: one GET of sysUpTime with probe_timeout
+        and without retries.
+        
+        Returns:
+            True if the device answered, False otherwise
+        """
+        return self.get("1.3.6.1.2.1.1.3.0", transport=self._probe_transport) is not None
+    
+    # Coroutine interface used by DevicePoller. The blocking client finishes
+    # each request before returning, so these coroutines never suspend and
+    # can be run without an event loop; AsyncSNMPClient overrides them with
+    # requests that are awaited on the shared event loop.
+    
+    async def async_get(self, oid: str, transport: Any = None) -> Optional[Tuple[str, Any]]:
+        """Coroutine version of get()."""
+        return self.get(oid, transport)
+    
+    async def async_get_multiple(self, oids: List[str]) -> Dict[str, Any]:
+        """Coroutine version of get_multiple()."""
+        return self.get_multiple(oids)
+    
+    async def async_get_bulk(
+        self,
+        oid: str,
+        max_repetitions: int = 50,
+        as_tuples: bool = False
+    ) -> List[Tuple[Any, Any]]:
+        """Coroutine version of get_bulk()."""
+        return self.get_bulk(oid, max_repetitions, as_tuples)
+    
+    async def async_get_bulk_columns(
+        self,
+        oids: List[str],
+        max_repetitions: int = 50,
+        as_tuples: bool = False,
+        complete: Optional[Set[str]] = None
+    ) -> Dict[str, List[Tuple[Any, Any]]]:
+        """Coroutine version of get_bulk_columns()."""
+        return self.get_bulk_columns(oids, max_repetitions, as_tuples, complete)
+    
+    async def async_probe(self) -> bool:
+        """Coroutine version of probe()."""
+        return await self.async_get("1.3.6.1.2.1.1.3.0", transport=self._probe_transport) is not None
+    
+    def usm_keys(self, localized: bool = True) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Get the device's SNMPv3 engine ID and localized keys for persisting.
+        
+        The keys are localized once per engine ID; pysnmp would otherwise
+        hash the passwords again for every engine the device is polled with.
+        Localized keys authenticate and decrypt as the passwords do, so they
+        are only returned when asked for.
+        
+        Args:
+            localized: Include the localized keys and their digest
+        
+        Returns:
+            Dictionary with hex engine_id, auth_key, priv_key and the digest
+            of the credentials they belong to (None without localized), or
+            None for SNMPv2c and before the engine ID was discovered
+        """
+        auth_data = self._auth_data
+        if not SNMP_AVAILABLE or not isinstance(auth_data, UsmUserData):
+            return None
+        if self._usm_keys is not None:
+            return self._usm_keys if localized else self._engine_id_only(self._usm_keys['engine_id'])
+        
+        engine_id = self._peer[1] if self._peer else self._engine_pool.peer_engine_id(self._transport)
+        if not engine_id:
+            return None
+        if not localized:
+            return self._engine_id_only(engine_id.hex())
+        
+        engine_octets = OctetString(engine_id)
+        auth_service = entity_config.authServices[auth_data.authProtocol]
+        priv_service = entity_config.privServices[auth_data.privProtocol]
+        auth_key = auth_service.localizeKey(
+            auth_service.hashPassphrase(auth_data.authKey), engine_octets
+        )
+        priv_key = priv_service.localizeKey(
+            auth_data.authProtocol,
+            priv_service.hashPassphrase(auth_data.authProtocol, auth_data.privKey),
+            engine_octets
+        )
+        self._usm_keys = {
+            'engine_id': engine_id.hex(),
+            'auth_key': bytes(auth_key).hex(),
+            'priv_key': bytes(priv_key).hex(),
+            'digest': self._credentials_digest(engine_id.hex())
+        }
+        return self._usm_keys
+    
+    def use_usm_keys(self, keys: Dict[str, Optional[str]]) -> bool:
+        """
+        Use a persisted engine ID and localized keys (see usm_keys).
+        
+        The engine ID is preloaded into every engine the client leases, so
+        the device is not discovered. Preloaded entries do not expire like
+        discovered ones; they stay until forget_usm_keys(), which the poller
+        calls after an unreachable poll. Localized keys are configured as
+        they are instead of being derived from the passwords; without them
+        pysnmp localizes the passwords to the preloaded engine ID.
+        
+        Args:
+            keys: Dictionary returned by usm_keys() in an earlier run
+        
+        Returns:
+            True if the keys belong to the client's current credentials
+        """
+        if not SNMP_AVAILABLE or not isinstance(self._auth_data, UsmUserData):
+            return False
+        if not keys.get('engine_id'):
+            return False
+        
+        engine_id = bytes.fromhex(keys['engine_id'])
+        if not keys.get('auth_key'):
+            self._auth_data = UsmUserData(
+                self._auth_data.userName,
+                self._auth_data.authKey,
+                self._auth_data.privKey,
+                authProtocol=self._auth_data.authProtocol,
+                privProtocol=self._auth_data.privProtocol,
+                securityEngineId=OctetString(engine_id)
+            )
+            self._peer = (self._transport, engine_id)
+            return True
+        
+        if keys.get('digest') != self._credentials_digest(keys['engine_id']):
+            return False
+        
+        self._auth_data = UsmUserData(
+            self._auth_data.userName,
+            bytes.fromhex(keys['auth_key']),
+            bytes.fromhex(keys['priv_key']),
+            authProtocol=self._auth_data.authProtocol,
+            privProtocol=self._auth_data.privProtocol,
+            securityEngineId=OctetString(engine_id),
+            authKeyType=usmKeyTypeLocalized,
+            privKeyType=usmKeyTypeLocalized
+        )
+        self._peer = (self._transport, engine_id)
+        self._usm_keys = dict(keys)
+        return True
+    
+    def forget_usm_keys(self) -> bool:
+        """
+        Stop using persisted SNMPv3 keys and discover the engine ID again.
+        
+        Returns:
+            True if persisted keys were in use
+        """
+        if self._peer is None:
+            return False
+        self._engine_pool.forget_engine_id(self._transport)
+        self._peer = None
+        self._usm_keys = None
+        self._auth_data = self._setup_auth()
+        return True
+    
+    @staticmethod
+    def _engine_id_only(engine_id: str) -> Dict[str, Optional[str]]:
+        """usm_keys() dictionary with the engine ID only."""
+        return {'engine_id': engine_id, 'auth_key': None, 'priv_key': None, 'digest': None}
+    
+    def _credentials_digest(self, engine_id: str) -> str:
+        """Digest of the v3 credentials and engine ID that localized keys are valid for."""
+        parts = [
+            self.username or 'snmpuser',
+            str(self._auth_data.authProtocol),
+            self.auth_password or 'AuthPass123',
+            str(self._auth_data.privProtocol),
+            self.priv_password or 'PrivPass123',
+            engine_id.lower()
+        ]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Process-wide SNMP engine and transport target pool.
+
+Every SNMPClient used to own a private SnmpEngine (MIB builder, UDP socket,
+USM caches) and UdpTransportTarget, so memory and startup time grew linearly
+with the device list. Engines are now pooled per transport kind and leased
+for the duration of a request; per-device credentials are layered on top of
+whichever engine is leased through the pysnmp LCD. SNMPv3 engine IDs of
+devices that were discovered in an earlier run can be preloaded into leased
+engines, so they are not discovered again.
+"""
+
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from pysnmp.hlapi import SnmpEngine, UsmUserData
+    from pysnmp.proto.rfc1902 import OctetString
+except ImportError:
+    # snmp_client already reports the missing dependency
+    SnmpEngine = None
+    UsmUserData = None
+    OctetString = None
+
+
+class _PooledEngine:
+    """An SnmpEngine plus the SNMPv3 users already configured on it."""
+    
+    def __init__(self, engine: Any):
+        self.engine = engine
+        # (userName, securityEngineId) -> credential fingerprint
+        self.users: Dict[Tuple[Any, Any], Tuple[Any, ...]] = {}
+        self.leases = 0
+    
+    def accepts(self, auth_data: Any) -> bool:
+        """
+        Check whether auth_data can be layered on this engine.
+        
+        pysnmp keys USM users by (userName, securityEngineId), so two devices
+        using the same v3 user name with different keys need separate
+        engines. Community-based auth never conflicts.
+        """
+        key, fingerprint = _usm_identity(auth_data)
+        if key is None:
+            return True
+        return self.users.get(key, fingerprint) == fingerprint
+    
+    def register(self, auth_data: Any) -> None:
+        """Record the v3 user that is about to be configured on this engine."""
+        key, fingerprint = _usm_identity(auth_data)
+        if key is not None:
+            self.users[key] = fingerprint
+
+
+def _usm_identity(auth_data: Any) -> Tuple[Optional[Tuple[Any, Any]], Optional[Tuple[Any, ...]]]:
+    """Return the LCD cache key and credential fingerprint of a UsmUserData."""
+    if UsmUserData is None or not isinstance(auth_data, UsmUserData):
+        return None, None
+    key = (auth_data.userName, auth_data.securityEngineId)
+    fingerprint = (
+        auth_data.authProtocol, auth_data.authKey,
+        auth_data.privProtocol, auth_data.privKey,
+        auth_data.authKeyType, auth_data.privKeyType
+    )
+    return key, fingerprint
+
+
+def _engine_id_cache(engine: Any) -> Optional[Dict[Any, Dict[str, Any]]]:
+    """
+    Return the peer engine ID cache of an engine's SNMPv3 message processing model.
+    
+    pysnmp fills it from discovery responses and has no public API to
+    preload it; None if its internals differ, in which case peers are
+    discovered as usual.
+    """
+    model = engine.messageProcessingSubsystems.get(3)
+    cache = getattr(model, '_SnmpV3MessageProcessingModel__engineIdCache', None)
+    return cache if isinstance(cache, dict) else None
+
+
+class SnmpEnginePool:
+    """
+    Pool of SNMP engines and transport targets for one transport kind.
+    
+    The blocking (asyncore) hlapi drives an engine's dispatcher from the
+    calling thread, so "sync" engines are leased exclusively and the pool
+    grows to the number of concurrent requests, not the number of devices.
+    The "asyncio" pool is only used from the shared event loop thread, where
+    one engine can serve any number of concurrent requests.
+    """
+    
+    _pools: Dict[str, 'SnmpEnginePool'] = {}
+    _pools_lock = threading.Lock()
+    
+    def __init__(self, kind: str, exclusive: bool):
+        """
+        Initialize engine pool.
+        
+        Args:
+            kind: Transport kind ("sync" or "asyncio")
+            exclusive: Lease each engine to one request at a time
+        """
+        self.kind = kind
+        self.exclusive = exclusive
+        self.logger = logging.getLogger('snmp_worker.engine_pool')
+        self._lock = threading.Lock()
+        self._engines: List[_PooledEngine] = []
+        self._transports: Dict[Tuple[Any, ...], Any] = {}
+    
+    @classmethod
+    def for_transport(cls, kind: str) -> 'SnmpEnginePool':
+        """
+        Get the process-wide pool for a transport kind.
+        
+        Args:
+            kind: Transport kind ("sync" or "asyncio")
+        
+        Returns:
+            SnmpEnginePool instance
+        """
+        pool = cls._pools.get(kind)
+        if pool is None:
+            with cls._pools_lock:
+                pool = cls._pools.get(kind)
+                if pool is None:
+                    pool = cls(kind, exclusive=(kind == 'sync'))
+                    cls._pools[kind] = pool
+        return pool
+    
+    def get_transport(
+        self,
+        target_class: Any,
+        host: str,
+        port: int,
+        timeout: int,
+        retries: int
+    ) -> Any:
+        """
+        Get a shared transport target for an address.
+        
+        UdpTransportTarget resolves its address on construction and is
+        otherwise read-only, so identical targets are shared between clients.
+        
+        Args:
+            target_class: UdpTransportTarget class of this transport kind
+            host: Target device IP or hostname
+            port: SNMP port
+            timeout: Timeout in seconds
+            retries: Number of retries
+        
+        Returns:
+            Transport target instance
+        """
+        key = (host, port, timeout, retries)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                transport = target_class((host, port), timeout=timeout, retries=retries)
+                self._transports[key] = transport
+            return transport
+    
+    def _acquire(self, auth_data: Any, peer: Optional[Tuple[Any, bytes]] = None) -> _PooledEngine:
+        """Find or create an engine that accepts auth_data and lease it."""
+        with self._lock:
+            for pooled in self._engines:
+                if self.exclusive and pooled.leases:
+                    continue
+                if pooled.accepts(auth_data):
+                    break
+            else:
+                pooled = _PooledEngine(SnmpEngine())
+                self._engines.append(pooled)
+                self.logger.debug(
+                    f"Created {self.kind} SNMP engine #{len(self._engines)}"
+                )
+            pooled.register(auth_data)
+            if peer is not None:
+                self._preload_engine_id(pooled.engine, *peer)
+            pooled.leases += 1
+            return pooled
+    
+    @staticmethod
+    def _preload_engine_id(engine: Any, transport: Any, engine_id: bytes) -> None:
+        """
+        Make engine use engine_id for transport's address without discovery.
+        
+        The entry is added to pysnmp's engine ID cache directly, outside its
+        expiry queue, so it never expires. A device that gets a new engine ID
+        (replacement, factory reset) stops answering until forget_engine_id()
+        drops it.
+        """
+        cache = _engine_id_cache(engine)
+        key = (transport.transportDomain, transport.transportAddr)
+        if cache is not None and key not in cache:
+            cache[key] = {
+                'securityEngineId': OctetString(engine_id),
+                'contextEngineId': OctetString(engine_id),
+                'contextName': OctetString('')
+            }
+    
+    def peer_engine_id(self, transport: Any) -> Optional[bytes]:
+        """
+        Get the SNMPv3 engine ID an engine of the pool discovered for an address.
+        
+        Args:
+            transport: Transport target of the device
+        
+        Returns:
+            Engine ID octets, or None if no engine knows the device
+        """
+        with self._lock:
+            engines = [pooled.engine for pooled in self._engines]
+        for engine in engines:
+            model = engine.messageProcessingSubsystems.get(3)
+            if model is None:
+                continue
+            engine_id = model.getPeerEngineInfo(transport.transportDomain, transport.transportAddr)[0]
+            if engine_id:
+                return engine_id.asOctets()
+        return None
+    
+    def forget_engine_id(self, transport: Any) -> None:
+        """
+        Drop the engine ID of an address from every engine, so it is discovered again.
+        
+        Args:
+            transport: Transport target of the device
+        """
+        key = (transport.transportDomain, transport.transportAddr)
+        with self._lock:
+            for pooled in self._engines:
+                cache = _engine_id_cache(pooled.engine)
+                if cache is not None:
+                    cache.pop(key, None)
+    
+    def _release(self, pooled: _PooledEngine) -> None:
+        """Return a leased engine to the pool."""
+        with self._lock:
+            pooled.leases -= 1
+    
+    @contextmanager
+    def lease(self, auth_data: Any, peer: Optional[Tuple[Any, bytes]] = None):
+        """
+        Lease an engine that can carry auth_data for one request.
+        
+        Args:
+            auth_data: CommunityData or UsmUserData of the device
+            peer: (transport target, engine ID) of an SNMPv3 device whose
+                engine ID is already known, preloaded into the engine
+        
+        Yields:
+            SnmpEngine instance
+        """
+        pooled = self._acquire(auth_data, peer)
+        try:
+            yield pooled.engine
+        finally:
+            self._release(pooled)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool size statistics.
+        
+        Returns:
+            Dictionary with engine, lease and transport counts
+        """
+        with self._lock:
+            return {
+                'engines': len(self._engines),
+                'leased': sum(p.leases for p in self._engines),
+                'transports': len(self._transports)
+            }
@@ -0,0 +1,68 @@
+-- ============================================================================
+-- Current Port Status Table
+-- Date: 2026-10-18
+-- Purpose: One row per port with its latest polled status
+-- ============================================================================
+--
+-- port_status_data gets a row per port per poll, so readers had to find the
+-- latest row with a MAX(poll_timestamp) / MAX(id) subquery. The worker now
+-- upserts the latest status into port_status_current on every poll, and
+-- readers look ports up by (device_id, port_number).
+--
+-- With database.port_history_mode: on_change, port_status_data only gets a
+-- row when a port's status changed.
+-- ============================================================================
+
+USE switchdb;
+
+CREATE TABLE IF NOT EXISTS `port_status_current` (
+  `id` INT(11) NOT NULL AUTO_INCREMENT,
+  `device_id` INT(11) NOT NULL,
+  `port_number` INT(11) NOT NULL,
+  `port_name` VARCHAR(100) DEFAULT NULL,
+  `port_alias` VARCHAR(255) DEFAULT NULL,
+  `port_description` TEXT DEFAULT NULL,
+  `admin_status` ENUM('UP', 'DOWN', 'DISABLED', 'UNKNOWN') NOT NULL,
+  `oper_status` ENUM('UP', 'DOWN', 'DISABLED', 'UNKNOWN') NOT NULL,
+  `last_change` DATETIME DEFAULT NULL,
+  `port_type` VARCHAR(100) DEFAULT NULL,
+  `port_speed` BIGINT DEFAULT NULL,
+  `port_mtu` INT(11) DEFAULT NULL,
+  `vlan_id` INT(11) DEFAULT NULL,
+  `vlan_name` VARCHAR(100) DEFAULT NULL,
+  `mac_address` VARCHAR(17) DEFAULT NULL,
+  `mac_addresses` TEXT DEFAULT NULL,
+  `first_seen` DATETIME NOT NULL,
+  `last_seen` DATETIME NOT NULL,
+  `poll_timestamp` DATETIME NOT NULL,
+
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_psc_device_port` (`device_id`, `port_number`),
+  KEY `idx_psc_status` (`oper_status`),
+  KEY `idx_psc_mac` (`mac_address`),
+  CONSTRAINT `fk_psc_device` FOREIGN KEY (`device_id`) REFERENCES `snmp_devices` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Backfill from the latest port_status_data row of every port
+INSERT IGNORE INTO `port_status_current` (
+  device_id, port_number, port_name, port_alias, port_description,
+  admin_status, oper_status, last_change, port_type, port_speed, port_mtu,
+  vlan_id, vlan_name, mac_address, mac_addresses,
+  first_seen, last_seen, poll_timestamp
+)
+SELECT
+  psd.device_id, psd.port_number, psd.port_name, psd.port_alias, psd.port_description,
+  UPPER(psd.admin_status), UPPER(psd.oper_status), psd.last_change, psd.port_type, psd.port_speed, psd.port_mtu,
+  psd.vlan_id, psd.vlan_name, psd.mac_address, psd.mac_addresses,
+  COALESCE(psd.first_seen, psd.poll_timestamp), COALESCE(psd.last_seen, psd.poll_timestamp), psd.poll_timestamp
+FROM port_status_data psd
+JOIN (
+  SELECT device_id, port_number, MAX(poll_timestamp) AS poll_timestamp
+  FROM port_status_data
+  GROUP BY device_id, port_number
+) latest
+  ON latest.device_id = psd.device_id
+  AND latest.port_number = psd.port_number
+  AND latest.poll_timestamp = psd.poll_timestamp;
+
+SELECT 'SUCCESS: port_status_current created' AS status;
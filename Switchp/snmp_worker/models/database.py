@@ -81,6 +81,13 @@ class SNMPDevice(Base):
     snmp_v3_priv_protocol = Column(String(20))
     snmp_v3_priv_password = Column(String(200))
     snmp_engine_id = Column(String(100))  # SNMPv3 Engine ID (hex string)
+    snmp_v3_auth_key = Column(String(128))  # Auth key localized to snmp_engine_id (hex, snmp.persist_usm_keys only)
+    snmp_v3_priv_key = Column(String(128))  # Priv key localized to snmp_engine_id (hex, snmp.persist_usm_keys only)
+    snmp_v3_key_digest = Column(String(64))  # SHA-256 of the credentials the keys belong to
+    
+    # Vendor auto-detection, used when vendor/model do not name a mapper
+    sys_object_id = Column(String(255))  # sysObjectID read at discovery
+    detected_mapper = Column(String(100))  # Mapper key, e.g. "cisco_cbs350"
     
     # Device Info
     status = Column(Enum(DeviceStatus), default=DeviceStatus.OFFLINE, nullable=False)
@@ -212,6 +219,60 @@ class PortStatusData(Base):
         return f"<PortStatusData(id={self.id}, device_id={self.device_id}, port={self.port_number}, status={self.oper_status})>"
 
 
+class PortStatusCurrent(Base):
+    """
+    Latest known status of every port.
+    One row per (device, port), upserted on every poll; port_status_data
+    keeps the history.
+    """
+    __tablename__ = "port_status_current"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    device_id = Column(Integer, ForeignKey('snmp_devices.id', ondelete='CASCADE'), nullable=False)
+    
+    # Port identification
+    port_number = Column(Integer, nullable=False)
+    port_name = Column(String(100))
+    port_alias = Column(String(255))
+    port_description = Column(Text)
+    
+    # Port status
+    admin_status = Column(Enum(PortStatus), nullable=False)
+    oper_status = Column(Enum(PortStatus), nullable=False)
+    last_change = Column(DateTime)
+    
+    # Port configuration
+    port_type = Column(String(100))
+    port_speed = Column(Integer)  # in bps
+    port_mtu = Column(Integer)
+    
+    # VLAN information
+    vlan_id = Column(Integer)
+    vlan_name = Column(String(100))
+    
+    # Connected device info
+    mac_address = Column(String(17))
+    mac_addresses = Column(Text)  # JSON format
+    
+    # Timestamps
+    first_seen = Column(DateTime, default=get_current_time, nullable=False)
+    last_seen = Column(DateTime, default=get_current_time, onupdate=get_current_time, nullable=False)
+    poll_timestamp = Column(DateTime, default=get_current_time, nullable=False)
+    
+    # Relationships
+    device = relationship("SNMPDevice")
+    
+    # Indexes and constraints
+    __table_args__ = (
+        UniqueConstraint('device_id', 'port_number', name='uq_psc_device_port'),
+        Index('idx_psc_status', 'oper_status'),
+        Index('idx_psc_mac', 'mac_address'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<PortStatusCurrent(device_id={self.device_id}, port={self.port_number}, status={self.oper_status})>"
+
+
 class Alarm(Base):
     """
     Active alarms for devices and ports.
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark SNMP engine setup cost: one SnmpEngine per device vs the shared pool.
+
+For every simulated device a client is created and its first request is
+prepared up to the point where a PDU would be sent (LCD configure, which adds
+the credentials, target entries and opens the UDP socket). No packets leave
+the host, so the numbers isolate the per-device setup overhead.
+
+Usage:
+    python scripts/benchmark_engine_pool.py [--devices 1000] [--v3-users 4]
+"""
+
+import argparse
+import gc
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pysnmp.hlapi import SnmpEngine, UdpTransportTarget
+from pysnmp.hlapi.lcd import CommandGeneratorLcdConfigurator
+
+from core.snmp_client import SNMPClient
+from core.snmp_engine_pool import SnmpEnginePool
+
+
+def make_clients(count: int, v3_users: int):
+    """Build client parameters for count devices in 10.0.0.0/16."""
+    params = []
+    for i in range(count):
+        host = f"10.0.{i // 250}.{i % 250 + 1}"
+        if v3_users and i % 2:
+            # Same user names with per-site keys, the case the pool must split
+            params.append(dict(
+                host=host,
+                version="3",
+                username=f"snmpuser{i % v3_users}",
+                auth_password=f"AuthPass-site{i % 3}",
+                priv_password=f"PrivPass-site{i % 3}",
+                auth_protocol="SHA",
+                priv_protocol="AES"
+            ))
+        else:
+            params.append(dict(host=host, version="2c", community="public"))
+    return params
+
+
+def per_device_engines(params):
+    """Previous behaviour: private engine and transport target per client."""
+    lcd = CommandGeneratorLcdConfigurator()
+    clients = []
+    for kwargs in params:
+        client = SNMPClient.__new__(SNMPClient)
+        client.__dict__.update(kwargs)
+        client.version = kwargs.get("version", "2c")
+        client.community = kwargs.get("community", "public")
+        for name in ("username", "auth_protocol", "auth_password",
+                     "priv_protocol", "priv_password"):
+            client.__dict__.setdefault(name, None)
+        auth_data = client._setup_auth()
+        engine = SnmpEngine()
+        transport = UdpTransportTarget((client.host, 161), timeout=2, retries=1)
+        lcd.configure(engine, auth_data, transport)
+        clients.append((engine, transport))
+    return clients
+
+
+def pooled_engines(params):
+    """Current behaviour: engines leased from the process-wide pool."""
+    lcd = CommandGeneratorLcdConfigurator()
+    clients = []
+    for kwargs in params:
+        client = SNMPClient(timeout=2, retries=1, **kwargs)
+        with client._engine_pool.lease(client._auth_data) as engine:
+            lcd.configure(engine, client._auth_data, client._transport)
+        clients.append(client)
+    return clients
+
+
+def measure(label, func, params):
+    """Run func and print elapsed time and resident memory growth."""
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    result = func(params)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"{label:<22} {elapsed * 1000:>9.1f} ms  "
+        f"{(rss_after - rss_before) / 1024:>8.1f} MiB RSS growth"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=1000, help="Simulated devices")
+    parser.add_argument("--v3-users", type=int, default=4,
+                        help="Distinct SNMPv3 user names (0 = all v2c)")
+    parser.add_argument("--mode", choices=["per-device", "pool"],
+                        help="Run a single mode in this process")
+    args = parser.parse_args()
+    
+    if args.mode is None:
+        # Each mode runs in a fresh interpreter so RSS growth is comparable
+        print(f"Devices: {args.devices} (v3 user names: {args.v3_users})", flush=True)
+        for mode in ("per-device", "pool"):
+            subprocess.run([
+                sys.executable, __file__,
+                "--devices", str(args.devices),
+                "--v3-users", str(args.v3_users),
+                "--mode", mode
+            ], check=True)
+        return
+    
+    params = make_clients(args.devices, args.v3_users)
+    
+    # Warm up imports and MIB loading so neither run pays for them
+    SnmpEngine()
+    
+    if args.mode == "per-device":
+        measure("per-device engines", per_device_engines, params)
+    else:
+        measure("engine pool", pooled_engines, params)
+        stats = SnmpEnginePool.for_transport('sync').stats()
+        print(f"{'':<22} {stats['engines']} engines, {stats['transports']} transport targets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for vendor port parsing on a synthetic 500-interface chassis.
+
+Compares the previous per-column scan (one pass over all varbinds per column,
+substring matching and oid.split for every hit) with the single-pass
+bucket_by_index() parser now used by the mappers.
+
+Usage:
+    python scripts/benchmark_port_parser.py [--interfaces 500] [--rounds 50]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pysnmp.proto.rfc1902 import Gauge32, Integer, OctetString
+
+from vendors.base import VendorOIDMapper
+from vendors.cisco_catalyst9600 import CiscoCatalyst9600Mapper
+
+
+def build_chassis(interfaces: int) -> dict:
+    """Build walked ifTable/ifXTable data in walk (column) order."""
+    m = VendorOIDMapper
+    names = {}
+    for if_index in range(1, interfaces + 1):
+        slot, port = divmod(if_index - 1, 48)
+        names[if_index] = f"TenGigabitEthernet{slot + 1}/0/{port + 1}"
+    # A chassis also carries SVIs and port-channels that the filter drops
+    for if_index in range(interfaces + 1, interfaces + 1 + interfaces // 10):
+        names[if_index] = f"Vlan{if_index}"
+    
+    columns = [
+        (m.OID_IF_DESCR, lambda i: OctetString(names[i])),
+        (m.OID_IF_NAME, lambda i: OctetString(names[i].replace("TenGigabitEthernet", "Te"))),
+        (m.OID_IF_ALIAS, lambda i: OctetString(f"uplink {i}")),
+        (m.OID_IF_TYPE, lambda i: Integer(6)),
+        (m.OID_IF_MTU, lambda i: Integer(9216)),
+        (m.OID_IF_SPEED, lambda i: Gauge32(4294967295)),
+        (m.OID_IF_HIGH_SPEED, lambda i: Gauge32(10000)),
+        (m.OID_IF_ADMIN_STATUS, lambda i: Integer(1)),
+        (m.OID_IF_OPER_STATUS, lambda i: Integer(1 if i % 3 else 2)),
+        (m.OID_IF_PHYS_ADDRESS, lambda i: OctetString(bytes([0, 0x1b, 0x54, 0, i // 256, i % 256]))),
+    ]
+    snmp_data = {}
+    for column, make in columns:
+        for if_index in names:
+            snmp_data[f"{column}.{if_index}"] = make(if_index)
+    return snmp_data
+
+
+def legacy_parse_port_info(mapper: VendorOIDMapper, snmp_data: dict) -> list:
+    """Previous CiscoCatalyst9600Mapper algorithm: one full scan per column."""
+    ports = {}
+    
+    # Parse interface descriptions to get port numbers
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_DESCR in oid and not oid.endswith(mapper.OID_IF_DESCR):
+            if_index = int(oid.split('.')[-1])
+            descr = str(value)
+            
+            # Filter for physical ethernet ports
+            # Catalyst 9600 uses names like "GigabitEthernet1/0/1"
+            if any(x in descr for x in ['GigabitEthernet', 'TenGigabitEthernet', 'FortyGigabitEthernet']):
+                ports[if_index] = {
+                    'port_number': if_index,
+                    'port_name': descr,
+                    'port_alias': '',
+                    'admin_status': 'unknown',
+                    'oper_status': 'unknown',
+                    'port_type': '',
+                    'port_speed': 0,
+                    'port_mtu': 0,
+                    'mac_address': None,
+                    'vlan_id': None
+                }
+    
+    # Parse interface names
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_NAME in oid and not oid.endswith(mapper.OID_IF_NAME):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['port_name'] = str(value)
+    
+    # Parse interface aliases (descriptions)
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_ALIAS in oid and not oid.endswith(mapper.OID_IF_ALIAS):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['port_alias'] = str(value)
+    
+    # Parse admin status
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_ADMIN_STATUS in oid and not oid.endswith(mapper.OID_IF_ADMIN_STATUS):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['admin_status'] = mapper.status_to_string(int(value))
+    
+    # Parse operational status
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_OPER_STATUS in oid and not oid.endswith(mapper.OID_IF_OPER_STATUS):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['oper_status'] = mapper.status_to_string(int(value))
+    
+    # Parse interface type
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_TYPE in oid and not oid.endswith(mapper.OID_IF_TYPE):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['port_type'] = str(value)
+    
+    # Parse speed (prefer high-speed if available)
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_HIGH_SPEED in oid and not oid.endswith(mapper.OID_IF_HIGH_SPEED):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                # High speed is in Mbps, convert to bps
+                ports[if_index]['port_speed'] = int(value) * 1000000
+        elif mapper.OID_IF_SPEED in oid and not oid.endswith(mapper.OID_IF_SPEED):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports and ports[if_index]['port_speed'] == 0:
+                ports[if_index]['port_speed'] = int(value)
+    
+    # Parse MTU
+    for oid, value in snmp_data.items():
+        if mapper.OID_IF_MTU in oid and not oid.endswith(mapper.OID_IF_MTU):
+            if_index = int(oid.split('.')[-1])
+            if if_index in ports:
+                ports[if_index]['port_mtu'] = int(value)
+    
+    return list(ports.values())
+
+
+def measure(label: str, func, rounds: int) -> float:
+    """Run func rounds times and print the mean time per call."""
+    func()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f"{label:<24} {elapsed * 1000:>8.2f} ms/parse  ({len(result)} ports)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interfaces", type=int, default=500, help="Physical interfaces")
+    parser.add_argument("--rounds", type=int, default=50, help="Parses per measurement")
+    args = parser.parse_args()
+    
+    mapper = CiscoCatalyst9600Mapper()
+    snmp_data = build_chassis(args.interfaces)
+    print(f"Interfaces: {args.interfaces} physical, {len(snmp_data)} varbinds")
+    
+    legacy = measure("per-column scan", lambda: legacy_parse_port_info(mapper, snmp_data), args.rounds)
+    single = measure("single-pass buckets", lambda: mapper.parse_port_info(snmp_data), args.rounds)
+    print(f"Speedup: {legacy / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark port persistence: per-port statements vs the batched write path.
+
+Both paths write one poll of a device that already has port history into an
+in-memory SQLite database. Every statement sent to the driver is counted, and
+an optional per-statement delay stands in for the MySQL round trip, which is
+what dominates the per-port path in production. The legacy ports table is
+reloaded before every poll (the worker does so once per cycle). The legacy
+ports UPDATE uses MySQL syntax and fails on SQLite; it is still counted, as it
+would still be sent. A third run shows the batched path with change-only port
+history.
+
+Usage:
+    python scripts/benchmark_port_persistence.py [--ports 48] [--rounds 20] [--latency-ms 0.5]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from core.database_manager import DatabaseManager
+from core.legacy_port_index import LegacyPortIndex
+from core.port_state_cache import PortStateCache
+from models.database import Base, SNMPDevice, PortStatus, PortStatusData
+
+
+def make_manager(latency: float, ports: int, history_mode: str = "always"):
+    """Create a DatabaseManager on a fresh SQLite database and a statement counter."""
+    manager = DatabaseManager.__new__(DatabaseManager)
+    manager.config = SimpleNamespace(database=SimpleNamespace(
+        batch_writes=True,
+        port_history_mode=history_mode
+    ))
+    manager.logger = logging.getLogger('snmp_worker.db')
+    manager.engine = create_engine("sqlite://")
+    manager.Session = sessionmaker(bind=manager.engine)
+    manager.port_state_cache = PortStateCache()
+    manager.legacy_ports = LegacyPortIndex()
+    Base.metadata.create_all(manager.engine)
+    
+    # Minimal legacy tables with the benchmark switch registered
+    with manager.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE switches (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text(
+            "CREATE TABLE ports (id INTEGER PRIMARY KEY, switch_id INT, port_no INT, "
+            "mac TEXT, device TEXT, connected_to TEXT, oper_status TEXT)"
+        ))
+        conn.execute(text("INSERT INTO switches (id, name) VALUES (1, 'bench-sw')"))
+        conn.execute(
+            text("INSERT INTO ports (switch_id, port_no, oper_status) VALUES (1, :port_no, 'up')"),
+            [{"port_no": port_no} for port_no in range(1, ports + 1)]
+        )
+    
+    counter = {'statements': 0}
+    
+    @event.listens_for(manager.engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter['statements'] += 1
+        if latency:
+            time.sleep(latency)
+    
+    return manager, counter
+
+
+def make_rows(ports: int, poll: int) -> list:
+    """Build port rows for one poll; a few ports flap between polls."""
+    rows = []
+    for port_number in range(1, ports + 1):
+        up = (port_number + poll) % 7 != 0
+        rows.append({
+            'port_number': port_number,
+            'admin_status': PortStatus.UP,
+            'oper_status': PortStatus.UP if up else PortStatus.DOWN,
+            'port_name': f"GigabitEthernet1/0/{port_number}",
+            'port_alias': f"desk {port_number}",
+            'port_type': "6",
+            'port_speed': 1000000000,
+            'port_mtu': 1500,
+            'mac_address': None,
+            'vlan_id': 10
+        })
+    return rows
+
+
+def per_port(manager: DatabaseManager, device: SNMPDevice, rows: list) -> None:
+    """Previous behaviour: one history lookup, INSERT and UPDATE per port."""
+    with manager.session_scope() as session:
+        device = session.merge(device, load=False)
+        for row in rows:
+            row = dict(row)
+            port_number = row.pop('port_number')
+            admin_status = row.pop('admin_status')
+            oper_status = row.pop('oper_status')
+            manager.save_port_status(
+                session, device, port_number, admin_status, oper_status, **row
+            )
+            manager.update_port_operational_status(
+                session, device, port_number, oper_status.value.lower()
+            )
+
+
+def batched(manager: DatabaseManager, device: SNMPDevice, rows: list) -> None:
+    """Current behaviour: one history query, one INSERT and one UPDATE per device."""
+    with manager.session_scope() as session:
+        device = session.merge(device, load=False)
+        manager.save_port_statuses(session, device, rows)
+        manager.update_ports_operational_status(
+            session,
+            device,
+            {row['port_number']: row['oper_status'].value.lower() for row in rows}
+        )
+
+
+def measure(
+    label: str,
+    func,
+    ports: int,
+    rounds: int,
+    latency: float,
+    history_mode: str = "always"
+) -> float:
+    """Run func for rounds polls after a warm-up poll and print the cost per poll."""
+    manager, counter = make_manager(latency, ports, history_mode)
+    with manager.session_scope() as session:
+        device = manager.get_or_create_device(
+            session, name="bench-sw", ip_address="10.0.0.1",
+            vendor="cisco", model="catalyst9600"
+        )
+        session.flush()
+        session.expunge(device)
+    
+    # Seed history so first_seen lookups have rows to find
+    func(manager, device, make_rows(ports, 0))
+    
+    counter['statements'] = 0
+    started = time.perf_counter()
+    for poll in range(1, rounds + 1):
+        manager.legacy_ports.invalidate()
+        func(manager, device, make_rows(ports, poll))
+    elapsed = (time.perf_counter() - started) / rounds
+    statements = counter['statements']
+    with manager.session_scope() as session:
+        history = session.query(PortStatusData).count()
+    print(
+        f"{label:<20} {elapsed * 1000:>8.2f} ms/poll  "
+        f"{statements / rounds:>6.1f} statements/poll  "
+        f"{history:>6} history rows"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ports", type=int, default=48, help="Ports per device")
+    parser.add_argument("--rounds", type=int, default=20, help="Polls per measurement")
+    parser.add_argument("--latency-ms", type=float, default=0.5,
+                        help="Simulated round trip per statement")
+    args = parser.parse_args()
+    
+    # The legacy ports UPDATE is MySQL-only; keep its warnings out of the output
+    logging.getLogger('snmp_worker.db').setLevel(logging.ERROR)
+    
+    print(f"Ports: {args.ports}, simulated round trip: {args.latency_ms} ms")
+    latency = args.latency_ms / 1000
+    old = measure("per-port", per_port, args.ports, args.rounds, latency)
+    new = measure("batched", batched, args.ports, args.rounds, latency)
+    print(f"Speedup: {old / new:.1f}x")
+    measure("batched, on_change", batched, args.ports, args.rounds, latency, "on_change")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from models.database import SNMPDevice, PortStatusData
+from models.database import SNMPDevice, PortStatusCurrent
 from core.database_manager import DatabaseManager
 
 
@@ -65,6 +65,8 @@ class AutoSyncService:
             
             # Commit all changes
             session.commit()
+            # Switch names and port rows changed under the legacy ports index
+            self.db_manager.legacy_ports.invalidate()
             
             if synced_count > 0:
                 self.logger.info(
@@ -164,17 +166,9 @@ class AutoSyncService:
             device: SNMP device
             switch_id: Main switches table ID
         """
-        # Get latest port data
-        latest_ports = session.query(PortStatusData).filter(
-            PortStatusData.device_id == device.id
-        ).filter(
-            PortStatusData.poll_timestamp == session.query(
-                PortStatusData.poll_timestamp
-            ).filter(
-                PortStatusData.device_id == device.id
-            ).order_by(
-                PortStatusData.poll_timestamp.desc()
-            ).limit(1).scalar_subquery()
+        # Get current port data
+        latest_ports = session.query(PortStatusCurrent).filter(
+            PortStatusCurrent.device_id == device.id
         ).all()
         
         ports_synced = 0
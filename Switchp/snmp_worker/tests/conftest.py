@@ -0,0 +1,11 @@
+"""
+Shared test setup.
+
+The worker imports its packages from the snmp_worker directory (e.g.
+"from core.bulk_controller import ..."), so it is put on sys.path here.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
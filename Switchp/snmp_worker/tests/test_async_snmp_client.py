@@ -0,0 +1,29 @@
+"""Tests for the asyncio SNMP client without the asyncio hlapi."""
+
+from unittest import mock
+
+from config.config_loader import DeviceConfig, SNMPConfig
+from core import async_snmp_client, polling_engine
+from core.polling_engine import DevicePoller, run_blocking
+from core.snmp_client import SNMPClient
+
+
+def test_poller_falls_back_to_sync_client():
+    with mock.patch.object(polling_engine, 'ASYNC_SNMP_AVAILABLE', False):
+        poller = DevicePoller(
+            DeviceConfig(name='sw1', ip='192.0.2.1', vendor='cisco', model='cbs350'),
+            SNMPConfig(transport='asyncio'),
+            mock.MagicMock(),
+            mock.MagicMock(),
+            mock.MagicMock()
+        )
+    assert type(poller.snmp_client) is SNMPClient
+    assert not poller.uses_event_loop
+
+
+def test_client_without_hlapi_returns_empty_results():
+    with mock.patch.object(async_snmp_client, 'ASYNC_SNMP_AVAILABLE', False):
+        client = async_snmp_client.AsyncSNMPClient('192.0.2.1')
+        assert run_blocking(client.async_get('1.3.6.1.2.1.1.3.0')) is None
+        assert run_blocking(client.async_get_multiple(['1.3.6.1.2.1.1.3.0'])) == {}
+        assert run_blocking(client.async_get_bulk('1.3.6.1.2.1.2.2.1.2')) == []
@@ -0,0 +1,50 @@
+"""Tests for bucketing walked varbinds by table column and row index."""
+
+from vendors.base import bucket_by_index, oid_to_tuple
+
+IF_NAME = "1.3.6.1.2.1.31.1.1.1.1"
+IF_HIGH_SPEED = "1.3.6.1.2.1.31.1.1.1.15"
+IF_ALIAS = "1.3.6.1.2.1.31.1.1.1.18"
+EGRESS_PORTS = "1.3.6.1.2.1.17.7.1.4.2.1.4"
+
+
+def test_single_arc_columns_with_string_oids():
+    snmp_data = {
+        f"{IF_NAME}.1": 'gi1',
+        f"{IF_NAME}.2": 'gi2',
+        f"{IF_ALIAS}.1": 'uplink',
+        f"{IF_HIGH_SPEED}.1": 1000,
+        "1.3.6.1.2.1.2.2.1.2.1": 'ignored'
+    }
+    
+    columns = bucket_by_index(snmp_data, [IF_NAME, IF_ALIAS])
+    assert columns == {IF_NAME: {1: 'gi1', 2: 'gi2'}, IF_ALIAS: {1: 'uplink'}}
+
+
+def test_column_prefixes_match_exactly_with_tuple_oids():
+    # ifName ...1.1 must not swallow ifAlias ...1.18 or ifHighSpeed ...1.15
+    snmp_data = {
+        oid_to_tuple(IF_NAME) + (7,): 'gi7',
+        oid_to_tuple(IF_ALIAS) + (7,): 'printer',
+        oid_to_tuple(IF_HIGH_SPEED) + (7,): 100
+    }
+    
+    columns = bucket_by_index(snmp_data, [IF_NAME, IF_HIGH_SPEED])
+    assert columns == {IF_NAME: {7: 'gi7'}, IF_HIGH_SPEED: {7: 100}}
+
+
+def test_multi_arc_index_is_a_tuple():
+    for key in (lambda oid: oid, oid_to_tuple):
+        snmp_data = {
+            key(f"{EGRESS_PORTS}.0.10"): b'\x80',
+            key(f"{EGRESS_PORTS}.0.20"): b'\x40',
+            key(f"{IF_NAME}.3"): 'gi3'
+        }
+        
+        columns = bucket_by_index(snmp_data, [EGRESS_PORTS, IF_NAME], index_arcs={EGRESS_PORTS: 2})
+        assert columns[EGRESS_PORTS] == {(0, 10): b'\x80', (0, 20): b'\x40'}
+        assert columns[IF_NAME] == {3: 'gi3'}
+
+
+def test_empty_walk_gives_empty_columns():
+    assert bucket_by_index({}, [IF_NAME], index_arcs={EGRESS_PORTS: 2}) == {IF_NAME: {}, EGRESS_PORTS: {}}
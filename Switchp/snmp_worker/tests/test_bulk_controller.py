@@ -0,0 +1,148 @@
+"""Tests for the adaptive GETBULK size controller."""
+
+from core.bulk_controller import BulkSizeController
+
+
+def full_response(controller: BulkSizeController) -> None:
+    """Record a complete response of the current budget, well under the size target."""
+    controller.record_response(controller.value, controller.value, 100)
+
+
+def test_grows_after_full_responses():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10)
+    assert controller.current(20) == 20
+    full_response(controller)
+    assert controller.current(20) == 30
+
+
+def test_too_big_halves_and_caps_at_last_good():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10)
+    controller.current(20)
+    full_response(controller)  # 20 worked, budget 30
+    assert controller.record_failure('tooBig')
+    assert controller.value == 15
+    assert controller.ceiling == 20
+
+
+def test_too_big_at_minimum_does_not_retry():
+    controller = BulkSizeController(minimum=5, maximum=100)
+    controller.current(5)
+    assert not controller.record_failure('tooBig')
+    assert controller.value == 5
+
+
+def test_timeout_without_answer_in_walk_keeps_budget():
+    controller = BulkSizeController(minimum=5, maximum=100)
+    controller.current(50)
+    # A device that is down times out on the first request of every walk
+    for _ in range(5):
+        assert not controller.record_timeout(None)
+    assert controller.value == 50
+    assert controller.ceiling == 100
+
+
+def test_timeout_at_answered_size_keeps_budget():
+    controller = BulkSizeController(minimum=5, maximum=50)
+    controller.current(50)
+    assert not controller.record_timeout(50)
+    assert controller.value == 50
+
+
+def test_timeout_after_smaller_answer_falls_back_to_it():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10)
+    controller.current(40)
+    full_response(controller)  # 40 answered, budget 50
+    assert controller.record_timeout(40)
+    assert controller.value == 40
+    assert controller.ceiling == 40
+
+
+def test_timeout_on_first_request_falls_back_to_earlier_walk():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10)
+    controller.current(40)
+    full_response(controller)  # 40 answered, budget 50
+    # The next walk opens with 50 and times out before any answer
+    assert controller.record_timeout(None)
+    assert controller.value == 40
+    assert controller.ceiling == 40
+
+
+def test_start_walk_drops_unconfirmed_growth():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10)
+    controller.current(40)
+    full_response(controller)  # 40 answered, budget 50
+    controller.start_walk()
+    assert controller.value == 40
+    full_response(controller)
+    assert controller.value == 50
+
+
+def walk(controller: BulkSizeController, limit: int, requests: int) -> bool:
+    """Walk a device that times out on requests above limit varbinds."""
+    controller.start_walk()
+    answered = None
+    done = 0
+    while done < requests:
+        budget = controller.current(20)
+        if budget > limit:
+            if controller.record_timeout(answered):
+                continue
+            return False
+        controller.record_response(budget, budget, 100)
+        answered = budget
+        done += 1
+    return True
+
+
+def test_repeated_walks_against_fixed_limit_keep_succeeding():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10, recover_after=3)
+    results = [walk(controller, limit=40, requests=4) for _ in range(50)]
+    assert all(results)
+    controller.start_walk()
+    assert controller.value == 40
+
+
+def test_truncated_response_sets_ceiling():
+    controller = BulkSizeController(minimum=5, maximum=100)
+    controller.current(40)
+    controller.record_response(40, 25, 100)
+    assert controller.value == 25
+    assert controller.ceiling == 25
+
+
+def test_oversized_response_scales_to_target():
+    controller = BulkSizeController(minimum=5, maximum=100, target_bytes=1000)
+    controller.current(40)
+    controller.record_response(40, 40, 2000)
+    assert controller.value == 20
+
+
+def test_ceiling_recovers_after_clean_responses():
+    controller = BulkSizeController(minimum=5, maximum=60, increase=10, recover_after=3)
+    controller.current(20)
+    full_response(controller)  # 20 worked, budget 30
+    controller.record_failure('tooBig')  # ceiling 20, budget 15
+    assert controller.ceiling == 20
+    
+    ceilings = []
+    for _ in range(12):
+        full_response(controller)
+        ceilings.append(controller.ceiling)
+    assert ceilings[0] == 20
+    assert ceilings[-1] == 60
+    assert controller.value == 60
+
+
+def test_recovery_resets_on_failure():
+    controller = BulkSizeController(minimum=5, maximum=100, increase=10, recover_after=3)
+    controller.current(20)
+    full_response(controller)
+    controller.record_failure('tooBig')  # ceiling 20
+    full_response(controller)
+    full_response(controller)
+    controller.record_response(controller.value, 10, 100)  # truncated: ceiling 10
+    full_response(controller)
+    full_response(controller)
+    assert controller.ceiling == 10
+    full_response(controller)
+    assert controller.ceiling == 20
@@ -0,0 +1,67 @@
+"""Tests for the per-device circuit breaker."""
+
+from core.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, backoff=30, clock=clock)
+    assert not breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()['retry_in'] == 30
+
+
+def test_half_open_after_backoff_and_closed_by_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker(backoff=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 29.9
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 0.1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot() == {'state': 'closed', 'failures': 0, 'backoff': 0.0, 'retry_in': 0.0}
+
+
+def test_failed_probe_doubles_backoff_up_to_maximum():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, backoff=30, max_backoff=100, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    backoffs = [breaker.current_backoff]
+    for _ in range(3):
+        clock.now += breaker.current_backoff
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # A failed half-open probe reopens at once, below the threshold count
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        backoffs.append(breaker.current_backoff)
+    assert backoffs == [30, 60, 100, 100]
+
+
+def test_success_resets_backoff():
+    clock = FakeClock()
+    breaker = CircuitBreaker(backoff=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.record_failure()
+    assert breaker.current_backoff == 60
+    
+    clock.now += 60
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.current_backoff == 30
@@ -0,0 +1,48 @@
+"""Tests for port status persistence."""
+
+from unittest import mock
+
+import pytest
+
+from config.config_loader import DatabaseConfig
+from core.database_manager import DatabaseManager
+from models.database import Base, PortStatus, PortStatusCurrent, SNMPDevice
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Database manager on an empty SQLite database."""
+    config = mock.MagicMock()
+    config.database = DatabaseConfig()
+    config.get_database_url.return_value = f"sqlite:///{tmp_path / 'worker.db'}"
+    manager = DatabaseManager(config)
+    Base.metadata.create_all(manager.engine)
+    return manager
+
+
+def port(port_number: int) -> dict:
+    """Column values of an up port."""
+    return {'port_number': port_number, 'admin_status': PortStatus.UP, 'oper_status': PortStatus.UP}
+
+
+def current_ports(db_manager: DatabaseManager) -> list:
+    """Port numbers in port_status_current."""
+    with db_manager.session_scope() as session:
+        return sorted(row.port_number for row in session.query(PortStatusCurrent))
+
+
+def test_full_poll_deletes_vanished_ports(db_manager):
+    with db_manager.session_scope() as session:
+        device = db_manager.get_or_create_device(
+            session, name='sw1', ip_address='192.0.2.1', vendor='cisco', model='cbs350'
+        )
+        db_manager.save_port_statuses(session, device, [port(1), port(2), port(3)])
+    
+    with db_manager.session_scope() as session:
+        device = session.query(SNMPDevice).one()
+        db_manager.save_port_statuses(session, device, [port(1), port(3)])
+        assert db_manager.delete_stale_ports(session, device, [1, 3]) == 1
+    
+    assert current_ports(db_manager) == [1, 3]
+    # The cache forgot the deleted port, so it comes back as a new one
+    assert db_manager.port_state_cache.get_first_seen(1, 2) is None
@@ -0,0 +1,120 @@
+"""Tests for forwarding database parsing and collection."""
+
+from unittest import mock
+
+from config.config_loader import DeviceConfig, SNMPConfig
+from core.polling_engine import DevicePoller, run_blocking
+from vendors.base import FdbEntry, oid_to_tuple
+from vendors.cisco_cbs350 import CiscoCBS350Mapper
+
+MAC = (0, 17, 34, 51, 68, 85)
+MAC_TEXT = '00:11:22:33:44:55'
+
+
+def row(column: str, *index: int) -> tuple:
+    """OID tuple of a table cell."""
+    return oid_to_tuple(column) + index
+
+
+def bridge_ports(mapper: CiscoCBS350Mapper) -> dict:
+    """dot1dBasePortIfIndex mapping bridge ports 1 and 2 to interfaces 101 and 102."""
+    return {
+        row(mapper.OID_DOT1D_BASE_PORT, 1): 101,
+        row(mapper.OID_DOT1D_BASE_PORT, 2): 102
+    }
+
+
+def test_fdb_id_is_mapped_to_vlan():
+    mapper = CiscoCBS350Mapper()
+    snmp_data = bridge_ports(mapper)
+    snmp_data[row(mapper.OID_DOT1Q_VLAN_FDB_ID, 0, 20)] = 5
+    snmp_data[row(mapper.OID_DOT1Q_TP_FDB_PORT, 5, *MAC)] = 2
+    
+    assert mapper.parse_fdb(snmp_data) == [FdbEntry(MAC_TEXT, 20, 102, 5)]
+
+
+def test_shared_or_unlisted_fdb_has_no_vlan():
+    mapper = CiscoCBS350Mapper()
+    snmp_data = bridge_ports(mapper)
+    # Shared VLAN learning: VLANs 10 and 20 use filtering database 1
+    snmp_data[row(mapper.OID_DOT1Q_VLAN_FDB_ID, 0, 10)] = 1
+    snmp_data[row(mapper.OID_DOT1Q_VLAN_FDB_ID, 0, 20)] = 1
+    snmp_data[row(mapper.OID_DOT1Q_TP_FDB_PORT, 1, *MAC)] = 1
+    snmp_data[row(mapper.OID_DOT1Q_TP_FDB_PORT, 7, *MAC)] = 2
+    
+    assert mapper.parse_fdb(snmp_data) == [
+        FdbEntry(MAC_TEXT, None, 101, 1),
+        FdbEntry(MAC_TEXT, None, 102, 7)
+    ]
+
+
+def test_legacy_fdb_and_unknown_bridge_port():
+    mapper = CiscoCBS350Mapper()
+    snmp_data = bridge_ports(mapper)
+    snmp_data[row(mapper.OID_DOT1D_TP_FDB_PORT, *MAC)] = 1
+    snmp_data[row(mapper.OID_DOT1D_TP_FDB_PORT, *MAC[:5], 86)] = 9
+    
+    assert mapper.parse_fdb(snmp_data) == [FdbEntry(MAC_TEXT, None, 101)]
+
+
+def test_string_oids():
+    mapper = CiscoCBS350Mapper()
+    snmp_data = {
+        f"{mapper.OID_DOT1D_BASE_PORT}.1": 101,
+        f"{mapper.OID_DOT1Q_VLAN_FDB_ID}.0.30": 3,
+        f"{mapper.OID_DOT1Q_TP_FDB_PORT}.3.{'.'.join(map(str, MAC))}": 1
+    }
+    
+    assert mapper.parse_fdb(snmp_data) == [FdbEntry(MAC_TEXT, 30, 101, 3)]
+
+
+def fdb_poller(tables: dict, timed_out: tuple = ()) -> DevicePoller:
+    """CBS350 poller whose device answers column walks from tables."""
+    poller = DevicePoller(
+        DeviceConfig(name='sw1', ip='192.0.2.1', vendor='cisco', model='cbs350'),
+        SNMPConfig(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock()
+    )
+    
+    async def get_bulk_columns(oids, max_repetitions=50, as_tuples=False, complete=None):
+        if complete is not None:
+            complete.update(oid for oid in oids if oid not in timed_out)
+        return {oid: [] if oid in timed_out else list(tables.get(oid, {}).items()) for oid in oids}
+    
+    poller.snmp_client = mock.MagicMock()
+    poller.snmp_client.async_get_bulk_columns = mock.AsyncMock(side_effect=get_bulk_columns)
+    return poller
+
+
+def legacy_tables(mapper: CiscoCBS350Mapper) -> dict:
+    """Device that only fills dot1dTpFdbTable."""
+    return {
+        mapper.OID_DOT1D_BASE_PORT: bridge_ports(mapper),
+        mapper.OID_DOT1D_TP_FDB_PORT: {row(mapper.OID_DOT1D_TP_FDB_PORT, *MAC): 1}
+    }
+
+
+def test_timed_out_dot1q_walk_keeps_dot1q():
+    mapper = CiscoCBS350Mapper()
+    poller = fdb_poller(legacy_tables(mapper), timed_out=(mapper.OID_DOT1Q_TP_FDB_PORT,))
+    
+    assert run_blocking(poller._poll_mac_table()) == []
+    assert not poller._legacy_fdb
+
+
+def test_empty_fdb_keeps_dot1q():
+    mapper = CiscoCBS350Mapper()
+    poller = fdb_poller({mapper.OID_DOT1D_BASE_PORT: bridge_ports(mapper)})
+    
+    assert run_blocking(poller._poll_mac_table()) == []
+    assert not poller._legacy_fdb
+
+
+def test_device_without_dot1q_rows_falls_back_to_dot1d():
+    mapper = CiscoCBS350Mapper()
+    poller = fdb_poller(legacy_tables(mapper))
+    
+    assert run_blocking(poller._poll_mac_table()) == [FdbEntry(MAC_TEXT, None, 101)]
+    assert poller._legacy_fdb
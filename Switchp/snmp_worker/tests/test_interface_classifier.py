@@ -0,0 +1,46 @@
+"""Tests for the memoized interface-name classifier."""
+
+from vendors.base import InterfaceClassifier, InterfaceName
+
+
+def test_physical_and_virtual_interfaces():
+    classifier = InterfaceClassifier(['GigabitEthernet', 'TenGigabitEthernet'], ['Vlan', 'Port-channel'])
+    
+    assert classifier.parse('GigabitEthernet1/0/24') == InterfaceName(True, slot=1, module=0, port=24)
+    assert classifier.parse('TenGigabitEthernet2/1') == InterfaceName(True, slot=2, port=1)
+    assert classifier.parse('Vlan100') == InterfaceName(False, port=100)
+    assert classifier.parse('Null0').is_physical is False
+
+
+def test_exclude_wins_over_include():
+    classifier = InterfaceClassifier(['Ethernet'], ['Ethernet-Mgmt'])
+    assert classifier.parse('Ethernet1').is_physical
+    assert not classifier.parse('Ethernet-Mgmt0').is_physical
+
+
+def test_no_include_means_everything_not_excluded():
+    classifier = InterfaceClassifier([], ['Loopback'])
+    assert classifier.parse('gi5') == InterfaceName(True, port=5)
+    assert classifier.parse('uplink') == InterfaceName(True)
+    assert not classifier.parse('Loopback0').is_physical
+
+
+def test_ignore_case():
+    assert not InterfaceClassifier(['ethernet']).parse('GigabitEthernet1').is_physical
+    assert InterfaceClassifier(['ethernet'], ignore_case=True).parse('GigabitEthernet1').is_physical
+
+
+def test_include_substrings_are_literal():
+    classifier = InterfaceClassifier(['gi1.'])
+    assert classifier.parse('gi1.5').is_physical
+    assert not classifier.parse('gi105').is_physical
+
+
+def test_classify_memoizes_per_if_index_until_description_changes():
+    classifier = InterfaceClassifier(['GigabitEthernet'])
+    first = classifier.classify(10101, 'GigabitEthernet1/0/1')
+    assert classifier.classify(10101, 'GigabitEthernet1/0/1') is first
+    
+    renamed = classifier.classify(10101, 'GigabitEthernet1/0/2')
+    assert renamed is not first
+    assert renamed.port == 2
@@ -0,0 +1,53 @@
+"""Tests for the in-memory legacy ports index."""
+
+import logging
+from unittest import mock
+
+from core.legacy_port_index import LegacyPortIndex, normalize_mac
+from services.autosync_service import AutoSyncService
+
+
+def ports_result(*rows: dict) -> mock.MagicMock:
+    """Query result whose mappings() are rows."""
+    result = mock.MagicMock()
+    result.mappings.return_value = list(rows)
+    return result
+
+
+def test_failed_load_is_not_cached(caplog):
+    index = LegacyPortIndex()
+    session = mock.MagicMock()
+    session.execute.side_effect = [
+        Exception("lost connection"),
+        ports_result({'switch_name': 'sw1', 'port_no': 4, 'mac': 'aa-bb-cc-dd-ee-ff'})
+    ]
+    
+    with caplog.at_level(logging.WARNING):
+        assert index.get_port(session, 'sw1', 4) is None
+    assert "Could not load ports table" in caplog.text
+    
+    port = index.get_port(session, 'sw1', 4)
+    assert port.port_no == 4
+    assert index.find_mac(session, 'AA:BB:CC:DD:EE:FF') is port
+    assert session.execute.call_count == 2
+
+
+def test_normalize_mac():
+    assert normalize_mac('aabb.ccdd.eeff') == 'AA:BB:CC:DD:EE:FF'
+    assert normalize_mac(' junk ') == 'JUNK'
+    assert normalize_mac(None) == ''
+
+
+def test_autosync_invalidates_index():
+    index = LegacyPortIndex()
+    session = mock.MagicMock()
+    session.execute.return_value = ports_result({'switch_name': 'sw1', 'port_no': 4})
+    assert index.get_port(session, 'sw1', 4) is not None
+    
+    db_manager = mock.MagicMock(legacy_ports=index)
+    session.query.return_value.filter.return_value.all.return_value = []
+    assert AutoSyncService(db_manager).sync_all_devices(session)['success']
+    
+    session.execute.return_value = ports_result({'switch_name': 'sw1-renamed', 'port_no': 4})
+    assert index.get_port(session, 'sw1', 4) is None
+    assert index.get_port(session, 'sw1-renamed', 4) is not None
@@ -0,0 +1,106 @@
+"""Tests for the fixed-rate poll scheduler."""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from core.poll_scheduler import PollScheduler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_poller(name: str, poll_interval=None) -> SimpleNamespace:
+    """Stand-in for a DevicePoller."""
+    return SimpleNamespace(device_config=SimpleNamespace(name=name), poll_interval=poll_interval)
+
+
+class Submitter:
+    """submit callback that records polls and leaves their futures pending."""
+    
+    def __init__(self):
+        self.futures = []
+    
+    def __call__(self, poller) -> Future:
+        future = Future()
+        self.futures.append((poller, future))
+        return future
+
+
+def test_first_polls_are_spread_over_one_interval():
+    clock = FakeClock()
+    pollers = [make_poller(f"sw{i}") for i in range(50)]
+    scheduler = PollScheduler(pollers, Submitter(), default_interval=60, clock=clock)
+    
+    slots = [schedule.slot for schedule in scheduler.schedules]
+    assert all(clock.now <= slot <= clock.now + 60 for slot in slots)
+    assert len(set(slots)) > 1
+    assert scheduler.next_due() == min(slots)
+
+
+def test_jitter_stays_within_fraction_of_interval():
+    clock = FakeClock()
+    submit = Submitter()
+    scheduler = PollScheduler([make_poller('sw1', 100)], submit, default_interval=30, jitter=0.1, clock=clock)
+    schedule = scheduler.schedules[0]
+    
+    for _ in range(20):
+        clock.now = schedule.due
+        assert scheduler.run_pending() == 1
+        submit.futures[-1][1].set_result({'success': True})
+        assert schedule.slot <= schedule.due <= schedule.slot + 10
+        assert schedule.interval == 100
+
+
+def test_in_flight_poll_skips_its_slot():
+    clock = FakeClock()
+    submit = Submitter()
+    scheduler = PollScheduler([make_poller('sw1')], submit, default_interval=30, clock=clock)
+    schedule = scheduler.schedules[0]
+    
+    clock.now = schedule.due
+    assert scheduler.run_pending() == 1
+    clock.now = schedule.due
+    assert scheduler.run_pending() == 0
+    assert schedule.skipped == 1 and len(submit.futures) == 1
+    
+    submit.futures[0][1].set_result({'success': True})
+    clock.now = schedule.due
+    assert scheduler.run_pending() == 1
+    
+    window = scheduler.take_window()
+    assert (window['started'], window['successful'], window['skipped']) == (2, 1, 1)
+
+
+def test_missed_slots_are_dropped_not_queued():
+    clock = FakeClock()
+    submit = Submitter()
+    scheduler = PollScheduler([make_poller('sw1')], submit, default_interval=30, clock=clock)
+    schedule = scheduler.schedules[0]
+    first_slot = schedule.slot
+    
+    # The worker loop stalled for three and a half intervals
+    clock.now = first_slot + 105
+    assert scheduler.run_pending() == 1
+    assert schedule.slot == first_slot + 120
+    assert schedule.skipped == 3
+
+
+def test_failed_or_unpersisted_poll_counts_as_failed():
+    clock = FakeClock()
+    submit = Submitter()
+    scheduler = PollScheduler([make_poller('a'), make_poller('b')], submit, default_interval=30, clock=clock)
+    
+    clock.now += 30
+    assert scheduler.run_pending() == 2
+    submit.futures[0][1].set_result({'success': True, 'persist_error': 'db down'})
+    submit.futures[1][1].set_exception(RuntimeError('boom'))
+    
+    assert scheduler.take_window()['failed'] == 2
+    assert [stats['last_success'] for stats in scheduler.stats()] == [False, False]
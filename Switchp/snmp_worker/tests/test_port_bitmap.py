@@ -0,0 +1,38 @@
+"""Tests for PortList bitmap decoding."""
+
+from vendors.base import decode_port_bitmap, octets_of
+
+
+class OctetStringLike:
+    """Stand-in for a pysnmp OctetString."""
+    
+    def __init__(self, octets: bytes):
+        self.octets = octets
+    
+    def asOctets(self) -> bytes:
+        return self.octets
+
+
+def test_port_one_is_the_most_significant_bit():
+    assert decode_port_bitmap(b'\x80') == [1]
+    assert decode_port_bitmap(b'\x01') == [8]
+    assert decode_port_bitmap(b'\x00\x80') == [9]
+
+
+def test_empty_and_all_zero_bitmaps():
+    assert decode_port_bitmap(b'') == []
+    assert decode_port_bitmap(b'\x00' * 64) == []
+
+
+def test_full_and_sparse_bitmaps():
+    assert decode_port_bitmap(b'\xff\xff') == list(range(1, 17))
+    assert decode_port_bitmap(b'\x00' * 127 + b'\x01') == [1024]
+    assert decode_port_bitmap(b'\xa0\x00\x05') == [1, 3, 22, 24]
+
+
+def test_value_types():
+    assert decode_port_bitmap(OctetStringLike(b'\x40')) == [2]
+    assert decode_port_bitmap(bytearray(b'\x20')) == [3]
+    # A str value holds one octet per character
+    assert decode_port_bitmap('\xff') == list(range(1, 9))
+    assert octets_of('\xc0') == b'\xc0'
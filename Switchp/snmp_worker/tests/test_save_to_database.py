@@ -0,0 +1,85 @@
+"""Tests for persisting poll results."""
+
+from unittest import mock
+
+from config.config_loader import DeviceConfig, PollingConfig, SNMPConfig
+from core.polling_engine import DevicePoller, run_blocking
+from models.database import DeviceStatus
+from vendors.base import DeviceInfo, PortInfo
+
+
+def make_poller() -> DevicePoller:
+    """Device poller with mocked database, alarm and change detection."""
+    return DevicePoller(
+        DeviceConfig(name='sw1', ip='192.0.2.1', vendor='cisco', model='cbs350'),
+        SNMPConfig(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        PollingConfig(status_interval=10, incremental=True)
+    )
+
+
+def poll_result(tier: str, ports: list) -> dict:
+    """Successful poll result of a tier."""
+    return {'tier': tier, 'success': True, 'ports': ports, 'duration_ms': 5, 'device_info': None}
+
+
+def test_status_poll_without_changes_keeps_heartbeat():
+    poller = make_poller()
+    poller.save_to_database(poll_result('status', []))
+    
+    db_manager = poller.db_manager
+    db_manager.update_device_status.assert_called_once()
+    db_manager.save_polling_data.assert_called_once()
+    db_manager.save_port_statuses.assert_not_called()
+
+
+def test_status_poll_saves_changed_ports_only():
+    poller = make_poller()
+    port = PortInfo(3, 'gi3', '', 'up', 'down', 'ethernet', 1000, 1500)
+    poller.save_to_database(poll_result('status', [port]))
+    
+    rows = poller.db_manager.save_port_statuses.call_args[0][2]
+    assert [row['port_number'] for row in rows] == [3]
+
+
+def test_incremental_poll_without_changes_moves_reachability():
+    poller = make_poller()
+    port = PortInfo(3, 'gi3', '', 'up', 'up', 'ethernet', 1000, 1500)
+    poller._inventory = {3: port}
+    poller._last_change = {3: 700}
+    poller._sys_uptime = 1000
+    poller._device_info = DeviceInfo('switch', 'sw1', 1000, 1)
+    poller.snmp_client.async_get_multiple = mock.AsyncMock(return_value={'uptime': 1500})
+    poller._walk_oids = mock.AsyncMock(return_value={
+        f"{poller.vendor_mapper.OID_IF_LAST_CHANGE}.3": 700
+    })
+    
+    result = poll_result(None, None)
+    assert run_blocking(poller._poll_incremental(result))
+    assert result['tier'] == 'incremental' and result['ports'] == []
+    poller.save_to_database(result)
+    
+    status_call = poller.db_manager.update_device_status.call_args
+    assert status_call[0][2] == DeviceStatus.ONLINE
+    assert status_call[1]['system_uptime'] == 1500
+    poller.db_manager.save_port_statuses.assert_not_called()
+
+
+def test_unreachable_device_skips_concurrent_walks():
+    poller = DevicePoller(
+        DeviceConfig(name='sw1', ip='192.0.2.1', vendor='cisco', model='cbs350', max_concurrency=3),
+        SNMPConfig(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock()
+    )
+    poller.snmp_client.async_get_multiple = mock.AsyncMock(return_value={})
+    poller._poll_mac_table = mock.AsyncMock(return_value=[])
+    poller._poll_ports = mock.AsyncMock(return_value=[])
+    
+    result = run_blocking(poller.async_poll())
+    assert result['error'] == "Device unreachable"
+    poller._poll_mac_table.assert_not_called()
+    poller._poll_ports.assert_not_called()
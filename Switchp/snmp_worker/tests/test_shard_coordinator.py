@@ -0,0 +1,44 @@
+"""Tests for partitioning devices across polling shards."""
+
+from types import SimpleNamespace
+
+from core.shard_coordinator import partition_devices
+
+
+def device(ip: str, poll_interval=None) -> SimpleNamespace:
+    """Stand-in for a DeviceConfig."""
+    return SimpleNamespace(ip=ip, poll_interval=poll_interval)
+
+
+def load(shard: list, default_interval: float = 60) -> float:
+    """Polls per second of a shard."""
+    return sum(1.0 / (d.poll_interval or default_interval) for d in shard)
+
+
+def test_every_device_is_assigned_once():
+    devices = [device(f"10.0.0.{i}") for i in range(1, 11)]
+    shards = partition_devices(devices, 3, 60)
+    
+    assert len(shards) == 3
+    assert sorted(d.ip for shard in shards for d in shard) == sorted(d.ip for d in devices)
+    assert sorted(len(shard) for shard in shards) == [3, 3, 4]
+
+
+def test_fast_polled_devices_are_spread():
+    devices = [device(f"10.0.1.{i}", 10) for i in range(1, 5)] + [device(f"10.0.2.{i}") for i in range(1, 9)]
+    shards = partition_devices(devices, 2, 60)
+    
+    assert [sum(1 for d in shard if d.poll_interval == 10) for shard in shards] == [2, 2]
+    assert abs(load(shards[0]) - load(shards[1])) < 1e-9
+
+
+def test_partition_does_not_depend_on_device_order():
+    devices = [device(f"10.0.0.{i}", 30 if i % 3 else None) for i in range(1, 13)]
+    shards = partition_devices(devices, 4, 60)
+    
+    assert partition_devices(list(reversed(devices)), 4, 60) == shards
+
+
+def test_more_shards_than_devices():
+    shards = partition_devices([device('10.0.0.1')], 3, 60)
+    assert [len(shard) for shard in shards] == [1, 0, 0]
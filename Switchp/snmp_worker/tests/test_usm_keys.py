@@ -0,0 +1,55 @@
+"""Tests for persisting SNMPv3 engine IDs and localized keys."""
+
+from unittest import mock
+
+from config.config_loader import DeviceConfig, SNMPConfig
+from core.polling_engine import DevicePoller
+
+STORED = {'engine_id': '8000000903aabbccddeeff', 'auth_key': 'aa', 'priv_key': 'bb', 'digest': 'cc'}
+
+
+def make_poller(persist_usm_keys: bool) -> DevicePoller:
+    """SNMPv3 device poller with a mocked client and database."""
+    poller = DevicePoller(
+        DeviceConfig(
+            name='sw1', ip='192.0.2.1', vendor='cisco', model='cbs350', snmp_version='3',
+            snmp_v3={'username': 'u1', 'auth_password': 'authpass12', 'priv_password': 'privpass12'}
+        ),
+        SNMPConfig(persist_usm_keys=persist_usm_keys),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock()
+    )
+    poller.snmp_client = mock.MagicMock()
+    return poller
+
+
+def saved_device_kwargs(poller: DevicePoller) -> dict:
+    """Save a successful poll and return the keyword arguments of the device upsert."""
+    poller.save_to_database({'success': True, 'ports': [], 'duration_ms': 5, 'tier': 'status'})
+    return poller.db_manager.get_or_create_device.call_args[1]
+
+
+def test_stored_keys_are_ignored_and_cleared_by_default():
+    poller = make_poller(persist_usm_keys=False)
+    assert poller.use_usm_keys(STORED)
+    poller.snmp_client.use_usm_keys.assert_called_once_with(
+        {'engine_id': STORED['engine_id'], 'auth_key': None, 'priv_key': None, 'digest': None}
+    )
+    
+    poller.snmp_client.usm_keys.return_value = poller.snmp_client.use_usm_keys.call_args[0][0]
+    kwargs = saved_device_kwargs(poller)
+    poller.snmp_client.usm_keys.assert_called_once_with(localized=False)
+    assert kwargs['snmp_engine_id'] == STORED['engine_id']
+    assert kwargs['snmp_v3_auth_key'] is None
+    assert kwargs['snmp_v3_priv_key'] is None
+
+
+def test_keys_are_used_and_saved_when_enabled():
+    poller = make_poller(persist_usm_keys=True)
+    assert poller.use_usm_keys(STORED)
+    poller.snmp_client.use_usm_keys.assert_called_once_with(STORED)
+    
+    # Unchanged keys are not written again
+    poller.snmp_client.usm_keys.return_value = dict(STORED)
+    assert 'snmp_v3_auth_key' not in saved_device_kwargs(poller)
@@ -0,0 +1,98 @@
+"""Tests for vendor mapper detection from sysObjectID."""
+
+from unittest import mock
+
+from config.config_loader import DeviceConfig, SNMPConfig
+from core.polling_engine import DevicePoller, run_blocking
+from vendors.base import OidPrefixTrie, VendorOIDMapper
+from vendors.factory import VendorFactory
+
+
+def test_catalyst9600_is_detected_by_its_chassis_id():
+    assert VendorFactory.detect('1.3.6.1.4.1.9.1.2494') == 'cisco_catalyst9600'
+
+
+def test_other_cisco_ios_devices_are_not_detected():
+    # Catalyst 2960X-48FPD-L
+    assert VendorFactory.detect('1.3.6.1.4.1.9.1.1208') is None
+
+
+def test_2930f_is_detected_by_its_model_id():
+    # Aruba 2930F-48G-PoE+-4SFP+ (JL256A)
+    assert VendorFactory.detect('1.3.6.1.4.1.11.2.3.7.11.184') == 'aruba_2930f'
+
+
+def test_other_procurve_models_are_not_detected():
+    # HP 2530-48G-PoE+ (J9772A)
+    assert VendorFactory.detect('1.3.6.1.4.1.11.2.3.7.11.141') is None
+    assert VendorFactory.detect('1.3.6.1.4.1.11.2.3.7.11') is None
+
+
+def test_cbs350_family_prefix():
+    assert VendorFactory.detect('.1.3.6.1.4.1.9.6.1.95.24.2') == 'cisco_cbs350'
+
+
+def make_poller(vendor: str = 'auto') -> DevicePoller:
+    """Device poller without a configured mapper."""
+    return DevicePoller(
+        DeviceConfig(name='sw1', ip='192.0.2.1', vendor=vendor, model=''),
+        SNMPConfig(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock()
+    )
+
+
+def test_detection_of_another_vendor_is_refused():
+    poller = make_poller(vendor='aruba')
+    assert poller.vendor_mapper is None
+    assert not poller.use_detected_mapper('cisco_cbs350', '1.3.6.1.4.1.9.6.1.95.24.2')
+    assert poller.vendor_mapper is None
+    assert poller.use_detected_mapper('aruba_2930f', '1.3.6.1.4.1.11.2.3.7.11.181')
+
+
+def test_restored_detection_is_checked_against_live_sys_object_id():
+    poller = make_poller()
+    assert poller.use_detected_mapper('cisco_catalyst9600', '1.3.6.1.4.1.9.1', restored=True)
+    
+    # The stored detection came from a 9600 profile that matched every IOS device
+    result = {'error': None}
+    snmp_data = {VendorOIDMapper.OID_SYS_OBJECT_ID: '1.3.6.1.4.1.9.6.1.95.24.2'}
+    assert not run_blocking(poller._verify_detection(snmp_data, result))
+    assert poller.detected_mapper == 'cisco_cbs350'
+    assert poller.sys_object_id == '1.3.6.1.4.1.9.6.1.95.24.2'
+    assert result['error'] == "Vendor mapper changed to cisco_cbs350"
+    assert not poller._verify_sys_object_id
+
+
+def test_restored_detection_with_same_sys_object_id_is_kept():
+    poller = make_poller()
+    assert poller.use_detected_mapper('cisco_cbs350', '1.3.6.1.4.1.9.6.1.95.24.2', restored=True)
+    
+    snmp_data = {VendorOIDMapper.OID_SYS_OBJECT_ID: '1.3.6.1.4.1.9.6.1.95.24.2'}
+    assert run_blocking(poller._verify_detection(snmp_data, {'error': None}))
+    assert poller.detected_mapper == 'cisco_cbs350'
+
+
+def test_prefix_trie_longest_match():
+    trie = OidPrefixTrie()
+    trie.insert('1.3.6.1.4.1.9', 'cisco')
+    trie.insert('1.3.6.1.4.1.9.6.1', 'cisco_smb')
+    trie.insert('.1.3.6.1.4.1.11.2.3.7.11', 'aruba')
+    
+    assert trie.longest_match('1.3.6.1.4.1.9.6.1.95.24.2') == 'cisco_smb'
+    assert trie.longest_match('1.3.6.1.4.1.9.1.2494') == 'cisco'
+    assert trie.longest_match('1.3.6.1.4.1.9') == 'cisco'
+    assert trie.longest_match('1.3.6.1.4.1.11.2.3.7.11.181') == 'aruba'
+    # Arcs are compared as integers, not as text: 9.60 is not under 9.6
+    assert trie.longest_match('1.3.6.1.4.1.9.60.1') == 'cisco'
+
+
+def test_prefix_trie_no_match():
+    trie = OidPrefixTrie()
+    trie.insert('1.3.6.1.4.1.9.6.1', 'cisco_smb')
+    
+    assert trie.longest_match('1.3.6.1.4.1.9') is None
+    assert trie.longest_match('1.3.6.1.4.1.2636.1.1') is None
+    assert trie.longest_match('not an oid') is None
+    assert OidPrefixTrie().longest_match('1.3.6') is None
@@ -3,8 +3,9 @@ Vendor abstraction layer for SNMP OID mapping.
 Provides a unified interface for different vendor implementations.
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -23,6 +24,24 @@ class PortInfo:
     vlan_id: Optional[int] = None
 
 
+@dataclass
+class FdbEntry:
+    """Forwarding database entry."""
+    mac: str
+    vlan_id: Optional[int]  # None for dot1dTpFdbTable entries and unmapped filtering databases
+    if_index: int
+    fdb_id: Optional[int] = None  # dot1qFdbId of dot1qTpFdbTable entries
+
+
+@dataclass(frozen=True)
+class InterfaceName:
+    """Classification of an interface description."""
+    is_physical: bool
+    slot: Optional[int] = None
+    module: Optional[int] = None
+    port: Optional[int] = None
+
+
 @dataclass
 class DeviceInfo:
     """Device information structure."""
@@ -32,6 +51,302 @@ class DeviceInfo:
     total_ports: int
 
 
+# ifAdminStatus / ifOperStatus values
+IF_STATUS_NAMES = {
+    1: "up",
+    2: "down",
+    3: "testing",
+    4: "unknown",
+    5: "dormant",
+    6: "notPresent",
+    7: "lowerLayerDown"
+}
+
+
+def oid_to_tuple(oid: str) -> Tuple[int, ...]:
+    """Convert a dotted OID string to an integer tuple."""
+    return tuple(int(arc) for arc in oid.strip('.').split('.'))
+
+
+def format_mac(octets: Tuple[int, ...]) -> str:
+    """Format six integer octets (e.g. an FDB table index) as aa:bb:cc:dd:ee:ff."""
+    return '%02x:%02x:%02x:%02x:%02x:%02x' % tuple(octets)
+
+
+class OidPrefixTrie:
+    """
+    Longest-prefix lookup of OIDs, e.g. sysObjectID to vendor profile.
+    
+    Nodes are dictionaries keyed by integer arcs, with the value of a prefix
+    ending at a node stored under None, so a lookup walks the OID once no
+    matter how many prefixes are registered.
+    """
+    
+    def __init__(self):
+        """Initialize empty trie."""
+        self._root: Dict[Optional[int], Any] = {}
+    
+    def insert(self, prefix: str, value: Any) -> None:
+        """
+        Register a value for an OID prefix.
+        
+        Args:
+            prefix: Dotted OID prefix
+            value: Value returned for OIDs under the prefix
+        """
+        node = self._root
+        for arc in oid_to_tuple(prefix):
+            node = node.setdefault(arc, {})
+        node[None] = value
+    
+    def longest_match(self, oid: str) -> Optional[Any]:
+        """
+        Find the value of the longest registered prefix of an OID.
+        
+        Args:
+            oid: Dotted OID
+        
+        Returns:
+            Value of the longest matching prefix, or None
+        """
+        try:
+            arcs = oid_to_tuple(oid)
+        except ValueError:
+            return None
+        
+        node = self._root
+        match = None
+        for arc in arcs:
+            node = node.get(arc)
+            if node is None:
+                break
+            match = node.get(None, match)
+        return match
+
+
+# Set bit offsets (MSB first) of every byte value, for decode_port_bitmap()
+_BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if byte & (0x80 >> bit))
+    for byte in range(256)
+)
+
+
+def octets_of(value: Any) -> bytes:
+    """
+    Get the raw octets of an SNMP OCTET STRING value.
+    
+    Args:
+        value: pysnmp OctetString, bytes or a latin-1 str
+    
+    Returns:
+        Octets as bytes
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if hasattr(value, 'asOctets'):
+        return value.asOctets()
+    return str(value).encode('latin-1')
+
+
+def decode_port_bitmap(value: Any) -> List[int]:
+    """
+    Decode a PortList bitmap (e.g. dot1qVlanCurrentEgressPorts).
+    
+    The first octet holds ports 1-8 with port 1 in the most significant bit.
+    Only non-zero octets are visited, each through a 256-entry table, so the
+    cost follows the number of member ports rather than the bitmap length.
+    
+    Args:
+        value: Bitmap as pysnmp OctetString, bytes or latin-1 str
+    
+    Returns:
+        Ascending list of 1-based port numbers whose bit is set
+    """
+    ports: List[int] = []
+    for position, byte in enumerate(octets_of(value)):
+        if byte:
+            base = position * 8 + 1
+            ports.extend(base + bit for bit in _BYTE_BITS[byte])
+    return ports
+
+
+def bucket_by_index(
+    snmp_data: Dict[Any, Any],
+    columns: Iterable[str],
+    index_arcs: Optional[Dict[str, int]] = None
+) -> Dict[str, Dict[Any, Any]]:
+    """
+    Bucket walked varbinds by table column and row index in a single pass.
+    
+    Column prefixes are matched exactly (ifName 1.3.6.1.2.1.31.1.1.1.1 does
+    not swallow ifAlias ...1.18 or ifHighSpeed ...1.15), and each OID is split
+    once instead of being scanned for every column. snmp_data may be keyed by
+    dotted strings or by integer tuples (get_bulk(..., as_tuples=True)); with
+    tuples the index is sliced off the key without any string parsing.
+    
+    Args:
+        snmp_data: Dictionary of OID -> value
+        columns: Column OID prefixes to collect
+        index_arcs: Number of index sub-identifiers per column when not 1
+            (e.g. 2 for tables indexed by TimeMark.VlanIndex)
+    
+    Returns:
+        Dictionary mapping column OID to {index: value}; the index is an int
+        for single-arc indexes and a tuple of ints otherwise
+    """
+    arcs = {column: 1 for column in columns}
+    arcs.update(index_arcs or {})
+    buckets: Dict[str, Dict[Any, Any]] = {column: {} for column in arcs}
+    
+    if not snmp_data:
+        return buckets
+    
+    if isinstance(next(iter(snmp_data)), tuple):
+        _bucket_tuple_oids(snmp_data, arcs, buckets)
+    else:
+        _bucket_string_oids(snmp_data, arcs, buckets)
+    
+    return buckets
+
+
+def _bucket_tuple_oids(
+    snmp_data: Dict[Tuple[int, ...], Any],
+    arcs: Dict[str, int],
+    buckets: Dict[str, Dict[Any, Any]]
+) -> None:
+    """bucket_by_index() for integer tuple OIDs."""
+    prefixes = {
+        oid_to_tuple(column): (buckets[column], count)
+        for column, count in arcs.items()
+    }
+    splits = sorted(set(arcs.values()))
+    
+    if splits == [1]:
+        # Common case: every column is indexed by a single ifIndex
+        by_prefix = {prefix: bucket for prefix, (bucket, _) in prefixes.items()}
+        for oid, value in snmp_data.items():
+            bucket = by_prefix.get(oid[:-1])
+            if bucket is not None:
+                bucket[oid[-1]] = value
+        return
+    
+    for oid, value in snmp_data.items():
+        for count in splits:
+            entry = prefixes.get(oid[:-count])
+            if entry is not None and entry[1] == count:
+                entry[0][oid[-1] if count == 1 else oid[-count:]] = value
+                break
+
+
+def _bucket_string_oids(
+    snmp_data: Dict[str, Any],
+    arcs: Dict[str, int],
+    buckets: Dict[str, Dict[Any, Any]]
+) -> None:
+    """bucket_by_index() for dotted string OIDs."""
+    splits = sorted(set(arcs.values()))
+    
+    if splits == [1]:
+        for oid, value in snmp_data.items():
+            prefix, _, index = oid.rpartition('.')
+            bucket = buckets.get(prefix)
+            if bucket is not None:
+                bucket[int(index)] = value
+        return
+    
+    for oid, value in snmp_data.items():
+        for count in splits:
+            parts = oid.rsplit('.', count)
+            bucket = buckets.get(parts[0])
+            if bucket is not None and arcs[parts[0]] == count:
+                if count == 1:
+                    bucket[int(parts[1])] = value
+                else:
+                    bucket[tuple(int(arc) for arc in parts[1:])] = value
+                break
+
+
+class InterfaceClassifier:
+    """
+    Compiled ifDescr classifier, memoized per ifIndex.
+    
+    The include and exclude substrings are compiled into one alternation
+    each, and the result for an ifIndex is reused for as long as its
+    description stays the same, so a device's interface names are parsed
+    once rather than on every poll.
+    """
+    
+    # Trailing interface number: port, slot/port or slot/module/port
+    NUMBER_PATTERN = re.compile(r'(\d+)(?:/(\d+))?(?:/(\d+))?$')
+    
+    def __init__(self, include: Iterable[str], exclude: Iterable[str] = (), ignore_case: bool = False):
+        """
+        Initialize classifier.
+        
+        Args:
+            include: Substrings that mark a physical port (none: any interface
+                that is not excluded)
+            exclude: Substrings that mark a virtual interface even if included
+            ignore_case: Match substrings case-insensitively
+        """
+        flags = re.IGNORECASE if ignore_case else 0
+        self._include = self._compile(include, flags)
+        self._exclude = self._compile(exclude, flags)
+        self._cache: Dict[int, Tuple[str, InterfaceName]] = {}
+    
+    def classify(self, if_index: int, descr: str) -> InterfaceName:
+        """
+        Classify an interface.
+        
+        Args:
+            if_index: Interface index
+            descr: Interface description (ifDescr)
+        
+        Returns:
+            InterfaceName with physical flag and slot/module/port numbers
+        """
+        cached = self._cache.get(if_index)
+        if cached is not None and cached[0] == descr:
+            return cached[1]
+        
+        name = self.parse(descr)
+        self._cache[if_index] = (descr, name)
+        return name
+    
+    def parse(self, descr: str) -> InterfaceName:
+        """
+        Classify an interface description without memoizing it.
+        
+        Args:
+            descr: Interface description (ifDescr)
+        
+        Returns:
+            InterfaceName with physical flag and slot/module/port numbers
+        """
+        is_physical = (
+            (self._include is None or self._include.search(descr) is not None)
+            and (self._exclude is None or self._exclude.search(descr) is None)
+        )
+        
+        match = self.NUMBER_PATTERN.search(descr)
+        if not match:
+            return InterfaceName(is_physical)
+        numbers = [int(group) for group in match.groups() if group is not None]
+        if len(numbers) == 3:
+            return InterfaceName(is_physical, slot=numbers[0], module=numbers[1], port=numbers[2])
+        if len(numbers) == 2:
+            return InterfaceName(is_physical, slot=numbers[0], port=numbers[1])
+        return InterfaceName(is_physical, port=numbers[0])
+    
+    @staticmethod
+    def _compile(substrings: Iterable[str], flags: int) -> Optional['re.Pattern']:
+        """Compile substrings into one alternation, or None without any."""
+        substrings = list(substrings)
+        if not substrings:
+            return None
+        return re.compile('|'.join(re.escape(substring) for substring in substrings), flags)
+
+
 class VendorOIDMapper(ABC):
     """
     Abstract base class for vendor-specific OID mappings.
@@ -61,6 +376,7 @@ class VendorOIDMapper(ABC):
     OID_IF_LAST_CHANGE = "1.3.6.1.2.1.2.2.1.9"
     
     # IF-MIB extensions
+    OID_IF_X_TABLE = "1.3.6.1.2.1.31.1.1.1"
     OID_IF_NAME = "1.3.6.1.2.1.31.1.1.1.1"
     OID_IF_ALIAS = "1.3.6.1.2.1.31.1.1.1.18"
     OID_IF_HIGH_SPEED = "1.3.6.1.2.1.31.1.1.1.15"
@@ -70,13 +386,31 @@ class VendorOIDMapper(ABC):
     OID_DOT1D_TP_FDB_ADDRESS = "1.3.6.1.2.1.17.4.3.1.1"
     OID_DOT1D_TP_FDB_PORT = "1.3.6.1.2.1.17.4.3.1.2"
     
+    # Q-BRIDGE MIB dot1qTpFdbPort, indexed by dot1qFdbId and MAC
+    OID_DOT1Q_TP_FDB_PORT = "1.3.6.1.2.1.17.7.1.2.2.1.2"
+    # dot1qVlanFdbId - filtering database of each VLAN, indexed by TimeMark.VlanIndex
+    OID_DOT1Q_VLAN_FDB_ID = "1.3.6.1.2.1.17.7.1.4.2.1.3"
+    # dot1qVlanCurrentEgressPorts - VLAN membership bitmap, indexed by TimeMark.VlanIndex
+    OID_DOT1Q_VLAN_CURRENT_EGRESS_PORTS = "1.3.6.1.2.1.17.7.1.4.2.1.4"
+    
     # VLAN MIB
     OID_VLAN_TRUNK_PORT_VLANS = "1.3.6.1.4.1.9.9.46.1.6.1.1.4"
     
+    # ifDescr substrings of physical ports, and of interfaces that are not
+    # physical even though they match
+    PHYSICAL_INTERFACE_NAMES: Tuple[str, ...] = ('Ethernet',)
+    VIRTUAL_INTERFACE_NAMES: Tuple[str, ...] = ()
+    INTERFACE_NAMES_IGNORE_CASE = False
+    
     def __init__(self):
         """Initialize vendor mapper."""
         self.vendor_name = "generic"
         self.model_name = "generic"
+        self.interface_classifier = InterfaceClassifier(
+            self.PHYSICAL_INTERFACE_NAMES,
+            self.VIRTUAL_INTERFACE_NAMES,
+            ignore_case=self.INTERFACE_NAMES_IGNORE_CASE
+        )
     
     @abstractmethod
     def get_device_info_oids(self) -> List[str]:
@@ -117,68 +451,158 @@ class VendorOIDMapper(ABC):
         Parse port information from SNMP data.
         
         Args:
-            snmp_data: Dictionary of OID -> value
+            snmp_data: Dictionary of OID (dotted string or integer tuple) -> value
             
         Returns:
             List of PortInfo objects
         """
         pass
     
+    def build_port_data(self, if_index: int, descr: str, columns: Dict[str, Dict[Any, Any]]) -> Dict[str, Any]:
+        """
+        Build PortInfo fields for one interface from bucketed ifTable/ifXTable data.
+        
+        Args:
+            if_index: Interface index
+            descr: Interface description (ifDescr)
+            columns: Output of bucket_by_index() for get_port_info_oids()
+        
+        Returns:
+            Dictionary of PortInfo fields
+        """
+        get = columns.get
+        empty: Dict[Any, Any] = {}
+        name = get(self.OID_IF_NAME, empty).get(if_index)
+        alias = get(self.OID_IF_ALIAS, empty).get(if_index)
+        admin_status = get(self.OID_IF_ADMIN_STATUS, empty).get(if_index)
+        oper_status = get(self.OID_IF_OPER_STATUS, empty).get(if_index)
+        port_type = get(self.OID_IF_TYPE, empty).get(if_index)
+        mtu = get(self.OID_IF_MTU, empty).get(if_index)
+        
+        # Prefer high-speed (Mbps) if available, ifSpeed saturates at 4.29 Gbps
+        high_speed = get(self.OID_IF_HIGH_SPEED, empty).get(if_index)
+        speed = get(self.OID_IF_SPEED, empty).get(if_index)
+        if high_speed is not None and int(high_speed):
+            port_speed = int(high_speed) * 1000000
+        else:
+            port_speed = int(speed) if speed is not None else 0
+        
+        return {
+            'port_number': if_index,
+            'port_name': str(name) if name is not None else descr,
+            'port_alias': str(alias) if alias is not None else '',
+            'admin_status': self.status_to_string(int(admin_status)) if admin_status is not None else 'unknown',
+            'oper_status': self.status_to_string(int(oper_status)) if oper_status is not None else 'unknown',
+            'port_type': str(port_type) if port_type is not None else '',
+            'port_speed': port_speed,
+            'port_mtu': int(mtu) if mtu is not None else 0,
+            'mac_address': None,
+            'vlan_id': None
+        }
+    
     def get_mac_table_oids(self) -> List[str]:
         """
         Get OIDs for MAC address table.
         
+        dot1qTpFdbTable gives MAC, filtering database and bridge port in one
+        column; dot1qVlanFdbId maps the filtering databases to VLANs.
+        
+        Returns:
+            List of OID prefixes to walk
+        """
+        return [
+            self.OID_DOT1Q_TP_FDB_PORT,
+            self.OID_DOT1Q_VLAN_FDB_ID,
+            self.OID_DOT1D_BASE_PORT
+        ]
+    
+    def get_legacy_mac_table_oids(self) -> List[str]:
+        """
+        Get OIDs for MAC address table on devices without Q-BRIDGE-MIB.
+        
         Returns:
             List of OID prefixes to walk
         """
         return [
-            self.OID_DOT1D_TP_FDB_ADDRESS,
             self.OID_DOT1D_TP_FDB_PORT,
             self.OID_DOT1D_BASE_PORT
         ]
     
-    def parse_mac_table(self, snmp_data: Dict[str, Any]) -> Dict[int, List[str]]:
+    def parse_fdb(self, snmp_data: Dict[str, Any]) -> List[FdbEntry]:
         """
-        Parse MAC address table from SNMP data.
+        Parse forwarding database entries from SNMP data.
+        
+        Accepts the walk of get_mac_table_oids() or get_legacy_mac_table_oids().
+        The MAC (and filtering database) are taken from the row index, so only
+        the port column is needed. dot1qFdbId is not a VLAN ID: it is mapped
+        through dot1qVlanFdbId, and entries of a filtering database that is
+        shared by several VLANs (or not listed) get no VLAN.
         
         Args:
-            snmp_data: Dictionary of OID -> value
+            snmp_data: Dictionary of OID (dotted string or integer tuple) -> value
             
         Returns:
-            Dictionary mapping port number to list of MAC addresses
+            List of FdbEntry objects for MACs learned on a known bridge port
         """
-        mac_to_bridge_port = {}
-        bridge_port_to_if_index = {}
+        columns = bucket_by_index(
+            snmp_data,
+            [
+                self.OID_DOT1Q_TP_FDB_PORT,
+                self.OID_DOT1Q_VLAN_FDB_ID,
+                self.OID_DOT1D_TP_FDB_PORT,
+                self.OID_DOT1D_BASE_PORT
+            ],
+            index_arcs={
+                # dot1qTpFdbTable is indexed by dot1qFdbId and the six MAC octets,
+                # dot1dTpFdbTable by the MAC octets only
+                self.OID_DOT1Q_TP_FDB_PORT: 7,
+                self.OID_DOT1Q_VLAN_FDB_ID: 2,
+                self.OID_DOT1D_TP_FDB_PORT: 6
+            }
+        )
         
-        # Parse MAC to bridge port mapping
-        for oid, value in snmp_data.items():
-            if self.OID_DOT1D_TP_FDB_ADDRESS in oid:
-                # Extract MAC address from OID
-                mac_parts = oid.split('.')[-6:]
-                mac = ':'.join([f'{int(x):02x}' for x in mac_parts])
-                mac_to_bridge_port[mac] = None
-            elif self.OID_DOT1D_TP_FDB_PORT in oid:
-                mac_parts = oid.split('.')[-6:]
-                mac = ':'.join([f'{int(x):02x}' for x in mac_parts])
-                bridge_port = int(value)
-                mac_to_bridge_port[mac] = bridge_port
-        
-        # Parse bridge port to interface index mapping
-        for oid, value in snmp_data.items():
-            if self.OID_DOT1D_BASE_PORT in oid:
-                bridge_port = int(oid.split('.')[-1])
-                if_index = int(value)
-                bridge_port_to_if_index[bridge_port] = if_index
+        # Filtering database to VLAN, only for databases used by a single VLAN
+        fdb_vlans: Dict[int, set] = {}
+        for (_, vlan_id), fdb_id in columns[self.OID_DOT1Q_VLAN_FDB_ID].items():
+            fdb_vlans.setdefault(int(fdb_id), set()).add(vlan_id)
+        fdb_to_vlan = {
+            fdb_id: next(iter(vlan_ids))
+            for fdb_id, vlan_ids in fdb_vlans.items()
+            if len(vlan_ids) == 1
+        }
         
-        # Create final mapping: port -> [MACs]
-        port_mac_map: Dict[int, List[str]] = {}
-        for mac, bridge_port in mac_to_bridge_port.items():
-            if bridge_port and bridge_port in bridge_port_to_if_index:
-                if_index = bridge_port_to_if_index[bridge_port]
-                if if_index not in port_mac_map:
-                    port_mac_map[if_index] = []
-                port_mac_map[if_index].append(mac)
+        # Bridge port to interface index mapping
+        bridge_port_to_if_index = {
+            bridge_port: int(value)
+            for bridge_port, value in columns[self.OID_DOT1D_BASE_PORT].items()
+        }
         
+        entries = []
+        for index, value in columns[self.OID_DOT1Q_TP_FDB_PORT].items():
+            if_index = bridge_port_to_if_index.get(int(value))
+            if if_index:
+                entries.append(FdbEntry(format_mac(index[1:]), fdb_to_vlan.get(index[0]), if_index, index[0]))
+        for index, value in columns[self.OID_DOT1D_TP_FDB_PORT].items():
+            if_index = bridge_port_to_if_index.get(int(value))
+            if if_index:
+                entries.append(FdbEntry(format_mac(index), None, if_index))
+        return entries
+    
+    def parse_mac_table(self, snmp_data: Dict[str, Any]) -> Dict[int, List[str]]:
+        """
+        Parse MAC address table from SNMP data.
+        
+        Args:
+            snmp_data: Dictionary of OID (dotted string or integer tuple) -> value
+        
+        Returns:
+            Dictionary mapping port number to list of MAC addresses
+        """
+        port_mac_map: Dict[int, List[str]] = {}
+        for entry in self.parse_fdb(snmp_data):
+            macs = port_mac_map.setdefault(entry.if_index, [])
+            if entry.mac not in macs:
+                macs.append(entry.mac)
         return port_mac_map
     
     @staticmethod
@@ -192,13 +616,4 @@ class VendorOIDMapper(ABC):
         Returns:
             Status string
         """
-        status_map = {
-            1: "up",
-            2: "down",
-            3: "testing",
-            4: "unknown",
-            5: "dormant",
-            6: "notPresent",
-            7: "lowerLayerDown"
-        }
-        return status_map.get(status_code, "unknown")
+        return IF_STATUS_NAMES.get(status_code, "unknown")
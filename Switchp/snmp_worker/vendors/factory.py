@@ -2,10 +2,12 @@
 Vendor factory for creating appropriate OID mappers.
 """
 
-from typing import Dict, Type
-from .base import VendorOIDMapper
+import logging
+from typing import Dict, Optional, Type
+from .base import VendorOIDMapper, OidPrefixTrie
 from .cisco_catalyst9600 import CiscoCatalyst9600Mapper
 from .cisco_cbs350 import CiscoCBS350Mapper
+from .profile_mapper import ProfileMapper, load_profiles, PROFILE_DIR
 
 
 class VendorFactory:
@@ -15,6 +17,76 @@ class VendorFactory:
         'cisco_catalyst9600': CiscoCatalyst9600Mapper,
         'cisco_cbs350': CiscoCBS350Mapper,
     }
+    _profiles_loaded = False
+    
+    # sysObjectID prefix -> mapper key, from the profiles' sys_object_ids
+    _sys_object_ids = OidPrefixTrie()
+    _detected: Dict[str, Optional[str]] = {}
+    
+    @classmethod
+    def load_profiles(cls, directory: str = PROFILE_DIR) -> None:
+        """
+        Register a ProfileMapper for every vendor profile in a directory.
+        
+        Models that already have a mapper class keep it.
+        
+        Args:
+            directory: Directory of vendor profile YAML files
+        """
+        cls._profiles_loaded = True
+        try:
+            profiles = load_profiles(directory)
+        except Exception as e:
+            logging.getLogger('snmp_worker.vendors').error(f"Failed to load vendor profiles: {e}")
+            return
+        
+        for key, profile in profiles.items():
+            if key not in cls._mappers:
+                cls._mappers[key] = ProfileMapper.for_profile(profile)
+            for prefix in profile.get('sys_object_ids') or []:
+                cls._sys_object_ids.insert(str(prefix), key)
+        cls._detected.clear()
+    
+    @classmethod
+    def detect(cls, sys_object_id: str) -> Optional[str]:
+        """
+        Find the mapper for a device by its sysObjectID.
+        
+        Args:
+            sys_object_id: Dotted sysObjectID of the device
+        
+        Returns:
+            Mapper key (e.g. "cisco_cbs350") of the longest matching
+            sys_object_ids prefix, or None if no profile matches
+        """
+        if not cls._profiles_loaded:
+            cls.load_profiles()
+        
+        sys_object_id = str(sys_object_id).strip('.')
+        if sys_object_id not in cls._detected:
+            cls._detected[sys_object_id] = cls._sys_object_ids.longest_match(sys_object_id)
+        return cls._detected[sys_object_id]
+    
+    @classmethod
+    def get_mapper_by_key(cls, key: str) -> VendorOIDMapper:
+        """
+        Get OID mapper by its key.
+        
+        Args:
+            key: Mapper key (e.g., "cisco_cbs350")
+        
+        Returns:
+            VendorOIDMapper instance
+        
+        Raises:
+            ValueError: If no mapper is registered under key
+        """
+        if not cls._profiles_loaded:
+            cls.load_profiles()
+        
+        if key not in cls._mappers:
+            raise ValueError(f"Unknown vendor mapper: {key}")
+        return cls._mappers[key]()
     
     @classmethod
     def get_mapper(cls, vendor: str, model: str) -> VendorOIDMapper:
@@ -31,6 +103,9 @@ class VendorFactory:
         Raises:
             ValueError: If vendor/model combination not supported
         """
+        if not cls._profiles_loaded:
+            cls.load_profiles()
+        
         # Normalize vendor and model names
         vendor_lower = vendor.lower()
         model_lower = model.lower()
@@ -40,10 +115,11 @@ class VendorFactory:
         if key in cls._mappers:
             return cls._mappers[key]()
         
-        # Try partial matches
-        for mapper_key, mapper_class in cls._mappers.items():
-            if vendor_lower in mapper_key and model_lower in mapper_key:
-                return mapper_class()
+        # Try partial matches (an empty vendor or model would match every key)
+        if vendor_lower and model_lower:
+            for mapper_key, mapper_class in cls._mappers.items():
+                if vendor_lower in mapper_key and model_lower in mapper_key:
+                    return mapper_class()
         
         raise ValueError(f"Unsupported vendor/model: {vendor}/{model}. "
                         f"Supported: {', '.join(cls._mappers.keys())}")
@@ -67,4 +143,6 @@ class VendorFactory:
         Returns:
             List of supported combinations
         """
+        if not cls._profiles_loaded:
+            cls.load_profiles()
         return list(cls._mappers.keys())
@@ -0,0 +1,302 @@
+"""
+Declarative vendor profiles.
+
+A profile is a YAML file in vendors/profiles that describes a switch model:
+which columns to walk, how to turn values into PortInfo fields and which
+interfaces are physical ports. ProfileMapper executes any profile with the
+single-pass bucket_by_index() parser, so a new model needs a profile file
+rather than a new mapper class.
+
+Profile format (column names are VendorOIDMapper OID_* constants in lower
+case without the prefix, e.g. if_descr, or dotted OIDs):
+
+    vendor: cisco
+    model: cbs350
+    sys_object_ids: ["1.3.6.1.4.1.9.6.1"]  # sysObjectID prefixes for auto-detection
+    device_info:
+      oids: [sys_descr, sys_name, sys_uptime, if_number]
+      total_ports: physical      # physical (count physical ifDescr) or if_number
+      default_ports:             # when no physical port was counted: first
+        - sys_descr: "24"        # sysDescr substring match, else ifNumber
+          ports: 28
+    ports:
+      columns: [if_descr, if_name, if_alias, if_type, if_admin_status, ...]
+      physical:
+        include: [gi, gigabit]   # ifDescr substrings of physical ports
+        exclude: [vlan]          # ... and of interfaces that are not
+        ignore_case: true
+        if_types: [6]            # optional ifType filter (6 = ethernetCsmacd)
+      fields:                    # optional PortInfo overrides
+        mac_address: {column: if_phys_address, transform: mac}
+      vlan:                      # optional VLAN membership from egress bitmaps
+        egress_ports: dot1q_vlan_current_egress_ports
+        max_ports: 28            # ifIndex is the bitmap port when the name has no number
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Type
+
+import yaml
+
+from .base import (
+    VendorOIDMapper, DeviceInfo, PortInfo, InterfaceClassifier,
+    bucket_by_index, decode_port_bitmap, format_mac, octets_of
+)
+
+
+# Directory of the bundled profiles
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+
+
+def _mac_or_none(value: Any) -> Optional[str]:
+    """Format a six-octet physical address, None for other lengths."""
+    octets = octets_of(value)
+    return format_mac(tuple(octets)) if len(octets) == 6 else None
+
+
+# Value transforms available to profile fields
+VALUE_TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    'str': str,
+    'int': int,
+    'status': lambda value: VendorOIDMapper.status_to_string(int(value)),
+    'mbps': lambda value: int(value) * 1000000,
+    'mac': _mac_or_none
+}
+
+
+def load_profile(path: str) -> Dict[str, Any]:
+    """
+    Load a vendor profile.
+    
+    Args:
+        path: Profile file, or a profile name in PROFILE_DIR (e.g. "cisco_cbs350")
+    
+    Returns:
+        Profile dictionary
+    
+    Raises:
+        ValueError: If the file has no vendor or model
+    """
+    if not os.path.splitext(path)[1]:
+        path = os.path.join(PROFILE_DIR, f"{path}.yml")
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = yaml.safe_load(f) or {}
+    
+    if not profile.get('vendor') or not profile.get('model'):
+        raise ValueError(f"Vendor profile {path} needs a vendor and a model")
+    return profile
+
+
+def load_profiles(directory: str = PROFILE_DIR) -> Dict[str, Dict[str, Any]]:
+    """
+    Load every profile in a directory.
+    
+    Args:
+        directory: Directory of *.yml / *.yaml profiles
+    
+    Returns:
+        Dictionary mapping "vendor_model" keys to profiles
+    """
+    profiles = {}
+    if not os.path.isdir(directory):
+        return profiles
+    
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(('.yml', '.yaml')):
+            profile = load_profile(os.path.join(directory, filename))
+            profiles[f"{profile['vendor']}_{profile['model']}".lower()] = profile
+    return profiles
+
+
+class ProfileMapper(VendorOIDMapper):
+    """
+    OID mapper driven by a vendor profile.
+    
+    Column names are resolved and the physical-port filter is compiled once
+    in __init__; parsing is a single bucket_by_index() pass plus the
+    memoized interface classifier.
+    """
+    
+    # Profile of subclasses bound to one model
+    PROFILE: Dict[str, Any] = {}
+    
+    def __init__(self, profile: Optional[Dict[str, Any]] = None):
+        """
+        Initialize profile mapper.
+        
+        Args:
+            profile: Profile dictionary (defaults to the class PROFILE)
+        
+        Raises:
+            ValueError: If the profile names an unknown column or transform
+        """
+        super().__init__()
+        self.profile = profile or self.PROFILE
+        self.vendor_name = self.profile.get('vendor', 'generic')
+        self.model_name = self.profile.get('model', 'generic')
+        
+        device_info = self.profile.get('device_info') or {}
+        self._device_info_oids = self._resolve_all(
+            device_info.get('oids') or ['sys_descr', 'sys_name', 'sys_uptime', 'if_number']
+        )
+        self._total_ports = device_info.get('total_ports', 'if_number')
+        self._default_ports = device_info.get('default_ports') or []
+        
+        ports = self.profile.get('ports') or {}
+        physical = ports.get('physical') or {}
+        self.interface_classifier = InterfaceClassifier(
+            physical.get('include', self.PHYSICAL_INTERFACE_NAMES),
+            physical.get('exclude', ()),
+            ignore_case=physical.get('ignore_case', False)
+        )
+        self._if_types = set(physical.get('if_types') or ())
+        
+        self._port_oids = self._resolve_all(
+            ports.get('columns') or [
+                'if_descr', 'if_name', 'if_alias', 'if_type', 'if_mtu', 'if_speed',
+                'if_high_speed', 'if_admin_status', 'if_oper_status', 'if_phys_address'
+            ]
+        )
+        if self._if_types and self.OID_IF_TYPE not in self._port_oids:
+            self._port_oids.append(self.OID_IF_TYPE)
+        
+        self._fields = []
+        for field, spec in (ports.get('fields') or {}).items():
+            transform = spec.get('transform', 'str')
+            if transform not in VALUE_TRANSFORMS:
+                raise ValueError(f"Unknown transform '{transform}' for field {field}")
+            self._fields.append((field, self._resolve(spec['column']), VALUE_TRANSFORMS[transform]))
+        
+        vlan = ports.get('vlan') or {}
+        self._egress_oid = self._resolve(vlan['egress_ports']) if vlan.get('egress_ports') else None
+        self._max_bitmap_port = int(vlan.get('max_ports', 0))
+        if self._egress_oid and self._egress_oid not in self._port_oids:
+            self._port_oids.append(self._egress_oid)
+    
+    @classmethod
+    def for_profile(cls, profile: Dict[str, Any]) -> Type['ProfileMapper']:
+        """
+        Create a mapper class bound to a profile, for VendorFactory.
+        
+        Args:
+            profile: Profile dictionary
+        
+        Returns:
+            ProfileMapper subclass
+        """
+        name = f"{profile['vendor']}_{profile['model']}".title().replace('_', '').replace('-', '')
+        return type(f"{name}ProfileMapper", (cls,), {'PROFILE': profile})
+    
+    def get_device_info_oids(self) -> List[str]:
+        """Get OIDs for device information."""
+        return list(self._device_info_oids)
+    
+    def parse_device_info(self, snmp_data: Dict[str, Any]) -> DeviceInfo:
+        """Parse device information from SNMP data."""
+        sys_descr = str(snmp_data.get(self.OID_SYS_DESCR, "Unknown"))
+        sys_name = str(snmp_data.get(self.OID_SYS_NAME, "Unknown"))
+        sys_uptime = int(snmp_data.get(self.OID_SYS_UPTIME, 0))
+        if_number = int(snmp_data.get(self.OID_IF_NUMBER, 0))
+        
+        total_ports = if_number
+        if self._total_ports == 'physical':
+            # ifNumber includes virtual interfaces; count physical ones instead
+            classify = self.interface_classifier.classify
+            total_ports = sum(
+                1 for if_index, value in bucket_by_index(snmp_data, [self.OID_IF_DESCR])[self.OID_IF_DESCR].items()
+                if classify(if_index, str(value)).is_physical
+            )
+            if total_ports == 0:
+                total_ports = next(
+                    (int(rule['ports']) for rule in self._default_ports
+                     if str(rule.get('sys_descr', '')) in sys_descr),
+                    if_number
+                )
+        
+        return DeviceInfo(
+            system_description=sys_descr,
+            system_name=sys_name,
+            system_uptime=sys_uptime,
+            total_ports=total_ports
+        )
+    
+    def get_port_info_oids(self) -> List[str]:
+        """Get OIDs for port information."""
+        return list(self._port_oids)
+    
+    def parse_port_info(self, snmp_data: Dict[str, Any]) -> List[PortInfo]:
+        """
+        Parse port information from SNMP data.
+        
+        Only interfaces the profile's physical filter accepts are returned.
+        """
+        columns = bucket_by_index(
+            snmp_data,
+            self._port_oids,
+            index_arcs={self._egress_oid: 2} if self._egress_oid else None
+        )
+        
+        classify = self.interface_classifier.classify
+        if_types = self._if_types
+        type_column = columns.get(self.OID_IF_TYPE, {})
+        
+        ports = {}
+        port_numbers = {}  # if_index -> port number from the interface name
+        for if_index, value in columns[self.OID_IF_DESCR].items():
+            descr = str(value)
+            name = classify(if_index, descr)
+            if not name.is_physical:
+                continue
+            if if_types and int(type_column.get(if_index, 0)) not in if_types:
+                continue
+            
+            port_data = self.build_port_data(if_index, descr, columns)
+            for field, oid, transform in self._fields:
+                raw = columns[oid].get(if_index)
+                if raw is not None:
+                    port_data[field] = transform(raw)
+            ports[if_index] = port_data
+            port_numbers[if_index] = name.port
+        
+        if self._egress_oid:
+            self._assign_vlans(ports, port_numbers, columns[self._egress_oid])
+        
+        return [PortInfo(**port_data) for port_data in ports.values()]
+    
+    def _assign_vlans(
+        self,
+        ports: Dict[int, Dict[str, Any]],
+        port_numbers: Dict[int, Optional[int]],
+        egress_column: Dict[Any, Any]
+    ) -> None:
+        """Set vlan_id of ports from dot1qVlanCurrentEgressPorts bitmaps."""
+        # Index format: TIME_MARK.VLAN_ID (e.g. 0.10)
+        vlan_port_map = {}  # port_number -> vlan_id mapping
+        for index, value in egress_column.items():
+            vlan_id = index[-1]
+            for port_num in decode_port_bitmap(value):
+                # Prefer non-VLAN-1 assignments (access ports)
+                if port_num not in vlan_port_map or vlan_id > 1:
+                    vlan_port_map[port_num] = vlan_id
+        
+        for if_index, port_data in ports.items():
+            port_num = port_numbers[if_index]
+            if port_num is None and if_index <= self._max_bitmap_port:
+                port_num = if_index
+            if port_num and port_num in vlan_port_map:
+                port_data['vlan_id'] = vlan_port_map[port_num]
+    
+    def _resolve(self, column: str) -> str:
+        """Resolve a profile column name to its OID."""
+        column = str(column)
+        if column[0].isdigit():
+            return column.strip('.')
+        oid = getattr(self, f"OID_{column.upper()}", None)
+        if not isinstance(oid, str):
+            raise ValueError(f"Unknown column '{column}' in {self.vendor_name}/{self.model_name} profile")
+        return oid
+    
+    def _resolve_all(self, columns: List[str]) -> List[str]:
+        """Resolve profile column names to OIDs."""
+        return [self._resolve(column) for column in columns]
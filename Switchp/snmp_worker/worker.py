@@ -21,6 +21,7 @@ if sys.version_info < (3, 7):
 
 # Try to import standard library modules
 try:
+    import os
     import signal
     import time
     import logging
@@ -80,9 +81,6 @@ def check_dependencies():
         print("\n" + "="*60 + "\n")
         sys.exit(1)
 
-# Run dependency check before imports
-check_dependencies()
-
 # Import from local modules with enhanced error handling
 # Import each module individually to identify which one fails
 
@@ -163,7 +161,12 @@ def import_with_diagnostics():
     try:
         print("  [4/7] Importing core.polling_engine...", end=" ", flush=True)
         from core.polling_engine import PollingEngine
+        from core.poll_scheduler import PollScheduler
+        from core.shard_coordinator import ShardCoordinator, partition_devices
         modules_to_import.append(("PollingEngine", PollingEngine))
+        modules_to_import.append(("PollScheduler", PollScheduler))
+        modules_to_import.append(("ShardCoordinator", ShardCoordinator))
+        modules_to_import.append(("partition_devices", partition_devices))
         print("OK")
     except Exception as e:
         print(f"FAILED")
@@ -172,7 +175,7 @@ def import_with_diagnostics():
         print("="*60)
         print(f"\nHata: {e}")
         print("\nCozum:")
-        print("  core/polling_engine.py dosyasini kontrol edin")
+        print("  core/polling_engine.py, core/poll_scheduler.py ve core/shard_coordinator.py dosyalarini kontrol edin")
         print("\n" + "="*60 + "\n")
         import traceback
         traceback.print_exc()
@@ -255,30 +258,95 @@ def import_with_diagnostics():
     # Return the imported modules as a dictionary
     return {name: module for name, module in modules_to_import}
 
-# Perform imports with diagnostics
-print("\nImporting worker modules...")
-imported = import_with_diagnostics()
+def import_shard_modules():
+    """
+    Import the modules a polling shard needs, without diagnostics output.
+    
+    Shard processes are spawned after the parent already passed the
+    diagnostics, and they neither supervise shards nor run autosync.
+    """
+    from config.config_loader import Config
+    from core.database_manager import DatabaseManager
+    from core.alarm_manager import AlarmManager
+    from core.polling_engine import PollingEngine
+    from core.poll_scheduler import PollScheduler
+    from core.shard_coordinator import partition_devices
+    from services.telegram_service import TelegramNotificationService
+    from services.email_service import EmailNotificationService
+    from utils.logger import setup_logging
+    
+    return {
+        "Config": Config,
+        "DatabaseManager": DatabaseManager,
+        "AlarmManager": AlarmManager,
+        "PollingEngine": PollingEngine,
+        "PollScheduler": PollScheduler,
+        "partition_devices": partition_devices,
+        "TelegramNotificationService": TelegramNotificationService,
+        "EmailNotificationService": EmailNotificationService,
+        "setup_logging": setup_logging
+    }
+
+# Worker modules, bound by load_worker_modules() from main() or run_shard(). They
+# are not imported at module level: spawned shard processes import this module
+# again and would repeat the dependency check and the import diagnostics.
+Config = None
+DatabaseManager = None
+AlarmManager = None
+PollingEngine = None
+PollScheduler = None
+ShardCoordinator = None
+partition_devices = None
+TelegramNotificationService = None
+EmailNotificationService = None
+AutoSyncService = None
+setup_logging = None
 
-# Assign to variables for use in the rest of the code
-Config = imported["Config"]
-DatabaseManager = imported["DatabaseManager"]
-AlarmManager = imported["AlarmManager"]
-PollingEngine = imported["PollingEngine"]
-TelegramNotificationService = imported["TelegramNotificationService"]
-EmailNotificationService = imported["EmailNotificationService"]
-AutoSyncService = imported["AutoSyncService"]
-setup_logging = imported["setup_logging"]
+
+def load_worker_modules(imported):
+    """
+    Bind imported worker modules to the names used in this module.
+    
+    Args:
+        imported: Dictionary of name -> module member, as returned by
+            import_with_diagnostics() or import_shard_modules()
+    """
+    global Config, DatabaseManager, AlarmManager, PollingEngine, PollScheduler
+    global ShardCoordinator, partition_devices, TelegramNotificationService
+    global EmailNotificationService, AutoSyncService, setup_logging
+    
+    Config = imported["Config"]
+    DatabaseManager = imported["DatabaseManager"]
+    AlarmManager = imported["AlarmManager"]
+    PollingEngine = imported["PollingEngine"]
+    PollScheduler = imported["PollScheduler"]
+    ShardCoordinator = imported.get("ShardCoordinator")
+    partition_devices = imported["partition_devices"]
+    TelegramNotificationService = imported["TelegramNotificationService"]
+    EmailNotificationService = imported["EmailNotificationService"]
+    AutoSyncService = imported.get("AutoSyncService")
+    setup_logging = imported["setup_logging"]
 
 
 class SNMPWorker:
     """Main SNMP Worker daemon."""
     
-    def __init__(self, config_file: str = None):
+    def __init__(
+        self,
+        config_file: str = None,
+        shards: int = None,
+        shard_index: int = None,
+        status_queue=None
+    ):
         """
         Initialize SNMP Worker.
         
         Args:
             config_file: Path to configuration file
+            shards: Number of shard processes (overrides polling.shards)
+            shard_index: Shard this process polls, None for the coordinator
+                (or the only process when not sharded)
+            status_queue: Queue the shard reports its health to
         """
         self.running = False
         self.config = None
@@ -286,7 +354,10 @@ class SNMPWorker:
         self.alarm_manager = None
         self.polling_engine = None
         self.autosync_service = None
+        self.coordinator = None
         self.logger = None
+        self.shard_index = shard_index
+        self.status_queue = status_queue
         
         # Load configuration
         try:
@@ -295,6 +366,16 @@ class SNMPWorker:
             print(f"Error loading configuration: {e}")
             sys.exit(1)
         
+        self.config_file = config_file
+        self.shards = max(1, shards or self.config.polling.shards)
+        if shard_index is not None:
+            # Poll only this shard's share of the devices
+            self.config.devices = partition_devices(
+                [device for device in self.config.devices if device.enabled],
+                self.shards,
+                self.config.polling.interval
+            )[shard_index]
+        
         # Set timezone from config (using Config object attribute access)
         import os
         try:
@@ -314,18 +395,25 @@ class SNMPWorker:
                 # tzset() not available on Windows
                 print(f"Timezone configured: {timezone_str} (Windows - manual timezone)")
         
-        # Setup logging
+        # Setup logging; shards write their own file so rotation does not race
+        log_file = self.config.logging.file
+        if log_file and shard_index is not None:
+            log_path = Path(log_file)
+            log_file = str(log_path.with_name(f"{log_path.stem}.shard{shard_index}{log_path.suffix}"))
         self.logger = setup_logging(
             log_level=self.config.logging.level,
             log_format=self.config.logging.format,
-            log_file=self.config.logging.file,
+            log_file=log_file,
             max_bytes=self.config.logging.max_bytes,
             backup_count=self.config.logging.backup_count,
             console=self.config.logging.console
         )
         
         self.logger.info("=" * 60)
-        self.logger.info("SNMP Worker Starting")
+        if shard_index is not None:
+            self.logger.info(f"SNMP Worker Shard {shard_index} Starting ({self.shards} shards)")
+        else:
+            self.logger.info("SNMP Worker Starting")
         self.logger.info("=" * 60)
         
         # Initialize components
@@ -335,6 +423,11 @@ class SNMPWorker:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
+    @property
+    def is_coordinator(self) -> bool:
+        """Whether this process supervises shard processes instead of polling."""
+        return self.shard_index is None and self.shards > 1
+    
     def _initialize_components(self):
         """Initialize all worker components."""
         try:
@@ -347,6 +440,21 @@ class SNMPWorker:
                 pass
             self.logger.info("Database connection successful")
             
+            if self.is_coordinator:
+                # Shards poll and raise alarms; this process only supervises them and syncs
+                enabled = [device for device in self.config.devices if device.enabled]
+                partitions = partition_devices(enabled, self.shards, self.config.polling.interval)
+                self.logger.info(f"Initializing {self.shards} polling shards for {len(enabled)} devices...")
+                self.coordinator = ShardCoordinator(
+                    run_shard,
+                    (self.config_file,),
+                    [len(devices) for devices in partitions],
+                    report_interval=self.config.polling.interval
+                )
+                self.autosync_service = AutoSyncService(self.db_manager)
+                self.logger.info("All components initialized successfully")
+                return
+            
             # Notification services
             telegram_service = None
             if self.config.telegram.enabled:
@@ -387,9 +495,10 @@ class SNMPWorker:
                 self.alarm_manager
             )
             
-            # Auto sync service
-            self.logger.info("Initializing auto sync service...")
-            self.autosync_service = AutoSyncService(self.db_manager)
+            # Auto sync service; with shards the coordinator runs it
+            if self.shard_index is None:
+                self.logger.info("Initializing auto sync service...")
+                self.autosync_service = AutoSyncService(self.db_manager)
             
             self.logger.info("All components initialized successfully")
             
@@ -418,54 +527,168 @@ class SNMPWorker:
         """Run the main worker loop."""
         self.running = True
         
+        if self.is_coordinator:
+            return self._run_coordinator()
+        
+        interval = self.config.polling.interval
+        scheduler = PollScheduler(
+            self.polling_engine.pollers,
+            self.polling_engine.submit,
+            default_interval=interval,
+            jitter=self.config.polling.jitter
+        )
+        
         self.logger.info("=" * 60)
         self.logger.info("SNMP Worker Started")
-        self.logger.info(f"Polling interval: {self.config.polling.interval} seconds")
+        self.logger.info(f"Polling interval: {interval} seconds")
         self.logger.info(f"Enabled devices: {len(self.config.devices)}")
+        for schedule in scheduler.schedules:
+            if schedule.interval != interval:
+                self.logger.info(f"  {schedule.name}: every {schedule.interval:g} seconds")
         self.logger.info("=" * 60)
         
+        # Housekeeping (summary, auto sync, cleanup) runs once per polling.interval
         cycle_count = 0
+        next_housekeeping = time.monotonic() + interval
+        self._report_health(None)
         
         try:
             while self.running:
-                cycle_count += 1
-                self.logger.info(f"Starting poll cycle #{cycle_count}")
-                
                 try:
-                    # Poll all devices
-                    results = self.polling_engine.poll_all_devices()
+                    scheduler.run_pending()
                     
-                    # Log summary
-                    successful = sum(1 for r in results if r['success'])
-                    failed = len(results) - successful
+                    if time.monotonic() >= next_housekeeping:
+                        cycle_count += 1
+                        next_housekeeping = max(next_housekeeping + interval, time.monotonic())
+                        self._housekeeping(scheduler, cycle_count)
+                
+                except Exception as e:
+                    self.logger.error(f"Error in poll scheduler: {e}", exc_info=True)
+                
+                # Sleep until the next due poll, waking at least once a second for signals
+                if self.running:
+                    wake_at = min(next_housekeeping, scheduler.next_due() or next_housekeeping)
+                    time.sleep(min(1.0, max(0.0, wake_at - time.monotonic())))
+        
+        except Exception as e:
+            self.logger.error(f"Fatal error in main loop: {e}", exc_info=True)
+            return 1
+        
+        finally:
+            self.shutdown()
+        
+        return 0
+    
+    def _housekeeping(self, scheduler: PollScheduler, cycle_count: int):
+        """
+        Log the polls of the last interval and run periodic tasks.
+        
+        Args:
+            scheduler: Poll scheduler
+            cycle_count: Number of intervals since start
+        """
+        # Pick up ports/switches edits made since the last interval
+        self.db_manager.legacy_ports.invalidate()
+        
+        window = scheduler.take_window()
+        stats = self.polling_engine.take_pipeline_stats()
+        open_circuits = sum(
+            1 for poller in self.polling_engine.pollers
+            if poller.breaker.state != poller.breaker.CLOSED
+        )
+        self._report_health(window, stats, open_circuits)
+        self.logger.info(
+            f"Interval #{cycle_count}: {window['successful']} successful, "
+            f"{window['failed']} failed, {window['skipped']} skipped polls, "
+            f"{open_circuits} open circuit(s) "
+            f"(drift avg {window['avg_drift'] * 1000:.0f}ms, max {window['max_drift'] * 1000:.0f}ms; "
+            f"poll {stats['poll_seconds']:.1f}s, persist {stats['persist_seconds']:.1f}s, "
+            f"backpressure {stats['backpressure_seconds']:.1f}s, "
+            f"max queue {stats['max_queue_depth']}/{stats['queue_size']})"
+        )
+        
+        # Auto sync to main switches table after successful polling (the coordinator does it for shards)
+        if window['successful'] > 0 and self.shard_index is None:
+            self._auto_sync()
+        
+        # Cleanup old notification timestamps periodically
+        if cycle_count % 10 == 0:
+            self.alarm_manager.cleanup_old_notifications()
+    
+    def _auto_sync(self):
+        """Sync polled devices to the main switches table."""
+        try:
+            with self.db_manager.session_scope() as session:
+                sync_result = self.autosync_service.sync_all_devices(session)
+                if sync_result['success'] and sync_result['synced_count'] > 0:
                     self.logger.info(
-                        f"Poll cycle #{cycle_count} complete: "
-                        f"{successful} successful, {failed} failed"
+                        f"Auto sync: {sync_result['synced_count']} device(s) synchronized to main database"
                     )
+        except Exception as e:
+            self.logger.error(f"Auto sync failed: {e}", exc_info=True)
+    
+    def _report_health(self, window: dict = None, stats: dict = None, open_circuits: int = 0):
+        """
+        Send this shard's health report to the coordinator.
+        
+        Args:
+            window: Scheduler window of the last interval (None right after start)
+            stats: Pipeline statistics of the last interval
+            open_circuits: Devices whose circuit is open
+        """
+        if self.status_queue is None:
+            return
+        
+        window = window or {}
+        stats = stats or {}
+        report = {
+            'shard': self.shard_index,
+            'pid': os.getpid(),
+            'time': time.time(),
+            'devices': len(self.polling_engine.pollers),
+            'successful': window.get('successful', 0),
+            'failed': window.get('failed', 0),
+            'skipped': window.get('skipped', 0),
+            'open_circuits': open_circuits,
+            'poll_seconds': stats.get('poll_seconds', 0.0),
+            'persist_seconds': stats.get('persist_seconds', 0.0),
+            'max_queue_depth': stats.get('max_queue_depth', 0)
+        }
+        try:
+            self.status_queue.put_nowait(report)
+        except Exception as e:
+            self.logger.warning(f"Failed to send health report: {e}")
+    
+    def _run_coordinator(self):
+        """Run the shard processes and supervise them until shutdown."""
+        interval = self.config.polling.interval
+        
+        self.logger.info("=" * 60)
+        self.logger.info("SNMP Worker Started (sharded)")
+        self.logger.info(f"Polling interval: {interval} seconds")
+        for shard in self.coordinator.shards:
+            self.logger.info(f"  Shard {shard.index}: {shard.devices} devices")
+        self.logger.info("=" * 60)
+        
+        cycle_count = 0
+        next_housekeeping = time.monotonic() + interval
+        
+        try:
+            self.coordinator.start()
+            while self.running:
+                try:
+                    self.coordinator.check()
                     
-                    # Auto sync to main switches table after successful polling
-                    if successful > 0:
-                        try:
-                            with self.db_manager.session_scope() as session:
-                                sync_result = self.autosync_service.sync_all_devices(session)
-                                if sync_result['success'] and sync_result['synced_count'] > 0:
-                                    self.logger.info(
-                                        f"Auto sync: {sync_result['synced_count']} device(s) synchronized to main database"
-                                    )
-                        except Exception as e:
-                            self.logger.error(f"Auto sync failed: {e}", exc_info=True)
-                    
-                    # Cleanup old notification timestamps periodically
-                    if cycle_count % 10 == 0:
-                        self.alarm_manager.cleanup_old_notifications()
-                    
+                    if time.monotonic() >= next_housekeeping:
+                        cycle_count += 1
+                        next_housekeeping = max(next_housekeeping + interval, time.monotonic())
+                        self._coordinator_housekeeping(cycle_count)
+                
                 except Exception as e:
-                    self.logger.error(f"Error in poll cycle: {e}", exc_info=True)
+                    self.logger.error(f"Error supervising shards: {e}", exc_info=True)
                 
-                # Wait for next poll interval
                 if self.running:
-                    self.logger.debug(f"Waiting {self.config.polling.interval} seconds until next poll")
-                    time.sleep(self.config.polling.interval)
+                    time.sleep(1.0)
         
         except Exception as e:
             self.logger.error(f"Fatal error in main loop: {e}", exc_info=True)
@@ -476,12 +699,49 @@ class SNMPWorker:
         
         return 0
     
+    def _coordinator_housekeeping(self, cycle_count: int):
+        """
+        Log the shard health reports of the last interval and run auto sync.
+        
+        Args:
+            cycle_count: Number of intervals since start
+        """
+        reports = self.coordinator.take_reports()
+        successful = sum(report['successful'] for report in reports)
+        failed = sum(report['failed'] for report in reports)
+        skipped = sum(report['skipped'] for report in reports)
+        
+        for shard in self.coordinator.health():
+            report = shard['report']
+            age = f"{shard['report_age']:.0f}s ago" if shard['report_age'] is not None else "never"
+            self.logger.info(
+                f"  Shard {shard['index']} (pid {shard['pid']}, {'alive' if shard['alive'] else 'down'}, "
+                f"{shard['restarts']} restart(s)): {shard['devices']} devices, "
+                f"{report.get('open_circuits', 0)} open circuit(s), last report {age}"
+            )
+        self.logger.info(
+            f"Interval #{cycle_count}: {successful} successful, {failed} failed, "
+            f"{skipped} skipped polls across {self.coordinator.shard_count} shards"
+        )
+        
+        if successful > 0:
+            self._auto_sync()
+    
     def shutdown(self):
         """Perform cleanup on shutdown."""
         self.logger.info("=" * 60)
         self.logger.info("SNMP Worker Shutting Down")
         self.logger.info("=" * 60)
         
+        # Let the shards finish their running polls and exit
+        if self.coordinator:
+            self.coordinator.stop()
+        
+        # Let running polls finish and be saved
+        if self.polling_engine:
+            self.polling_engine.stop()
+            self.logger.info("Polling pipeline stopped")
+        
         # Close database connections
         if self.db_manager and self.db_manager.engine:
             self.db_manager.engine.dispose()
@@ -490,6 +750,26 @@ class SNMPWorker:
         self.logger.info("Shutdown complete")
 
 
+def run_shard(shard_index: int, shards: int, status_queue, config_file: str = None):
+    """
+    Run one polling shard (entry point of a shard process).
+    
+    Args:
+        shard_index: Shard this process polls
+        shards: Number of shards
+        status_queue: Queue the shard reports its health to
+        config_file: Path to configuration file
+    """
+    load_worker_modules(import_shard_modules())
+    worker = SNMPWorker(
+        config_file=config_file,
+        shards=shards,
+        shard_index=shard_index,
+        status_queue=status_queue
+    )
+    sys.exit(worker.run())
+
+
 def main():
     """Main entry point."""
     try:
@@ -503,11 +783,22 @@ def main():
             help='Path to configuration file',
             default=None
         )
+        parser.add_argument(
+            '-s', '--shards',
+            type=int,
+            help='Number of polling processes (overrides polling.shards)',
+            default=None
+        )
         
         args = parser.parse_args()
         
+        # Dependency check and imports with diagnostics, only in the started process
+        check_dependencies()
+        print("\nImporting worker modules...")
+        load_worker_modules(import_with_diagnostics())
+        
         # Create and run worker
-        worker = SNMPWorker(config_file=args.config)
+        worker = SNMPWorker(config_file=args.config, shards=args.shards)
         sys.exit(worker.run())
         
     except Exception as e:
@@ -906,7 +906,8 @@ $migrationFiles = [
     'fix_alarms_status_enum_uppercase.sql',
     'create_switch_change_log_view.sql',
     'mac_device_import.sql',
-    'enable_description_change_notifications.sql'
+    'enable_description_change_notifications.sql',
+    'create_port_status_current.sql'
 ];
 
 foreach ($migrationFiles as $migrationFile) {